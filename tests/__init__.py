@@ -1,5 +1,45 @@
 from pathlib import Path
-from typing import Final
+from typing import Final, Mapping, Sequence, Set, Tuple
+
+from yew.collection import DirectImport, ModGraph, ModName
+from yew.kinds import ImportKind
 
 TESTS_DIR: Final[Path] = Path(__file__).parent
 FIXTURE_DIR: Final[Path] = TESTS_DIR / "fixtures"
+
+# an imported module name, (name, lineno) or (name, lineno, kind)
+ImportSpec = str | Tuple[str, int] | Tuple[str, int, ImportKind]
+
+
+def direct_imports(imported: Sequence[ImportSpec]) -> Set[DirectImport]:
+    """
+    Make imports of the modules, the ones given by name only are on the lines of their position
+    """
+    imports: Set[DirectImport] = set()
+
+    for position, spec in enumerate(imported, start=1):
+        if isinstance(spec, str):
+            name, lineno, kind = spec, position, ImportKind.EAGER
+        else:
+            name, lineno, *kinds = spec
+            kind = kinds[0] if kinds else ImportKind.EAGER
+
+        imports.add(
+            DirectImport(
+                mod_name=ModName.from_str(name), path=Path(f"{name}.py"), lineno=lineno, col_offset=0, kind=kind
+            )
+        )
+
+    return imports
+
+
+def build_graph(imports: Mapping[str, Sequence[ImportSpec]]) -> ModGraph:
+    """
+    Build a graph of modules that import the given ones (see direct_imports())
+    """
+    graph = ModGraph()
+
+    for mod_name, imported in imports.items():
+        graph.add(ModName.from_str(mod_name), Path(f"{mod_name}.py"), direct_imports(imported))
+
+    return graph
@@ -0,0 +1,105 @@
+import dataclasses
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ModParts = Tuple[str, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class TreeSpec:
+    """
+    Shape of a synthetic package tree
+    """
+
+    modules: int = 1000  # including packages
+    depth: int = 3  # nesting levels of subpackages under the top-level package
+    fanout: int = 4  # subpackages per package
+    imports_per_module: int = 5
+    relative_imports: float = 0.3  # share of from-imports written relative to the importing module
+    from_imports: float = 0.5  # share of imports written as `from x import obj`
+    objects_per_module: int = 3
+    package_name: str = "synthetic"
+    seed: int = 0
+
+
+def generate_tree(spec: TreeSpec, root: Path) -> Path:
+    """
+    Write a synthetic package tree under the root and return the top-level package directory.
+
+    The tree is fully determined by the spec, so runs over the same spec are comparable
+    """
+    rnd = random.Random(spec.seed)
+
+    packages: List[ModParts] = [(spec.package_name,)]
+    level: List[ModParts] = packages[:]
+
+    for _ in range(spec.depth):
+        level = [(*package, f"pkg{idx}") for package in level for idx in range(spec.fanout)]
+        packages.extend(level)
+
+    modules: List[ModParts] = [
+        (*packages[idx % len(packages)], f"mod{idx}") for idx in range(max(spec.modules - len(packages), 0))
+    ]
+
+    sources: Dict[Path, str] = {}
+
+    for mod_parts in packages:
+        sources[root.joinpath(*mod_parts, "__init__.py")] = _module_source(spec, rnd, mod_parts, mod_parts, modules)
+
+    for mod_parts in modules:
+        file_path = root.joinpath(*mod_parts[:-1], f"{mod_parts[-1]}.py")
+        sources[file_path] = _module_source(spec, rnd, mod_parts, mod_parts[:-1], modules)
+
+    for file_path, source in sources.items():
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(source)
+
+    return root / spec.package_name
+
+
+def _module_source(
+    spec: TreeSpec,
+    rnd: random.Random,
+    mod_parts: ModParts,
+    package_parts: ModParts,
+    modules: List[ModParts],
+) -> str:
+    lines: List[str] = []
+    targets = rnd.sample(modules, min(spec.imports_per_module, len(modules)))
+
+    for target in targets:
+        if target == mod_parts:
+            continue
+
+        if rnd.random() >= spec.from_imports:
+            lines.append(f"import {'.'.join(target)}")
+            continue
+
+        if rnd.random() < 0.5:
+            # an object from the module
+            source_parts, name = target, f"func{rnd.randrange(spec.objects_per_module)}"
+        else:
+            # the module from its package
+            source_parts, name = target[:-1], target[-1]
+
+        if rnd.random() < spec.relative_imports:
+            lines.append(f"from {_relative(package_parts, source_parts)} import {name}")
+        else:
+            lines.append(f"from {'.'.join(source_parts)} import {name}")
+
+    lines.append("")
+
+    for idx in range(spec.objects_per_module):
+        lines.extend((f"def func{idx}(value):", f"    return value * {idx}", ""))
+
+    return "\n".join(lines)
+
+
+def _relative(package_parts: ModParts, source_parts: ModParts) -> str:
+    common = 0
+
+    while common < min(len(package_parts), len(source_parts)) and package_parts[common] == source_parts[common]:
+        common += 1
+
+    return "." * (len(package_parts) - common + 1) + ".".join(source_parts[common:])
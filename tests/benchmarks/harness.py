@@ -0,0 +1,203 @@
+import argparse
+import ast
+import dataclasses
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Final, Iterator, List, Optional, Set, Tuple
+
+from tests.benchmarks.generator import TreeSpec, generate_tree
+from yew.collection import DirectImport, ModGraph, ModName
+from yew.mods.filters import ImportFilter
+from yew.mods.finders import ModFinder
+from yew.mods.graph import build_classifier, build_mod_graph, build_resolver
+from yew.mods.parsers import ImportFromParser, ImportParser, Parser, iter_kinded_import_nodes
+
+PHASES: Final[Tuple[str, ...]] = ("discover", "read", "parse", "resolve", "filter", "insert", "build")
+
+
+class PhaseTimer:
+    """
+    Time benchmark phases (keeping the best time across repeats) and optionally trace their peak memory
+    """
+
+    def __init__(self, *, trace_memory: bool = False) -> None:
+        self.timings: Dict[str, float] = {}
+        self.peak_memory: Dict[str, int] = {}
+
+        self._trace_memory = trace_memory
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if self._trace_memory:
+            tracemalloc.start()
+
+        started_at = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started_at
+
+            if self._trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                self.peak_memory[name] = max(peak, self.peak_memory.get(name, 0))
+
+            self.timings[name] = min(elapsed, self.timings.get(name, elapsed))
+
+
+def run_phases(package: Path, timer: PhaseTimer, *, workers: int = 1) -> Dict[str, int]:
+    """
+    Run the graph building steps one by one over the package, so each of them is timed separately
+    """
+    with timer.phase("discover"):
+        file_paths = list(ModFinder().find([package]))
+
+    with timer.phase("read"):
+        contents = [file_path.read_bytes() for file_path in file_paths]
+
+    with timer.phase("parse"):
+        ast_trees = [ast.parse(content) if b"import" in content else None for content in contents]
+
+    with timer.phase("resolve"):
+        resolver = build_resolver([package])
+        mod_names = [ModName.from_path(file_path) for file_path in file_paths]
+
+        for mod_name, file_path in zip(mod_names, file_paths):
+            resolver.add(mod_name, file_path)
+
+        import_parser: Parser = ImportParser(resolver)
+        import_from_parser: Parser = ImportFromParser(resolver)
+        imports: List[Set[DirectImport]] = []
+
+        for mod_name, ast_tree in zip(mod_names, ast_trees):
+            imported_mods: Set[DirectImport] = set()
+
+            for node, kind in iter_kinded_import_nodes(ast_tree) if ast_tree else ():
+                node_parser = import_parser if isinstance(node, ast.Import) else import_from_parser
+                imported_mods |= node_parser(mod_name, node, kind)
+
+            imports.append(imported_mods)
+
+    with timer.phase("filter"):
+        mod_filter = ImportFilter(classifier=build_classifier([package]))
+        imports = [mod_filter.filter(imported_mods) for imported_mods in imports]
+
+    with timer.phase("insert"):
+        mod_graph = ModGraph()
+
+        for mod_name, file_path, imported_mods in zip(mod_names, file_paths, imports):
+            mod_graph.add(mod_name, file_path, imported_mods)
+
+    with timer.phase("build"):
+        built_graph = build_mod_graph([package], workers=workers)
+
+    assert len(built_graph) == len(mod_graph)
+
+    return {
+        "files": len(file_paths),
+        "imports": sum(len(imported_mods) for imported_mods in imports),
+        "nodes": len(mod_graph),
+    }
+
+
+def run_benchmark(
+    spec: TreeSpec,
+    *,
+    root: Optional[Path] = None,
+    repeat: int = 1,
+    workers: int = 1,
+    trace_memory: bool = False,
+) -> Dict[str, Any]:
+    """
+    Generate the synthetic tree and benchmark building its graph
+    """
+    with tempfile.TemporaryDirectory(prefix="yew-bench-") as tmp_dir:
+        package = generate_tree(spec, root or Path(tmp_dir))
+        timer = PhaseTimer(trace_memory=trace_memory)
+
+        for _ in range(repeat):
+            counts = run_phases(package, timer, workers=workers)
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "spec": dataclasses.asdict(spec),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "workers": workers,
+        "counts": counts,
+        "timings": {phase: timer.timings[phase] for phase in PHASES},
+        "peak_traced_memory": timer.peak_memory or None,
+        # bytes on macOS, kilobytes elsewhere
+        "peak_rss_kb": max_rss // 1024 if sys.platform == "darwin" else max_rss,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> str:
+    lines = [f"{'phase':<10} {'baseline':>10} {'current':>10} {'change':>8}"]
+
+    if result["spec"] != baseline["spec"]:
+        lines.insert(0, "warning: the baseline has been run over a different tree spec")
+
+    for phase in PHASES:
+        current, previous = result["timings"][phase], baseline["timings"].get(phase)
+
+        if previous:
+            lines.append(f"{phase:<10} {previous:>10.4f} {current:>10.4f} {(current / previous - 1) * 100:>+7.1f}%")
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = TreeSpec()
+
+    parser = argparse.ArgumentParser(description="Benchmark building the module graph of a synthetic package tree")
+    parser.add_argument("--modules", type=int, default=defaults.modules)
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--fanout", type=int, default=defaults.fanout)
+    parser.add_argument("--imports-per-module", type=int, default=defaults.imports_per_module)
+    parser.add_argument("--relative-imports", type=float, default=defaults.relative_imports)
+    parser.add_argument("--from-imports", type=float, default=defaults.from_imports)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3, help="keep the best time of each phase across runs")
+    parser.add_argument("--workers", type=int, default=1, help="workers of the end-to-end build")
+    parser.add_argument("--trace-memory", action="store_true", help="trace peak memory per phase (slows phases down)")
+    parser.add_argument("--output", type=Path, help="save results as JSON")
+    parser.add_argument("--compare", type=Path, help="compare timings against previously saved results")
+
+    args = parser.parse_args(argv)
+
+    spec = TreeSpec(
+        modules=args.modules,
+        depth=args.depth,
+        fanout=args.fanout,
+        imports_per_module=args.imports_per_module,
+        relative_imports=args.relative_imports,
+        from_imports=args.from_imports,
+        seed=args.seed,
+    )
+    result = run_benchmark(spec, repeat=args.repeat, workers=args.workers, trace_memory=args.trace_memory)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+
+    if args.compare:
+        print(compare(result, json.loads(args.compare.read_text())))
+    else:
+        print(json.dumps(result, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
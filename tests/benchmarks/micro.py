@@ -0,0 +1,130 @@
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from yew.collection import DirectImport, ModGraph, ModName
+
+# (module count, imports per module) of the synthetic graph
+DEFAULT_MODULES = 20_000
+DEFAULT_IMPORTS = 10
+
+
+def synthetic_imports(modules: int, imports: int, *, seed: int = 0) -> Dict[str, List[str]]:
+    """
+    Generate imported module names by module name, the same way as a large codebase would look like
+    """
+    rnd = random.Random(seed)
+    names = [f"synthetic.pkg{idx % 50}.sub{idx % 7}.mod{idx}" for idx in range(modules)]
+
+    return {name: rnd.sample(names, imports) for name in names}
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    timings: List[float] = []
+
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started_at)
+
+    return min(timings)
+
+
+def run_micro(modules: int = DEFAULT_MODULES, imports: int = DEFAULT_IMPORTS, *, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time hashing-heavy operations on module names and records, and measure memory of the records
+    """
+    imported_names = synthetic_imports(modules, imports)
+    all_names = list(imported_names)
+
+    def parse_names() -> None:
+        for name in all_names:
+            ModName.from_str(name)
+
+    mod_names = [ModName.from_str(name) for name in all_names]
+
+    def hash_names() -> None:
+        seen: Set[ModName] = set()
+
+        for _ in range(imports):
+            seen.update(mod_names)
+
+    def direct_imports() -> List[Set[DirectImport]]:
+        return [
+            {
+                DirectImport(
+                    mod_name=ModName.from_str(imported),
+                    path=Path(f"{imported}.py"),
+                    lineno=lineno,
+                    col_offset=0,
+                )
+                for lineno, imported in enumerate(imported_names[name], start=1)
+            }
+            for name in all_names
+        ]
+
+    imports_by_module = direct_imports()
+
+    def build_graph() -> ModGraph:
+        graph = ModGraph()
+
+        for mod_name, imported_mods in zip(mod_names, imports_by_module):
+            graph.add(mod_name, Path(f"{mod_name}.py"), imported_mods)
+
+        return graph
+
+    graph = build_graph()
+
+    def query_graph() -> None:
+        for name in all_names[:500]:
+            graph.dependents([name], depth=2)
+
+    timings = {
+        "parse_names": best_of(repeat, parse_names),
+        "hash_names": best_of(repeat, hash_names),
+        "direct_imports": best_of(repeat, direct_imports),
+        "build_graph": best_of(repeat, build_graph),
+        "query_graph": best_of(repeat, query_graph),
+    }
+
+    tracemalloc.start()
+    records = direct_imports()
+    records_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del records
+
+    return {
+        "python": sys.version.split()[0],
+        "modules": modules,
+        "imports": imports,
+        "timings": timings,
+        "records_memory_kb": records_memory // 1024,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Micro-benchmark module names and graph records")
+    parser.add_argument("--modules", type=int, default=DEFAULT_MODULES)
+    parser.add_argument("--imports", type=int, default=DEFAULT_IMPORTS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="save results as JSON")
+
+    args = parser.parse_args(argv)
+    result = run_micro(args.modules, args.imports, repeat=args.repeat)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+
+    print(json.dumps(result, indent=2))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+import os
+
+
+def broken_function(
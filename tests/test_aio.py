@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.kinds import ImportKind
+from yew.mods.aio import abuild_mod_graph, adependents, aiter_mod_graph
+from yew.mods.graph import build_mod_graph
+
+
+def test__abuild_mod_graph__matches_build_mod_graph() -> None:
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1)
+    async_graph = asyncio.run(abuild_mod_graph([FIXTURE_DIR / "imports"], concurrency=2, batch_size=2))
+
+    assert len(async_graph) == len(graph)
+
+    for module in graph:
+        async_module = async_graph[module.mod_name]
+
+        assert async_module is not None
+        assert async_module.imports == module.imports
+        assert async_module.imported_by == module.imported_by
+
+    dependents = asyncio.run(adependents(async_graph, ["tests.fixtures.imports.utils"]))
+
+    assert dependents == graph.dependents(["tests.fixtures.imports.utils"])
+
+    eager_dependents = asyncio.run(adependents(async_graph, ["tests.fixtures.imports.utils"], kinds=[ImportKind.EAGER]))
+
+    assert eager_dependents == graph.dependents(["tests.fixtures.imports.utils"], kinds=[ImportKind.EAGER])
+
+
+def test__aiter_mod_graph__reports_progress() -> None:
+    async def collect() -> list[str]:
+        return [str(mod_name) async for mod_name, _, _, _ in aiter_mod_graph([FIXTURE_DIR / "imports"], batch_size=1)]
+
+    assert len(asyncio.run(collect())) == 6
+
+
+def test__abuild_mod_graph__cancellation() -> None:
+    async def build_and_cancel() -> None:
+        task = asyncio.create_task(abuild_mod_graph([FIXTURE_DIR / "imports"], batch_size=1))
+        await asyncio.sleep(0)
+
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(build_and_cancel())
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from tests.benchmarks.generator import TreeSpec, generate_tree
+from tests.benchmarks.harness import PHASES, run_benchmark
+from tests.benchmarks.micro import run_micro
+from yew.mods.graph import build_mod_graph
+
+
+def read_tree(root: Path) -> dict[str, str]:
+    return {str(file_path.relative_to(root)): file_path.read_text() for file_path in sorted(root.rglob("*.py"))}
+
+
+def test__generate_tree__is_deterministic(tmp_path: Path) -> None:
+    spec = TreeSpec(modules=50, depth=2, fanout=2)
+
+    generate_tree(spec, tmp_path / "first")
+    generate_tree(spec, tmp_path / "second")
+
+    assert read_tree(tmp_path / "first") == read_tree(tmp_path / "second")
+    assert len(read_tree(tmp_path / "first")) == 50
+
+
+def test__generate_tree__imports_resolve(tmp_path: Path) -> None:
+    package = generate_tree(TreeSpec(modules=50, depth=2, fanout=2, relative_imports=0.5), tmp_path)
+    graph = build_mod_graph([package], workers=1)
+
+    assert len(graph) == 50
+    assert all(module.imports is not None for module in graph)
+    assert sum(len(module.imports or ()) for module in graph) > 100
+
+
+def test__run_benchmark__reports_phases() -> None:
+    result = run_benchmark(TreeSpec(modules=30, depth=1, fanout=2), trace_memory=True)
+
+    assert set(result["timings"]) == set(PHASES)
+    assert set(result["peak_traced_memory"]) == set(PHASES)
+    assert result["counts"]["files"] == 30
+    assert result["peak_rss_kb"] > 0
+
+
+def test__run_micro__reports_timings() -> None:
+    result = run_micro(modules=200, imports=3, repeat=1)
+
+    assert all(timing > 0 for timing in result["timings"].values())
+    assert result["records_memory_kb"] > 0
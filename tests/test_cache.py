@@ -0,0 +1,174 @@
+import os
+from pathlib import Path
+from typing import Set, Tuple
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.collection import ModGraph, ModName
+from yew.mods.cache import ParseCache, ResolutionCache
+from yew.mods.graph import build_mod_graph, decode_record, parse_module_file
+from yew.mods.parsers import ModParser
+from yew.mods.resolvers import ModResolver
+
+
+def test__parse_cache__reuses_unchanged_files(tmp_path: Path) -> None:
+    cold_cache = ParseCache(tmp_path)
+    cold_graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1, cache=cold_cache)
+
+    assert cold_cache.stats.hits == 0
+    assert cold_cache.stats.misses == 6
+    assert cold_cache.cache_file.exists()
+
+    warm_cache = ParseCache(tmp_path)
+    warm_graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1, cache=warm_cache)
+
+    assert warm_cache.stats.hits == 6
+    assert warm_cache.stats.misses == 0
+
+    for mod_name in ("tests.fixtures.imports.fields", "tests.fixtures.imports.fields.security.password"):
+        cold_module, warm_module = cold_graph[mod_name], warm_graph[mod_name]
+
+        assert cold_module is not None and warm_module is not None
+        assert cold_module.imports == warm_module.imports
+        assert cold_module.imported_by == warm_module.imported_by
+
+
+def test__parse_cache__invalidates_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "src" / "cachepkg"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "a.py").write_text("from . import b\n")
+    (package / "b.py").write_text("")
+
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    cache_dir = tmp_path / "cache"
+
+    build_mod_graph([package], workers=1, cache=ParseCache(cache_dir))
+
+    (package / "b.py").write_text("import os\n")
+    (package / "a.py").unlink()
+
+    cache = ParseCache(cache_dir)
+    graph = build_mod_graph([package], workers=1, cache=cache)
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.evictions == 2
+    assert graph["cachepkg.a"] is None
+
+
+def test__parse_cache__resolves_cached_imports_again(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "src" / "cachepkg"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "a.py").write_text("from cachepkg import helpers\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path / "src"))
+    cache_dir = tmp_path / "cache"
+
+    def imported(graph: ModGraph) -> Set[Tuple[str, Tuple[str, ...]]]:
+        module = graph["cachepkg.a"]
+        assert module is not None and module.imports is not None
+
+        return {(str(context.module.mod_name), context.symbols) for context in module.imports}
+
+    graph = build_mod_graph([package], workers=1, cache=ParseCache(cache_dir))
+
+    assert imported(graph) == {("cachepkg", ("helpers",))}
+
+    # a.py is cached, but its import now resolves to the new module
+    (package / "helpers.py").write_text("")
+
+    cache = ParseCache(cache_dir)
+    graph = build_mod_graph([package], workers=1, cache=cache)
+
+    assert cache.stats.hits == 2
+    assert imported(graph) == {("cachepkg.helpers", ())}
+
+    (package / "helpers.py").unlink()
+
+    graph = build_mod_graph([package], workers=1, cache=ParseCache(cache_dir))
+
+    assert imported(graph) == {("cachepkg", ("helpers",))}
+
+
+def test__parse_cache__file_edited_after_read_is_not_served_stale(tmp_path: Path) -> None:
+    file_path = tmp_path / "edited.py"
+    file_path.write_text("import os\n")
+
+    record = parse_module_file(ModParser(), ModName.from_str("edited"), file_path)
+    assert record is not None
+
+    # edited with the same size before the record gets cached
+    file_path.write_text("import re\n")
+    stat = file_path.stat()
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    cache = ParseCache(tmp_path)
+    decode_record(record, cache)
+
+    assert cache.get(file_path) is None
+
+
+@pytest.fixture
+def site_packages(tmp_path: Path) -> Path:
+    site_packages = tmp_path / "venv" / "site-packages"
+    (site_packages / "distpkg").mkdir(parents=True)
+    (site_packages / "distpkg" / "__init__.py").write_text("")
+    (site_packages / "distpkg" / "models.py").write_text("")
+    (site_packages / "distpkg-1.0.dist-info").mkdir()
+
+    return site_packages
+
+
+def test__resolution_cache__reuses_environment_resolutions(tmp_path: Path, site_packages: Path) -> None:
+    project = tmp_path / "project"
+    project.mkdir()
+    search_paths = [project, site_packages]
+
+    cold_cache = ResolutionCache(tmp_path / "cache", search_paths)
+    cold_resolver = ModResolver(search_paths, cache=cold_cache)
+
+    model = (ModName.from_str("distpkg.models"), "Model")
+
+    assert cold_resolver.from_object_path(["distpkg", "models", "Model"]) == model
+    assert cold_cache.stats.misses == 3
+
+    cold_cache.save()
+
+    warm_cache = ResolutionCache(tmp_path / "cache", search_paths)
+    warm_resolver = ModResolver(search_paths, cache=warm_cache)
+
+    assert warm_resolver.from_object_path(["distpkg", "models", "Model"]) == model
+    assert warm_resolver.file_path(ModName.from_str("distpkg")) == site_packages / "distpkg" / "__init__.py"
+    assert warm_cache.stats.hits == 3
+    assert warm_cache.stats.misses == 0
+
+    # a project module shadows the installed one
+    (project / "distpkg.py").write_text("")
+
+    assert ModResolver(search_paths, cache=warm_cache).file_path(ModName.from_str("distpkg")) == project / "distpkg.py"
+    assert warm_cache.stats.hits == 3
+
+
+def test__resolution_cache__invalidates_on_environment_changes(tmp_path: Path, site_packages: Path) -> None:
+    cache = ResolutionCache(tmp_path / "cache", [site_packages])
+    ModResolver([site_packages], cache=cache).file_path(ModName.from_str("distpkg.models"))
+    cache.save()
+
+    # upgrade the distribution
+    (site_packages / "distpkg-1.0.dist-info").rmdir()
+    (site_packages / "distpkg-2.0.dist-info").mkdir()
+    (site_packages / "distpkg" / "models.py").unlink()
+    (site_packages / "distpkg" / "models").mkdir()
+    (site_packages / "distpkg" / "models" / "__init__.py").write_text("")
+
+    cache = ResolutionCache(tmp_path / "cache", [site_packages])
+    resolver = ModResolver([site_packages], cache=cache)
+
+    models_path = resolver.file_path(ModName.from_str("distpkg.models"))
+
+    assert models_path == site_packages / "distpkg" / "models" / "__init__.py"
+    assert cache.stats.evictions == 2
+    assert cache.stats.hits == 0
@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from tests import build_graph
+from yew.collection import ImportChain, ImportKind, ModGraph
+
+
+def hops(chain: ImportChain) -> List[Tuple[str, int, str]]:
+    return [(str(module.mod_name), context.lineno, str(context.module.mod_name)) for module, context in chain]
+
+
+@pytest.fixture
+def graph() -> ModGraph:
+    eager, lazy = ImportKind.EAGER, ImportKind.LAZY
+
+    return build_graph(
+        {
+            "service.api": [("service.views", 1, eager), ("service.tasks", 2, eager), ("heavy.ml", 9, lazy)],
+            "service.views": [("service.forms", 3, eager)],
+            "service.forms": [("heavy.ml.models", 5, eager)],
+            "service.tasks": [("heavy.ml.models", 7, eager), ("heavy.ml.models", 8, eager)],
+            "heavy.ml": [("heavy.ml.models", 1, eager)],
+            "heavy.ml.models": [("service.api", 4, eager)],
+        }
+    )
+
+
+def test__graph__import_chain(graph: ModGraph) -> None:
+    chain = graph.import_chain("service.api", "heavy.ml.models")
+
+    assert chain is not None
+    assert hops(chain) == [("service.api", 2, "service.tasks"), ("service.tasks", 7, "heavy.ml.models")]
+    assert chain[0][0].file_path == Path("service.api.py")
+
+    chain = graph.import_chain("service.api", "heavy.ml.models", kinds=[ImportKind.EAGER])
+
+    assert chain is not None and len(chain) == 2
+    assert graph.import_chain("heavy.ml.models", "heavy.ml", kinds=[ImportKind.EAGER]) is None
+    assert graph.import_chain("service.api", "service.api") == []
+
+    with pytest.raises(KeyError):
+        graph.import_chain("service.api", "missing")
+
+
+def test__graph__import_chains(graph: ModGraph) -> None:
+    chains = graph.import_chains("service.api", "heavy.ml.models", k=5)
+
+    assert [hops(chain) for chain in chains] == [
+        [("service.api", 2, "service.tasks"), ("service.tasks", 7, "heavy.ml.models")],
+        [("service.api", 9, "heavy.ml"), ("heavy.ml", 1, "heavy.ml.models")],
+        [
+            ("service.api", 1, "service.views"),
+            ("service.views", 3, "service.forms"),
+            ("service.forms", 5, "heavy.ml.models"),
+        ],
+    ]
+    assert len(graph.import_chains("service.api", "heavy.ml.models", k=5, kinds=[ImportKind.EAGER])) == 2
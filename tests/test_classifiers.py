@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+
+from yew.collection import ModCategory, ModName
+from yew.mods.classifiers import ModClassifier, PathTrie
+from yew.mods.graph import build_mod_graph
+
+
+def test__path_trie__longest_prefix() -> None:
+    trie: PathTrie[str] = PathTrie()
+    trie.insert(Path("/usr/lib/python3"), "stdlib")
+    trie.insert(Path("/usr/lib/python3/site-packages"), "site")
+
+    assert trie.longest_prefix(Path("/usr/lib/python3/json/__init__.py")) == "stdlib"
+    assert trie.longest_prefix(Path("/usr/lib/python3/site-packages/attr/__init__.py")) == "site"
+    assert trie.longest_prefix(Path("/usr/lib/python2/json/__init__.py")) is None
+
+
+def test__classifier__categories(tmp_path: Path) -> None:
+    stdlib_path, site_path, project_path = tmp_path / "lib", tmp_path / "lib" / "site-packages", tmp_path / "project"
+    classifier = ModClassifier([project_path], site_paths=[site_path], stdlib_paths=[stdlib_path])
+
+    def category(mod_name: str, path: Path) -> ModCategory:
+        return classifier.classify(ModName.from_str(mod_name), path).category
+
+    assert category("sys", Path("built-in")) == ModCategory.BUILTIN
+    assert category("json.decoder", stdlib_path / "json" / "decoder.py") == ModCategory.STDLIB
+    assert category("attr", site_path / "attr" / "__init__.py") == ModCategory.THIRD_PARTY
+    assert category("app.views", project_path / "app" / "views.py") == ModCategory.FIRST_PARTY
+    assert category("vendored", tmp_path / "elsewhere" / "vendored.py") == ModCategory.UNRESOLVED
+
+    # classifications are memoized per top-level package
+    assert category("app.models", tmp_path / "elsewhere" / "models.py") == ModCategory.FIRST_PARTY
+
+
+def test__classifier__distributions() -> None:
+    classification = ModClassifier().classify(ModName.from_str("_pytest.config"), Path(pytest.__file__))
+
+    assert classification.category == ModCategory.THIRD_PARTY
+    assert classification.distribution == "pytest"
+
+
+def test__graph__stores_classifications(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "classified"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "utils.py").write_text("")
+    (package / "app.py").write_text("import sys\nimport json\nimport pytest\nfrom . import utils\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    graph = build_mod_graph([package], include_third_party=True, workers=1)
+    categories = {
+        str(module.mod_name): (module.category, module.distribution)
+        for module in graph.dependencies(["classified.app"], depth=1)
+    }
+
+    assert categories == {
+        "sys": (ModCategory.BUILTIN, None),
+        "json": (ModCategory.STDLIB, None),
+        "pytest": (ModCategory.THIRD_PARTY, "pytest"),
+        "classified.utils": (ModCategory.FIRST_PARTY, None),
+    }
+
+    graph = build_mod_graph([package], workers=1)
+
+    assert {str(module.mod_name) for module in graph.dependencies(["classified.app"])} == {"classified.utils"}
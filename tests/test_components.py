@@ -0,0 +1,56 @@
+import sys
+import time
+from typing import Set
+
+from tests import build_graph
+
+
+def names(modules) -> Set[str]:
+    return {str(module.mod_name) for module in modules}
+
+
+def test__condense__cycles_and_layers() -> None:
+    graph = build_graph(
+        {
+            "app": ["views", "models"],
+            "views": ["models", "forms"],
+            "forms": ["views"],
+            "models": ["db", "models"],
+            "db": ["os"],
+        }
+    )
+
+    condensation = graph.condense()
+    layers = [
+        sorted(",".join(sorted(names(condensation.components[component_id]))) for component_id in layer)
+        for layer in condensation.layers
+    ]
+
+    assert layers == [["os"], ["db"], ["models"], ["forms,views"], ["app"]]
+
+    cycles = sorted(condensation.cycles, key=lambda cycle: len(cycle.modules))
+
+    assert [names(cycle.modules) for cycle in cycles] == [{"models"}, {"forms", "views"}]
+    cycle_imports = [(str(module.mod_name), str(ctx.module.mod_name), ctx.lineno) for module, ctx in cycles[1].imports]
+
+    assert sorted(cycle_imports) == [("forms", "views", 1), ("views", "forms", 2)]
+    assert condensation.component_of("forms") == condensation.component_of("views")
+
+    assert len(graph.condense(first_party_only=True).layers) == 4
+
+
+def test__condense__deep_graph() -> None:
+    size = 20_000
+    graph = build_graph({f"m{idx}": [f"m{idx + 1}"] for idx in range(size)} | {f"m{size}": ["m0"]})
+
+    started_at = time.perf_counter()
+    condensation = graph.condense()
+
+    assert size > sys.getrecursionlimit()
+    assert len(condensation.components) == 1
+    assert len(condensation.cycles[0].modules) == size + 1
+    assert time.perf_counter() - started_at < 5
+
+    chain = build_graph({f"m{idx}": [f"m{idx + 1}"] for idx in range(size)}).condense()
+
+    assert len(chain.layers) == size + 1
@@ -0,0 +1,189 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from tests import build_graph, direct_imports
+from yew.collection import ModGraph, ModName
+from yew.contracts import (
+    Contract,
+    ContractChecker,
+    ContractError,
+    ForbiddenContract,
+    IndependenceContract,
+    LayersContract,
+    PrivateContract,
+    load_contracts,
+)
+from yew.kinds import ImportKind
+
+
+def update(graph: ModGraph, checker: ContractChecker, mod_name: str, imported: List[str]) -> None:
+    graph.update(ModName.from_str(mod_name), Path(f"{mod_name}.py"), direct_imports(imported))
+    checker.changed([mod_name])
+
+
+def chain_names(checker: ContractChecker) -> Dict[str, List[List[str]]]:
+    return {
+        result.contract.name: [
+            [str(violation.chain[0][0].mod_name), *(str(context.module.mod_name) for _, context in violation.chain)]
+            for violation in result.violations
+        ]
+        for result in checker.check()
+    }
+
+
+def test__contracts__load_from_pyproject(tmp_path: Path) -> None:
+    config_path = tmp_path / "pyproject.toml"
+    config_path.write_text(
+        """
+[[tool.yew.contracts]]
+name = "layers"
+type = "layers"
+layers = ["api", "services", "models"]
+containers = ["app"]
+
+[[tool.yew.contracts]]
+name = "domain"
+type = "forbidden"
+source_modules = ["app.domain"]
+forbidden_modules = ["app.infra"]
+kinds = ["eager"]
+
+[[tool.yew.contracts]]
+name = "features"
+type = "independence"
+modules = ["app.features.*"]
+"""
+    )
+
+    assert load_contracts(config_path) == [
+        LayersContract(name="layers", layers=("api", "services", "models"), containers=("app",)),
+        ForbiddenContract(
+            name="domain",
+            kinds=(ImportKind.EAGER,),
+            source_modules=("app.domain",),
+            forbidden_modules=("app.infra",),
+        ),
+        IndependenceContract(name="features", modules=("app.features.*",)),
+    ]
+
+    config_path.write_text('[[tool.yew.contracts]]\nname = "broken"\ntype = "unknown"\n')
+
+    with pytest.raises(ContractError):
+        load_contracts(config_path)
+
+    with pytest.raises(ContractError):
+        load_contracts(tmp_path / "missing.toml")
+
+
+def test__contracts__report_violating_chains() -> None:
+    graph = build_graph(
+        {
+            "app.api.views": ["app.services.orders"],
+            "app.services.orders": ["app.models.order", "app.utils"],
+            "app.models.order": ["app.utils"],
+            "app.utils": ["app.api.views"],
+            "app.domain.order": ["app.utils"],
+            "app.infra.db": [],
+            "app.features.cart": ["app.features.checkout._payments"],
+            "app.features.checkout.views": ["app.features.checkout._payments"],
+            "app.features.checkout._payments": [],
+        }
+    )
+    checker = ContractChecker(
+        graph,
+        [
+            LayersContract(name="layers", layers=("api", "services", "models"), containers=("app",)),
+            ForbiddenContract(name="domain", source_modules=("app.domain",), forbidden_modules=("app.infra",)),
+            IndependenceContract(name="features", modules=("app.features.*",)),
+            PrivateContract(name="private", containers=("app",)),
+        ],
+    )
+
+    assert chain_names(checker) == {
+        "layers": [
+            ["app.services.orders", "app.utils", "app.api.views"],
+            ["app.models.order", "app.utils", "app.api.views"],
+            ["app.models.order", "app.utils", "app.api.views", "app.services.orders"],
+        ],
+        "domain": [],
+        "features": [["app.features.cart", "app.features.checkout._payments"]],
+        "private": [["app.features.cart", "app.features.checkout._payments"]],
+    }
+
+
+def test__contracts__recheck_only_affected_pairs() -> None:
+    graph = build_graph(
+        {
+            "app.domain.order": ["app.domain.price"],
+            "app.domain.price": [],
+            "app.services.checkout": ["app.domain.order"],
+            "app.infra.db": [],
+            "app.utils": [],
+        }
+    )
+    checker = ContractChecker(
+        graph,
+        [
+            ForbiddenContract(name="domain", source_modules=("app.domain",), forbidden_modules=("app.infra",)),
+            ForbiddenContract(
+                name="direct",
+                source_modules=("app.services",),
+                forbidden_modules=("app.infra",),
+                allow_indirect_imports=True,
+            ),
+        ],
+    )
+
+    assert chain_names(checker) == {"domain": [], "direct": []}
+    assert [contract.name for contract in checker.rechecked] == ["domain", "direct"]
+
+    # not reachable from the contract packages
+    update(graph, checker, "app.utils", ["app.infra.db"])
+
+    assert chain_names(checker) == {"domain": [], "direct": []}
+    assert checker.rechecked == []
+
+    update(graph, checker, "app.domain.price", ["app.utils"])
+
+    assert chain_names(checker) == {
+        "domain": [["app.domain.price", "app.utils", "app.infra.db"]],
+        "direct": [],
+    }
+    assert [contract.name for contract in checker.rechecked] == ["domain"]
+
+    update(graph, checker, "app.services.checkout", ["app.domain.order", "app.infra.db"])
+
+    assert chain_names(checker) == {
+        "domain": [["app.domain.price", "app.utils", "app.infra.db"]],
+        "direct": [["app.services.checkout", "app.infra.db"]],
+    }
+    assert [contract.name for contract in checker.rechecked] == ["direct"]
+
+    # the violating chain goes through the changed module
+    update(graph, checker, "app.utils", [])
+
+    assert chain_names(checker) == {"domain": [], "direct": [["app.services.checkout", "app.infra.db"]]}
+    assert [contract.name for contract in checker.rechecked] == ["domain"]
+
+    # a new module of the contract packages
+    update(graph, checker, "app.domain.tax", ["app.infra.db"])
+
+    assert chain_names(checker) == {
+        "domain": [["app.domain.tax", "app.infra.db"]],
+        "direct": [["app.services.checkout", "app.infra.db"]],
+    }
+    assert [contract.name for contract in checker.rechecked] == ["domain"]
+
+
+def test__contracts__empty_graph_is_an_error() -> None:
+    checker = ContractChecker(ModGraph(), [IndependenceContract(name="features", modules=("app.features.*",))])
+
+    with pytest.raises(ContractError, match="graph is empty"):
+        checker.check()
+
+
+def test__contracts__base_contract_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        Contract(name="abstract")  # type: ignore[abstract]
@@ -0,0 +1,141 @@
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from yew.collection import ModGraph
+from yew.daemon import DaemonNotRunning, GraphDaemon, handle_request, query, query_daemon
+
+
+@pytest.fixture
+def package(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    package = tmp_path / "daemonpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "models.py").write_text("")
+    (package / "views.py").write_text("from . import models\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    return package
+
+
+@pytest.fixture
+def daemon(package: Path, tmp_path: Path) -> Iterator[GraphDaemon]:
+    daemon = GraphDaemon([package], socket_path=tmp_path / "yew.sock", poll_interval=3600)
+
+    server_thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    server_thread.start()
+
+    for _ in range(100):
+        # the socket file appears on bind, but connections are refused until the server listens
+        try:
+            query_daemon(tmp_path / "yew.sock", {"command": "ping"})
+            break
+        except DaemonNotRunning:
+            time.sleep(0.01)
+
+    yield daemon
+
+    daemon.shutdown()
+    server_thread.join(timeout=5)
+
+
+def test__daemon__answers_queries(daemon: GraphDaemon, tmp_path: Path) -> None:
+    socket_path = tmp_path / "yew.sock"
+
+    response = query_daemon(socket_path, {"command": "dependents", "targets": ["daemonpkg.models"]})
+
+    assert response == {"ok": True, "modules": ["daemonpkg.views"]}
+    assert query_daemon(socket_path, {"command": "unknown"})["ok"] is False
+
+    response = query_daemon(
+        socket_path,
+        {"command": "chains", "source": "daemonpkg.views", "target": "daemonpkg.models"},
+    )
+
+    assert response["ok"] is True
+    assert [[(hop["importer"], hop["lineno"], hop["module"]) for hop in chain] for chain in response["chains"]] == [
+        [("daemonpkg.views", 1, "daemonpkg.models")]
+    ]
+
+
+def test__daemon__updates_graph_on_changes(daemon: GraphDaemon, package: Path, tmp_path: Path) -> None:
+    (package / "admin.py").write_text("from . import models\n")
+    (package / "views.py").write_text("")
+
+    changes = daemon.refresh()
+
+    assert changes.added == [package.absolute() / "admin.py"]
+    assert changes.modified == [package.absolute() / "views.py"]
+
+    response = query_daemon(
+        tmp_path / "yew.sock",
+        {"command": "dependents", "targets": [str(package.absolute() / "models.py")]},
+    )
+
+    assert response == {"ok": True, "modules": ["daemonpkg.admin"]}
+
+
+def test__query__falls_back_to_in_process_build(package: Path, tmp_path: Path) -> None:
+    socket_path = tmp_path / "missing.sock"
+
+    with pytest.raises(DaemonNotRunning):
+        query_daemon(socket_path, {"command": "ping"})
+
+    response = query([package], {"command": "dependencies", "targets": ["daemonpkg.views"]}, socket_path=socket_path)
+
+    assert response == {"ok": True, "modules": ["daemonpkg.models"]}
+
+    # there is nothing to build the graph from
+    with pytest.raises(DaemonNotRunning):
+        query([], {"command": "dependencies", "targets": ["daemonpkg.views"]}, socket_path=socket_path)
+
+
+def test__daemon__checks_contracts(daemon: GraphDaemon, package: Path, tmp_path: Path) -> None:
+    config_path = tmp_path / "pyproject.toml"
+    config_path.write_text(
+        """
+[[tool.yew.contracts]]
+name = "views"
+type = "forbidden"
+source_modules = ["daemonpkg.views"]
+forbidden_modules = ["daemonpkg.models"]
+"""
+    )
+    request = {"command": "check", "config": str(config_path)}
+
+    response = query_daemon(tmp_path / "yew.sock", request)
+
+    assert response["ok"] is True
+    assert response["rechecked"] == ["views"]
+    assert [(contract["name"], contract["kept"]) for contract in response["contracts"]] == [("views", False)]
+    assert [[hop["module"] for hop in violation["chain"]] for violation in response["contracts"][0]["violations"]] == [
+        ["daemonpkg.models"]
+    ]
+
+    assert query_daemon(tmp_path / "yew.sock", request)["rechecked"] == []
+
+    (package / "views.py").write_text("")
+    daemon.refresh()
+
+    response = query_daemon(tmp_path / "yew.sock", request)
+
+    assert response["rechecked"] == ["views"]
+    assert response["contracts"][0]["kept"] is True
+
+    response = query_daemon(tmp_path / "yew.sock", {"command": "check", "config": str(tmp_path / "missing.toml")})
+
+    assert response["ok"] is False
+
+
+def test__handle_request__check_fails_on_empty_graph(tmp_path: Path) -> None:
+    config_path = tmp_path / "pyproject.toml"
+    config_path.write_text('[[tool.yew.contracts]]\nname = "app"\ntype = "independence"\nmodules = ["app.*"]\n')
+
+    response = handle_request(ModGraph(), {"command": "check", "config": str(config_path)})
+
+    assert response["ok"] is False
+    assert "graph is empty" in response["error"]
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from tests import build_graph
+from yew.collection import ModGraph
+from yew.diff import DiffSummary
+
+
+def test__graph__diff(tmp_path: Path) -> None:
+    base = build_graph({"app.api": [("app.models", 1), ("app.utils", 2)], "app.models": [("app.utils", 1)]})
+    head = build_graph(
+        {
+            "app.api": [("app.models", 3), ("infra.db", 4)],  # the models import has only moved
+            "app.models": [("app.utils", 1)],
+            "infra.db": [("app.utils", 1), ("app.utils", 5)],
+        }
+    )
+
+    diff = base.diff(head)
+
+    assert diff.summary == DiffSummary(added_modules=1, removed_modules=0, added_imports=2, removed_imports=1)
+    assert {str(module.mod_name) for module in diff.added_modules} == {"infra.db"}
+    assert diff.removed_modules == set()
+    assert [
+        (str(module.mod_name), str(context.module.mod_name), context.lineno) for module, context in diff.added_imports
+    ] == [
+        ("app.api", "infra.db", 4),
+        ("infra.db", "app.utils", 1),
+        ("infra.db", "app.utils", 5),
+    ]
+    assert [(str(module.mod_name), str(context.module.mod_name)) for module, context in diff.removed_imports] == [
+        ("app.api", "app.utils")
+    ]
+
+    reverse_diff = head.diff(base)
+
+    assert reverse_diff.summary == DiffSummary(added_modules=0, removed_modules=1, added_imports=1, removed_imports=2)
+    assert {str(module.mod_name) for module in reverse_diff.removed_modules} == {"infra.db"}
+
+    head.save(tmp_path / "head.yew")
+
+    assert not head.diff(ModGraph.load(tmp_path / "head.yew")).summary.changed
@@ -1,7 +1,12 @@
 from collections import namedtuple
+from pathlib import Path
+from typing import Set, Tuple
+
+import pytest
 
 from tests import FIXTURE_DIR
-from yew.mods.graph import build_mod_graph
+from yew.collection import DirectImport, ImportContext, ModGraph, ModName
+from yew.mods.graph import ExecutorMode, build_mod_graph, iter_mod_graph, update_mod_graph
 
 ImportInfo = namedtuple("ImportInfo", ["imports", "imported_by"])
 
@@ -31,3 +36,209 @@ def test__parser__imports() -> None:
             assert actual_module.imports == expected_module.imports
 
         assert len(actual_module.imported_by) == expected_module.imported_by
+
+
+@pytest.mark.parametrize("executor", ["thread", "process", "auto"])
+def test__build_mod_graph__executors(executor: ExecutorMode) -> None:
+    thread_graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1)
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=2, executor=executor)
+
+    assert len(graph) == len(thread_graph)
+
+    for mod_name in ("tests.fixtures.imports.fields", "tests.fixtures.imports.fields.security.password"):
+        module, thread_module = graph[mod_name], thread_graph[mod_name]
+
+        assert module is not None and thread_module is not None
+        assert module.imports == thread_module.imports
+        assert module.imported_by == thread_module.imported_by
+
+
+def test__mod_graph__placeholders_and_edges() -> None:
+    app, utils = ModName.from_str("app"), ModName.from_str("app.utils")
+    app_path, utils_path = Path("app/__init__.py"), Path("app/utils.py")
+
+    graph = ModGraph()
+    graph.add(app, app_path, {DirectImport(mod_name=utils, path=utils_path, lineno=1, col_offset=0)})
+
+    assert len(graph) == 2
+    assert graph[utils] is None  # imported, but not added yet
+
+    graph.add(utils, utils_path, set())
+    graph.add(app, app_path, {DirectImport(mod_name=utils, path=utils_path, lineno=1, col_offset=0)})
+
+    app_module, utils_module = graph[app], graph[utils_path]
+
+    assert app_module is not None and utils_module is not None
+    assert utils_module.imports == set()
+    assert app_module.imports == {ImportContext(lineno=1, col_offset=0, module=utils_module)}
+    assert utils_module.imported_by == {ImportContext(lineno=1, col_offset=0, module=app_module)}
+    assert repr(app_module) == "Module(app, import=1, imported_by=0)"
+
+
+def test__mod_graph__update_and_remove() -> None:
+    app, utils, json = ModName.from_str("app"), ModName.from_str("app.utils"), ModName.from_str("json")
+    app_path, utils_path = Path("app/__init__.py"), Path("app/utils.py")
+
+    graph = ModGraph()
+    graph.add(app, app_path, {DirectImport(mod_name=utils, path=utils_path, lineno=1, col_offset=0)})
+    graph.add(utils, utils_path, {DirectImport(mod_name=json, path=Path("json/__init__.py"), lineno=1, col_offset=0)})
+
+    assert len(graph) == 3
+
+    graph.update(utils, utils_path, set())
+
+    utils_module = graph[utils]
+
+    assert utils_module is not None and utils_module.imports == set()
+    assert len(graph) == 2  # json placeholder is not imported anymore
+
+    graph.remove(utils_path)
+
+    assert graph[utils] is None
+    assert len(graph) == 2  # utils is still imported by app, so it's kept as a placeholder
+
+    graph.remove(app)
+
+    assert len(graph) == 0
+
+    with pytest.raises(KeyError):
+        graph.remove(app)
+
+
+def test__update_mod_graph__matches_full_build(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "incpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "a.py").write_text("from . import b\nfrom .c import VALUE\n")
+    (package / "b.py").write_text("from . import c\n")
+    (package / "c.py").write_text("VALUE = 1\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    graph = build_mod_graph([package], workers=1)
+
+    (package / "b.py").write_text("")
+    (package / "c.py").unlink()
+    (package / "d.py").write_text("from .a import b\n")
+
+    update_mod_graph(graph, added=[package / "d.py"], modified=[package / "b.py"], deleted=[package / "c.py"])
+
+    rebuilt_graph = build_mod_graph([package], workers=1)
+
+    assert graph_contents(graph) == graph_contents(rebuilt_graph)
+
+
+def test__update_mod_graph__resolves_imports_of_added_modules(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "incpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "a.py").write_text("from . import b\nimport incpkg.c\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    graph = build_mod_graph([package], workers=1)
+
+    (package / "b.py").write_text("")
+    (package / "c.py").write_text("")
+
+    update_mod_graph(graph, added=[package / "b.py", package / "c.py"])
+
+    rebuilt_graph = build_mod_graph([package], workers=1)
+
+    assert graph_contents(graph) == graph_contents(rebuilt_graph)
+
+    for mod_name in ("incpkg.b", "incpkg.c"):
+        module = graph[mod_name]
+
+        assert module is not None
+        assert {str(importer.module.mod_name) for importer in module.imported_by} == {"incpkg.a"}
+
+
+def test__build_mod_graph__skips_relative_imports_beyond_top_level(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    package = tmp_path / "toppkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "m.py").write_text("from .. import x\nfrom ..x import y\nfrom . import n\n")
+    (package / "n.py").write_text("")
+    (tmp_path / "x.py").write_text("y = 1\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    graph = build_mod_graph([package], workers=1)
+
+    assert set(graph._node_ids) == {"toppkg", "toppkg.m", "toppkg.n"}
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test__iter_mod_graph__streams_parsed_files(executor: ExecutorMode) -> None:
+    parsed_files = list(iter_mod_graph([FIXTURE_DIR / "imports"], workers=2, executor=executor, max_pending=1))
+
+    assert sorted(str(mod_name) for mod_name, _, _, _ in parsed_files) == [
+        "tests.fixtures.imports",
+        "tests.fixtures.imports.fields",
+        "tests.fixtures.imports.fields.json",
+        "tests.fixtures.imports.fields.security",
+        "tests.fixtures.imports.fields.security.password",
+        "tests.fixtures.imports.utils",
+    ]
+
+    parsed_file_stream = iter_mod_graph([FIXTURE_DIR / "imports"], workers=2, executor=executor)
+
+    _, file_path, _, _ = next(parsed_file_stream)
+    parsed_file_stream.close()
+
+    assert file_path.exists()
+
+
+def graph_contents(graph: ModGraph) -> Tuple[Set[Tuple[str, str, int, int]], Set[Tuple[str, str, int, int, int]]]:
+    nodes = {
+        (graph._names[node_id], graph._paths[node_id], graph._added[node_id], graph._categories[node_id])
+        for node_id in graph._node_ids.values()
+    }
+    edges = {
+        (
+            graph._names[graph._edge_src[edge_id]],
+            graph._names[graph._edge_dst[edge_id]],
+            graph._edge_lineno[edge_id],
+            graph._edge_col[edge_id],
+            graph._edge_kind[edge_id],
+        )
+        for node_id in graph._node_ids.values()
+        for edge_id in graph._out_edge_ids(node_id)
+    }
+
+    return nodes, edges
+
+
+def test__mod_graph__merge_matches_full_build(tmp_path: Path) -> None:
+    shard_a, shard_b = tmp_path / "a" / "src" / "teama", tmp_path / "b" / "src" / "teamb"
+
+    for package, imported in ((shard_a, "teamb"), (shard_b, "teama")):
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        (package / "api.py").write_text(f"import json\nfrom {imported} import core\n")
+        (package / "core.py").write_text("from . import api\n\n\ndef run():\n    from . import missing\n")
+
+    full_graph = build_mod_graph([shard_a, shard_b], include_third_party=True, workers=1)
+    partial_a = build_mod_graph([shard_a], include_third_party=True, workers=1, other_shards=[shard_b])
+    partial_b = build_mod_graph([shard_b], include_third_party=True, workers=1, other_shards=[shard_a])
+
+    # imports of the other shard are kept as placeholders
+    assert partial_a["teamb.core"] is None
+    assert {str(module.mod_name) for module in partial_a.dependencies(["teama.api"])} == {"json", "teamb.core"}
+
+    merged_graph = ModGraph.merge(partial_a, partial_b)
+
+    assert graph_contents(merged_graph) == graph_contents(full_graph)
+    # teama.core is in the import cycle across both shards
+    assert {str(module.mod_name) for module in merged_graph.dependents(["teama.core"])} == {
+        "teama.api",
+        "teama.core",
+        "teamb.api",
+        "teamb.core",
+    }
+
+    # overlapping partials are merged the same way as adding modules again does
+    assert graph_contents(ModGraph.merge(full_graph, partial_a, full_graph)) == graph_contents(full_graph)
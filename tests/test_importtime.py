@@ -0,0 +1,73 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from tests import build_graph
+from yew.importtime import ImportTime, lazy_import_candidates, load_importtime, parse_importtime
+
+IMPORTTIME_LOG = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   numpy.core
+import time:      5000 |       5100 | numpy
+import time:       300 |        300 | app.utils
+import time:        50 |        450 | app.models
+import time:        20 |       5570 | app
+Traceback (most recent call last):
+"""
+
+
+def test__parse_importtime() -> None:
+    import_times = parse_importtime(IMPORTTIME_LOG.splitlines())
+
+    assert import_times["numpy"] == ImportTime(self_us=5000, cumulative_us=5100, depth=0)
+    assert import_times["numpy.core"] == ImportTime(self_us=100, cumulative_us=100, depth=1)
+    assert len(import_times) == 5
+
+
+def test__load_importtime__real_log(tmp_path: Path) -> None:
+    log_path = tmp_path / "import.log"
+
+    with open(log_path, "w") as log:
+        subprocess.run([sys.executable, "-X", "importtime", "-c", "import json"], stderr=log, check=True)
+
+    import_times = load_importtime(log_path)
+
+    assert "json" in import_times
+    assert import_times["json"].cumulative_us >= import_times["json"].self_us
+
+
+def test__lazy_import_candidates() -> None:
+    graph = build_graph(
+        {
+            "app": [("app.models", 1)],
+            "app.models": [("app.utils", 3), ("numpy", 4)],
+            "app.utils": [("numpy.core", 10)],
+        }
+    )
+
+    assert graph.set_import_times(parse_importtime(IMPORTTIME_LOG.splitlines())) == 5
+
+    numpy = graph.dependencies(["app.utils"]).pop()
+
+    assert numpy.import_time == ImportTime(self_us=100, cumulative_us=100, depth=1)
+
+    candidates = [
+        (str(candidate.module.mod_name), candidate.import_context.lineno, candidate.cost_us)
+        for candidate in lazy_import_candidates(graph)
+    ]
+
+    # numpy.core is a part of numpy, so its time is not counted twice
+    assert candidates == [
+        ("app", 1, 50 + 300 + 5100),
+        ("app.models", 4, 5100),
+        ("app.models", 3, 300 + 100),
+        ("app.utils", 10, 100),
+    ]
+
+    top_candidate = lazy_import_candidates(graph, min_cost_us=1000, limit=1)[0]
+
+    assert [(str(module.mod_name), cost_us) for module, cost_us in top_candidate.heaviest] == [
+        ("numpy", 5100),
+        ("app.utils", 300),
+        ("app.models", 50),
+    ]
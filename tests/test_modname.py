@@ -1,3 +1,4 @@
+import pickle
 from pathlib import Path
 
 import pytest
@@ -22,6 +23,29 @@ def test__modname_hashable() -> None:
     assert modname3 not in mod_set
 
 
+def test__modname__interned() -> None:
+    mod_name = ModName.from_str("common.filesystems.async")
+
+    assert ModName(["common", "filesystems", "async"]) is mod_name
+    assert ModName.from_str("common.filesystems") / "async" is mod_name
+    assert mod_name.resolve(1) is ModName.from_str("common.filesystems")
+    assert pickle.loads(pickle.dumps(mod_name)) is mod_name
+    assert mod_name.parts == ("common", "filesystems", "async")
+
+    with pytest.raises(AttributeError):
+        mod_name._name = "common"  # type: ignore[misc]
+
+
+def test__modname__resolve_beyond_top_level() -> None:
+    mod_name = ModName.from_str("pkg.mod")
+
+    assert ModName(()).parts == ()
+    assert mod_name.resolve(1) is ModName.from_str("pkg")
+
+    with pytest.raises(ValueError):
+        mod_name.resolve(2)
+
+
 @pytest.mark.parametrize(
     "path,module_name",
     [
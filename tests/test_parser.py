@@ -1,13 +1,140 @@
+import ast
+import dataclasses
+import sysconfig
+from pathlib import Path
+from typing import Dict, Iterator, List, Set
+
 import pytest
 
 from tests import FIXTURE_DIR
-from yew.collection import ModName
-from yew.mods.parsers import ModParser
+from yew.collection import DirectImport, ImportKind, ModName
+from yew.mods.finders import ModFinder
+from yew.mods.parsers import ImportFromParser, ImportParser, ModParser, iter_import_nodes
+from yew.mods.resolvers import ModResolver
+
+
+def walk_imports(mod_name: ModName, content: bytes, resolver: ModResolver) -> Set[DirectImport]:
+    """
+    Reference import extraction that visits every AST node
+    """
+    parsers: Dict[type[ast.AST], ImportParser | ImportFromParser] = {
+        ast.Import: ImportParser(resolver),
+        ast.ImportFrom: ImportFromParser(resolver),
+    }
+    imported_mods: Set[DirectImport] = set()
+
+    for node in ast.walk(ast.parse(content)):
+        if node_parser := parsers.get(type(node)):
+            imported_mods |= node_parser(mod_name, node)
+
+    return imported_mods
+
+
+def stdlib_files() -> Iterator[Path]:
+    stdlib_dir = Path(sysconfig.get_paths()["stdlib"])
+
+    yield from stdlib_dir.glob("*.py")
+
+    for package in ("asyncio", "email", "importlib", "json", "logging", "unittest"):
+        yield from (stdlib_dir / package).glob("*.py")
 
 
 def test__mod_parser__syntax_error() -> None:
     parser = ModParser()
 
-    with open(FIXTURE_DIR / "syntaxerrs" / "broken_class.py") as file:
+    with open(FIXTURE_DIR / "syntaxerrs" / "broken_import.py") as file:
         with pytest.raises(SyntaxError):
-            parser.parse(ModName.from_str("tests.fixtures.syntaxerrs.broken_class"), content=file.read())
+            parser.parse(ModName.from_str("tests.fixtures.syntaxerrs.broken_import"), content=file.read())
+
+
+def test__mod_parser__skips_files_without_imports() -> None:
+    parser = ModParser()
+    content = (FIXTURE_DIR / "syntaxerrs" / "broken_class.py").read_bytes()
+
+    assert parser.parse(ModName.from_str("tests.fixtures.syntaxerrs.broken_class"), content=content) == set()
+
+
+def test__mod_parser__matches_full_ast_walk() -> None:
+    resolver = ModResolver()
+    parser = ModParser(resolver)
+
+    for file_path in ModFinder().find([FIXTURE_DIR / "imports"]):
+        mod_name = ModName.from_path(file_path)
+        content = file_path.read_bytes()
+
+        # the reference extraction doesn't know about import kinds
+        imported_mods = {
+            dataclasses.replace(imported, kind=ImportKind.EAGER) for imported in parser.parse(mod_name, content)
+        }
+
+        assert imported_mods == walk_imports(mod_name, content, resolver)
+
+
+def test__mod_parser__import_kinds() -> None:
+    content = """\
+import json
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import decimal
+
+try:
+    import csv
+except ImportError:
+    import fractions
+
+try:
+    import uuid
+finally:
+    pass
+
+
+class Model:
+    import pickle
+
+    def save(self):
+        import shelve
+
+        try:
+            import zlib
+        except (ModuleNotFoundError, OSError):
+            pass
+
+
+if typing.TYPE_CHECKING:
+    import fnmatch
+else:
+    import glob
+"""
+    imported_mods = ModParser().parse(ModName.from_str("app"), content)
+
+    assert {str(imported.mod_name): imported.kind for imported in imported_mods} == {
+        "json": ImportKind.EAGER,
+        "typing": ImportKind.EAGER,
+        "decimal": ImportKind.TYPE_CHECKING,
+        "csv": ImportKind.OPTIONAL,
+        "fractions": ImportKind.OPTIONAL,
+        "uuid": ImportKind.EAGER,
+        "pickle": ImportKind.EAGER,
+        "shelve": ImportKind.LAZY,
+        "zlib": ImportKind.LAZY,
+        "fnmatch": ImportKind.TYPE_CHECKING,
+        "glob": ImportKind.EAGER,
+    }
+
+
+def test__iter_import_nodes__matches_full_ast_walk_on_stdlib() -> None:
+    checked_files: List[Path] = []
+
+    for file_path in stdlib_files():
+        try:
+            ast_tree = ast.parse(file_path.read_bytes())
+        except SyntaxError:
+            continue
+
+        expected_nodes = {id(node) for node in ast.walk(ast_tree) if isinstance(node, (ast.Import, ast.ImportFrom))}
+
+        assert {id(node) for node in iter_import_nodes(ast_tree)} == expected_nodes, file_path
+        checked_files.append(file_path)
+
+    assert checked_files
@@ -0,0 +1,94 @@
+import subprocess
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+
+@pytest.fixture
+def project(pytester: pytest.Pytester) -> pytest.Pytester:
+    pytester.makepyfile(
+        **{
+            "app/__init__.py": "",
+            "app/core.py": "VALUE = 1\n",
+            "app/api.py": "from app.core import VALUE\n",
+            "app/other.py": "OTHER = 2\n",
+            "app_tests/__init__.py": "",
+            "app_tests/test_api.py": "from app import api\n\n\ndef test_api():\n    pass\n",
+            "app_tests/test_other.py": (
+                "from app.other import OTHER\n\n\ndef test_a():\n    pass\n\n\ndef test_b():\n    pass\n"
+            ),
+        }
+    )
+
+    return pytester
+
+
+def test__plugin__deselects_unaffected_tests(project: pytest.Pytester) -> None:
+    result = project.runpytest("-p", "yew.pytest_plugin", "--yew-impacted", "--yew-changed", "app/core.py")
+
+    result.assert_outcomes(passed=1, deselected=2)
+    result.stdout.fnmatch_lines(["yew: deselected 2 tests in 1 modules that don't import any of 1 changed files*"])
+
+    result = project.runpytest("-p", "yew.pytest_plugin")
+
+    result.assert_outcomes(passed=3)
+
+
+def test__plugin__changed_files_from_git(project: pytest.Pytester) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=project.path, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init")
+
+    result = project.runpytest("-p", "yew.pytest_plugin", "--yew-impacted")
+    result.assert_outcomes(deselected=3)
+
+    (project.path / "app" / "other.py").write_text("OTHER = 3\n")
+
+    result = project.runpytest("-p", "yew.pytest_plugin", "--yew-impacted")
+    result.assert_outcomes(passed=2, deselected=1)
+
+
+def test__plugin__symbol_level_selection(project: pytest.Pytester) -> None:
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=project.path, check=True, capture_output=True)
+
+    (project.path / "app" / "core.py").write_text("VALUE = 1\nOTHER = 2\n")
+    (project.path / "app_tests" / "test_core.py").write_text(
+        "from app.core import OTHER\n\n\ndef test_core():\n    pass\n"
+    )
+
+    git("init", "-q")
+    git("add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init")
+
+    (project.path / "app" / "core.py").write_text("VALUE = 3\nOTHER = 2\n")
+
+    result = project.runpytest("-p", "yew.pytest_plugin", "--yew-impacted")
+    result.assert_outcomes(passed=2, deselected=2)
+
+    result = project.runpytest("-p", "yew.pytest_plugin", "--yew-impacted", "--yew-symbols")
+    result.assert_outcomes(passed=1, deselected=3)
+    result.stdout.fnmatch_lines(["yew: deselected 3 tests*(symbol-level)*"])
+
+
+def test__plugin__keeps_all_tests_when_changed_module_is_deleted(project: pytest.Pytester) -> None:
+    (project.path / "app" / "other.py").unlink()
+    (project.path / "app_tests" / "test_other.py").write_text("def test_a():\n    pass\n\n\ndef test_b():\n    pass\n")
+
+    result = project.runpytest("-p", "yew.pytest_plugin", "--yew-impacted", "--yew-changed", "app/other.py")
+
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(["yew: 1 changed modules are not in the import graph, running all tests"])
+
+
+def test__plugin__runs_without_cacheprovider(project: pytest.Pytester) -> None:
+    result = project.runpytest(
+        "-p", "yew.pytest_plugin", "-p", "no:cacheprovider", "--yew-impacted", "--yew-changed", "app/core.py"
+    )
+
+    result.assert_outcomes(passed=1, deselected=2)
+    assert not (project.path / ".pytest_cache").exists()
@@ -0,0 +1,78 @@
+from pathlib import Path
+from typing import Set
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.collection import DirectImport, ImportKind, ModGraph, ModName, Module
+from yew.mods.graph import build_mod_graph
+
+
+def names(modules: Set[Module]) -> Set[str]:
+    return {str(module.mod_name) for module in modules}
+
+
+@pytest.fixture(scope="module")
+def graph() -> ModGraph:
+    return build_mod_graph([FIXTURE_DIR / "imports"], workers=1)
+
+
+def test__graph__dependents(graph: ModGraph) -> None:
+    assert names(graph.dependents(["tests.fixtures.imports.utils"])) == {
+        "tests.fixtures.imports.fields.security.password",
+        "tests.fixtures.imports.fields.security",
+    }
+    assert names(graph.dependents([FIXTURE_DIR / "imports" / "utils" / "__init__.py"], depth=1)) == {
+        "tests.fixtures.imports.fields.security.password",
+    }
+    assert graph.dependents(["tests.fixtures.missing"]) == set()
+
+
+def test__graph__dependencies(graph: ModGraph) -> None:
+    assert names(graph.dependencies([ModName.from_str("tests.fixtures.imports.fields.security")])) == {
+        "tests.fixtures.imports.fields.security.password",
+        "tests.fixtures.imports.fields",
+        "tests.fixtures.imports.utils",
+    }
+
+
+def test__graph__closures_are_invalidated_on_change() -> None:
+    a, b, c = ModName.from_str("a"), ModName.from_str("b"), ModName.from_str("c")
+
+    graph = ModGraph()
+    graph.add(a, Path("a.py"), {DirectImport(mod_name=b, path=Path("b.py"), lineno=1, col_offset=0)})
+
+    assert names(graph.dependencies(["a"])) == {"b"}
+    assert names(graph.dependencies(["a"], first_party_only=True)) == set()
+
+    graph.add(b, Path("b.py"), {DirectImport(mod_name=c, path=Path("c.py"), lineno=1, col_offset=0)})
+
+    assert names(graph.dependencies(["a"])) == {"b", "c"}
+    assert names(graph.dependencies(["a"], first_party_only=True)) == {"b"}
+    assert names(graph.dependents(["c"])) == {"a", "b"}
+
+
+def test__graph__closures_by_import_kind() -> None:
+    def direct_import(name: str, kind: ImportKind) -> DirectImport:
+        return DirectImport(mod_name=ModName.from_str(name), path=Path(f"{name}.py"), lineno=1, col_offset=0, kind=kind)
+
+    graph = ModGraph()
+    graph.add(
+        ModName.from_str("a"),
+        Path("a.py"),
+        {direct_import("b", ImportKind.EAGER), direct_import("c", ImportKind.TYPE_CHECKING)},
+    )
+    graph.add(ModName.from_str("b"), Path("b.py"), {direct_import("d", ImportKind.LAZY)})
+    graph.add(ModName.from_str("c"), Path("c.py"), {direct_import("e", ImportKind.EAGER)})
+
+    assert names(graph.dependencies(["a"])) == {"b", "c", "d", "e"}
+    assert names(graph.dependencies(["a"], kinds={ImportKind.EAGER, ImportKind.OPTIONAL})) == {"b"}
+    assert names(graph.dependencies(["a"], kinds={ImportKind.EAGER, ImportKind.LAZY})) == {"b", "d"}
+    assert names(graph.dependents(["e"], kinds={ImportKind.EAGER})) == {"c"}
+
+    module = graph["a"]
+
+    assert module is not None and {context.kind for context in module.imports or ()} == {
+        ImportKind.EAGER,
+        ImportKind.TYPE_CHECKING,
+    }
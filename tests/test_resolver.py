@@ -0,0 +1,95 @@
+import sys
+from importlib import util as importlib_util
+from pathlib import Path
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.collection import ModName, ModuleNotFound
+from yew.mods.resolvers import ModResolver
+
+
+@pytest.mark.parametrize(
+    "mod_name",
+    [
+        "tests.fixtures.imports",
+        "tests.fixtures.imports.fields.json",
+        "tests.fixtures.imports.fields.security.password",
+        "json",
+        "json.decoder",
+        "email.mime.text",
+        "pytest",
+    ],
+)
+def test__mod_resolver__matches_find_spec(mod_name: str) -> None:
+    resolver = ModResolver()
+
+    mod_spec = importlib_util.find_spec(mod_name)
+
+    assert mod_spec is not None and mod_spec.origin is not None
+    assert resolver.file_path(ModName.from_str(mod_name)) == Path(mod_spec.origin)
+
+
+def test__mod_resolver__registered_modules() -> None:
+    resolver = ModResolver(search_paths=[])
+    file_path = FIXTURE_DIR / "imports" / "fields" / "__init__.py"
+
+    resolver.add(ModName.from_str("fields"), file_path)
+
+    assert resolver.file_path(ModName.from_str("fields")) == file_path
+    assert resolver.is_package(ModName.from_str("fields"))
+    assert resolver.file_path(ModName.from_str("fields.json")) == file_path.parent / "json.py"
+    assert not resolver.is_package(ModName.from_str("fields.json"))
+
+
+def test__mod_resolver__object_path() -> None:
+    resolver = ModResolver()
+
+    mod_name, obj = resolver.from_object_path(["tests", "fixtures", "imports", "fields", "Field"])
+
+    assert str(mod_name) == "tests.fixtures.imports.fields"
+    assert obj == "Field"
+
+    with pytest.raises(ModuleNotFound):
+        resolver.from_object_path(["tests", "fixtures", "missing", "Field"])
+
+
+def test__mod_resolver__does_not_import_packages(tmp_path: Path) -> None:
+    package = tmp_path / "sideeffectpkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("raise RuntimeError('imported during analysis')\n")
+    (package / "mod.py").write_text("")
+    (tmp_path / "nspkg" / "portion").mkdir(parents=True)
+    (tmp_path / "nspkg" / "portion" / "__init__.py").write_text("")
+
+    resolver = ModResolver(search_paths=[tmp_path])
+
+    assert resolver.file_path(ModName.from_str("sideeffectpkg.mod")) == package / "mod.py"
+    assert resolver.is_package(ModName.from_str("nspkg"))
+    assert resolver.file_path(ModName.from_str("nspkg.portion")) == tmp_path / "nspkg" / "portion" / "__init__.py"
+    assert "sideeffectpkg" not in sys.modules
+
+    with pytest.raises(ModuleNotFound):
+        resolver.file_path(ModName.from_str("sideeffectpkg.missing"))
+
+
+def test__mod_resolver__find_spec_fallback() -> None:
+    mod_name = ModName.from_str("tests.fixtures.imports.utils")
+
+    with pytest.raises(ModuleNotFound):
+        ModResolver(search_paths=[]).file_path(mod_name)
+
+    assert ModResolver(search_paths=[], find_spec_fallback=True).file_path(mod_name) == (
+        FIXTURE_DIR / "imports" / "utils" / "__init__.py"
+    )
+
+
+def test__mod_resolver__runtime_aliases() -> None:
+    resolver = ModResolver()
+
+    # os is a plain module, os.path exists only as an alias in sys.modules
+    assert resolver.file_path(ModName.from_str("os.path")) == Path(sys.modules["os.path"].__file__ or "")
+    assert resolver.from_object_path(["os", "path", "join"]) == (ModName.from_str("os.path"), "join")
+
+    with pytest.raises(ModuleNotFound):
+        resolver.file_path(ModName.from_str("os.missing"))
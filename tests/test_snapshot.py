@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.collection import ModGraph
+from yew.mods.graph import build_mod_graph
+from yew.snapshot import SnapshotError
+
+
+def assert_same_graphs(graph: ModGraph, loaded_graph: ModGraph) -> None:
+    assert len(loaded_graph) == len(graph)
+    assert {str(module.mod_name) for module in loaded_graph} == {str(module.mod_name) for module in graph}
+
+    for module in graph:
+        loaded_module = loaded_graph[module.file_path]
+
+        assert loaded_module is not None
+        assert loaded_module.mod_name == module.mod_name
+        assert loaded_module.imports == module.imports
+        assert loaded_module.imported_by == module.imported_by
+
+
+def test__snapshot__roundtrip(tmp_path: Path) -> None:
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1)
+
+    graph.save(tmp_path / "graph.yew")
+
+    assert_same_graphs(graph, ModGraph.load(tmp_path / "graph.yew"))
+
+
+def test__snapshot__keeps_classifications(tmp_path: Path) -> None:
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], include_third_party=True, workers=1)
+
+    graph.save(tmp_path / "graph.yew")
+    loaded_graph = ModGraph.load(tmp_path / "graph.yew")
+
+    for node_id in graph._node_ids.values():
+        module, loaded_module = graph._view(node_id), loaded_graph._view(loaded_graph._node_ids[graph._names[node_id]])
+
+        assert (loaded_module.category, loaded_module.distribution) == (module.category, module.distribution)
+
+
+def test__snapshot__roundtrip_after_removal(tmp_path: Path) -> None:
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1)
+    graph.remove("tests.fixtures.imports.fields.security.password")
+
+    graph.save(tmp_path / "graph.yew")
+    loaded_graph = ModGraph.load(tmp_path / "graph.yew")
+
+    assert_same_graphs(graph, loaded_graph)
+    assert {str(module.mod_name) for module in loaded_graph.dependents(["tests.fixtures.imports.fields"])} == {
+        "tests.fixtures.imports",
+        "tests.fixtures.imports.fields.json",
+    }
+
+
+def test__snapshot__corrupted(tmp_path: Path) -> None:
+    build_mod_graph([FIXTURE_DIR / "imports"], workers=1).save(tmp_path / "graph.yew")
+
+    snapshot = bytearray((tmp_path / "graph.yew").read_bytes())
+    snapshot[-1] ^= 0xFF
+    (tmp_path / "graph.yew").write_bytes(snapshot)
+
+    with pytest.raises(SnapshotError, match="checksum"):
+        ModGraph.load(tmp_path / "graph.yew")
+
+    (tmp_path / "graph.yew").write_bytes(b"not a snapshot" * 10)
+
+    with pytest.raises(SnapshotError, match="not a graph snapshot"):
+        ModGraph.load(tmp_path / "graph.yew")
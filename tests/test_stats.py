@@ -0,0 +1,54 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.mods.cache import ParseCache
+from yew.mods.graph import ExecutorMode, build_mod_graph
+from yew.mods.stats import PHASES, BuildStats, FileStats
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test__build_stats__phases_and_slowest_files(executor: ExecutorMode) -> None:
+    streamed: List[FileStats] = []
+    stats = BuildStats(slowest_limit=3, on_file=streamed.append)
+
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=2, executor=executor, stats=stats)
+
+    assert stats.files == len(graph) == 6
+    assert stats.imports == sum(len(module.imports or ()) for module in graph)
+    assert set(stats.phase_times) == set(PHASES)
+    assert all(stats.phase_times[phase] > 0 for phase in ("discover", "read", "filter", "insert"))
+    assert sum(worker_times["read"] for worker_times in stats.worker_times.values()) == pytest.approx(
+        stats.phase_times["read"]
+    )
+
+    # files without imports are not parsed, but still streamed
+    assert len(streamed) == 6
+    assert [file_stats.total for file_stats in stats.slowest_files] == sorted(
+        (file_stats.total for file_stats in streamed), reverse=True
+    )[:3]
+
+
+def test__build_stats__counters(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    package = tmp_path / "statspkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "app.py").write_text("import missing_dependency\nfrom .missing import thing\n")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    stats = BuildStats()
+    build_mod_graph([package], workers=1, find_spec_fallback=True, cache=ParseCache(tmp_path / "cache"), stats=stats)
+
+    assert stats.resolution_failures == 2
+    # statspkg.missing.thing is tried as a module first and then statspkg.missing is
+    assert stats.find_spec_calls == 3
+    assert (stats.cache_hits, stats.cache_misses) == (0, 2)
+
+    stats = BuildStats()
+    build_mod_graph([package], workers=1, cache=ParseCache(tmp_path / "cache"), stats=stats)
+
+    assert (stats.cache_hits, stats.cache_misses) == (2, 0)
+    assert stats.as_dict()["files"] == 2
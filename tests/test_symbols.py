@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Set
+
+import pytest
+
+from tests import FIXTURE_DIR
+from yew.collection import ModGraph, Module
+from yew.mods.graph import build_mod_graph
+from yew.symbols import changed_symbols
+
+SOURCES = {
+    "__init__.py": "",
+    "utils.py": "CONSTANT = 1\n\n\ndef slugify(text):\n    return text\n\n\ndef unrelated():\n    pass\n",
+    "models.py": (
+        "from app.utils import slugify\n\n\ndef make_slug():\n    return slugify('a')\n\n\ndef other():\n    pass\n"
+    ),
+    "api.py": "from app.models import make_slug\n",
+    "views.py": "from app.models import other\n",
+    "unrelated.py": "from app.utils import unrelated as helper\n",
+    "whole.py": "import app.utils\n\n\ndef constant():\n    return app.utils.CONSTANT\n",
+    "lazy.py": "def slug():\n    from app.utils import slugify\n\n    return slugify('b')\n",
+    "star.py": "from app.utils import *\n",
+    "star_user.py": "from app.star import slugify\n",
+    "side_effect.py": "from app.utils import slugify\n\nslugify('c')\n",
+    "side_effect_user.py": "from app.side_effect import slugify\n",
+}
+
+
+def names(modules: Set[Module]) -> Set[str]:
+    return {str(module.mod_name) for module in modules}
+
+
+@pytest.fixture
+def graph(tmp_path: Path) -> ModGraph:
+    package = tmp_path / "app"
+    package.mkdir()
+
+    for file_name, source in SOURCES.items():
+        (package / file_name).write_text(source)
+
+    return build_mod_graph([package], workers=1)
+
+
+def test__import_context__symbols() -> None:
+    graph = build_mod_graph([FIXTURE_DIR / "imports"], workers=1)
+    module = graph["tests.fixtures.imports.fields.security"]
+
+    assert module is not None and {context.symbols for context in module.imports or ()} == {("PasswordField",)}
+
+
+def test__graph__symbol_dependents(graph: ModGraph) -> None:
+    # importing the module itself (`import app.utils`) uses any of its names
+    assert names(graph.symbol_dependents({"app.utils": {"slugify"}})) == {
+        "app.models",
+        "app.api",
+        "app.whole",
+        "app.lazy",
+        "app.star",
+        "app.star_user",
+        "app.side_effect",
+        "app.side_effect_user",
+    }
+    assert names(graph.symbol_dependents({"app.utils": {"CONSTANT"}})) == {"app.whole", "app.star"}
+    assert names(graph.symbol_dependents({"app.models": {"other"}})) == {"app.views"}
+    assert names(graph.symbol_dependents({"app.models": set()})) == set()
+
+    # a change of the whole module falls back to module-level dependents, except for unused imported names
+    assert names(graph.symbol_dependents({"app.utils": None})) == names(graph.dependents(["app.utils"])) - {"app.views"}
+
+
+def test__graph__symbol_dependents__indirect(tmp_path: Path) -> None:
+    package = tmp_path / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "mod.py").write_text("def changed_fn():\n    pass\n\n\ndef helper():\n    return changed_fn()\n")
+    (package / "user.py").write_text("from pkg.mod import helper\n")
+    (package / "unrelated.py").write_text("from pkg.mod import changed_fn\n\n\ndef other():\n    pass\n")
+    (package / "unrelated_user.py").write_text("from pkg.unrelated import other\n")
+
+    graph = build_mod_graph([package], workers=1)
+
+    # helper() calls the changed function, so importers of helper are affected too
+    assert names(graph.symbol_dependents({"pkg.mod": {"changed_fn"}})) == {"pkg.user", "pkg.unrelated"}
+
+
+def test__changed_symbols() -> None:
+    source = "import os\n\nVALUE = 1\n\n\ndef func():\n    return VALUE\n\n\nclass Model:\n    pass\n"
+
+    assert changed_symbols(source, source.replace("VALUE = 1\n", "# a comment\nVALUE = (1)\n")) == set()
+    assert changed_symbols(source, source.replace("return VALUE", "return VALUE + 1")) == {"func"}
+    assert changed_symbols(source, source.replace("import os", "import os, sys")) == {"sys"}
+    assert changed_symbols(source, source.replace("    pass", "    name = 'model'")) == {"Model"}
+    assert changed_symbols(source, source + "\nprint(VALUE)\n") is None
+    assert changed_symbols(source, "def broken(:\n") is None
@@ -0,0 +1,5 @@
+import sys
+
+from yew.cli import main
+
+sys.exit(main())
@@ -0,0 +1,39 @@
+from array import array
+from collections import Counter
+from itertools import accumulate
+from typing import Sequence
+
+
+class Adjacency:
+    """
+    CSR-style adjacency index: edge IDs grouped by node, where node N owns edge_ids[offsets[N]:offsets[N + 1]].
+    Without edge IDs, edges are sorted by node already, so the offsets are the edge IDs themselves
+    """
+
+    def __init__(self, offsets: "array[int]", edge_ids: "array[int] | None" = None) -> None:
+        self.offsets = offsets
+        self.edge_ids = edge_ids
+
+    @classmethod
+    def build(cls, node_ids: "array[int]", total_nodes: int) -> "Adjacency":
+        """
+        Index edges by the given column of their node IDs
+        """
+        counts = Counter(node_ids)
+
+        offsets = array("i", accumulate((counts.get(node_id, 0) for node_id in range(total_nodes)), initial=0))
+        edge_ids = array("i", sorted(range(len(node_ids)), key=node_ids.__getitem__))
+
+        return cls(offsets, edge_ids)
+
+    def __getitem__(self, node_id: int) -> Sequence[int]:
+        if node_id + 1 >= len(self.offsets):
+            # the node has been added after the index was built
+            return ()
+
+        start, end = self.offsets[node_id], self.offsets[node_id + 1]
+
+        if self.edge_ids is None:
+            return range(start, end)
+
+        return self.edge_ids[start:end]
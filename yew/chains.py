@@ -0,0 +1,187 @@
+import heapq
+import logging
+from typing import TYPE_CHECKING, AbstractSet, Dict, List, Optional, Sequence, Set, Tuple
+
+from yew.kinds import ALL_KINDS_MASK
+
+if TYPE_CHECKING:
+    from yew.collection import ModGraph
+
+logger = logging.getLogger(__name__)
+
+START = -1  # the edge ID a search side starts with
+
+
+def shortest_chain(
+    graph: "ModGraph",
+    source_id: int,
+    target_id: int,
+    kinds: int = ALL_KINDS_MASK,
+    blocked_ids: AbstractSet[int] = frozenset(),
+    blocked_pairs: AbstractSet[Tuple[int, int]] = frozenset(),
+) -> Optional[List[int]]:
+    """
+    Find edge IDs of the shortest import chain from the source to the target node (None if there is no chain).
+
+    The search is bidirectional: it always expands one whole BFS level of the smaller frontier, either forward
+    over imports of the source side or backward over importers of the target side, and stops at the level
+    where the frontiers meet. Nodes and (importer, imported) pairs can be blocked to find alternative chains
+    """
+    if source_id == target_id:
+        return []
+
+    # node ID -> (edge ID the node has been reached by, number of hops from the side's start)
+    forward: Dict[int, Tuple[int, int]] = {source_id: (START, 0)}
+    backward: Dict[int, Tuple[int, int]] = {target_id: (START, 0)}
+
+    forward_frontier, backward_frontier = [source_id], [target_id]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting_id = _expand(
+                graph, forward_frontier, forward, backward, kinds, blocked_ids, blocked_pairs
+            )
+        else:
+            backward_frontier, meeting_id = _expand(
+                graph, backward_frontier, backward, forward, kinds, blocked_ids, blocked_pairs, reverse=True
+            )
+
+        if meeting_id is not None:
+            return _join(graph, meeting_id, forward, backward)
+
+    return None
+
+
+def shortest_chains(
+    graph: "ModGraph",
+    source_id: int,
+    target_id: int,
+    k: int,
+    kinds: int = ALL_KINDS_MASK,
+) -> List[List[int]]:
+    """
+    Find edge IDs of up to k shortest import chains from the source to the target node, shortest first.
+
+    Chains go through distinct sequences of modules without visiting a module twice (Yen's algorithm
+    on top of the bidirectional search). Several imports of the same module by one importer are one hop
+    """
+    if (first_chain := shortest_chain(graph, source_id, target_id, kinds)) is None:
+        return []
+
+    edge_dst = graph._edge_dst
+
+    def chain_nodes(chain: Sequence[int]) -> Tuple[int, ...]:
+        return (source_id, *(edge_dst[edge_id] for edge_id in chain))
+
+    chains = [first_chain]
+    found_nodes = [chain_nodes(first_chain)]
+
+    # (number of hops, modules of the chain, chain)
+    candidates: List[Tuple[int, Tuple[int, ...], List[int]]] = []
+    seen: Set[Tuple[int, ...]] = {found_nodes[0]}
+
+    while len(chains) < k:
+        last_chain, last_nodes = chains[-1], found_nodes[-1]
+
+        for spur_index in range(len(last_chain)):
+            spur_id = last_nodes[spur_index]
+            root_nodes = last_nodes[: spur_index + 1]
+
+            # don't repeat the chains found so far and don't go back through the root of the chain
+            blocked_pairs = {
+                (spur_id, nodes[spur_index + 1]) for nodes in found_nodes if nodes[: spur_index + 1] == root_nodes
+            }
+            spur_chain = shortest_chain(graph, spur_id, target_id, kinds, set(root_nodes[:-1]), blocked_pairs)
+
+            if spur_chain is None:
+                continue
+
+            chain = [*last_chain[:spur_index], *spur_chain]
+
+            if (nodes := chain_nodes(chain)) in seen:
+                continue
+
+            seen.add(nodes)
+            heapq.heappush(candidates, (len(chain), nodes, chain))
+
+        if not candidates:
+            break
+
+        _, nodes, chain = heapq.heappop(candidates)
+
+        chains.append(chain)
+        found_nodes.append(nodes)
+
+    return chains
+
+
+def _expand(
+    graph: "ModGraph",
+    frontier: List[int],
+    visited: Dict[int, Tuple[int, int]],
+    other_visited: Dict[int, Tuple[int, int]],
+    kinds: int,
+    blocked_ids: AbstractSet[int],
+    blocked_pairs: AbstractSet[Tuple[int, int]],
+    *,
+    reverse: bool = False,
+) -> Tuple[List[int], Optional[int]]:
+    """
+    Visit the next BFS level of one search side (over importers if reverse) and return it with the node
+    where the chain is the shortest if the other side has been reached. The whole level is expanded,
+    since the first node reached on the other side is not necessarily the closest one to its start
+    """
+    edge_ids = graph._in_edge_ids if reverse else graph._out_edge_ids
+    neighbors = graph._edge_src if reverse else graph._edge_dst
+
+    next_frontier: List[int] = []
+    meeting_id: Optional[int] = None
+    meeting_hops = 0
+
+    for node_id in frontier:
+        hops = visited[node_id][1] + 1
+
+        for edge_id in graph._filter_kinds(edge_ids(node_id), kinds):
+            neighbor_id = neighbors[edge_id]
+
+            if neighbor_id in visited or neighbor_id in blocked_ids:
+                continue
+
+            if blocked_pairs and ((neighbor_id, node_id) if reverse else (node_id, neighbor_id)) in blocked_pairs:
+                continue
+
+            visited[neighbor_id] = (edge_id, hops)
+            next_frontier.append(neighbor_id)
+
+            if (other := other_visited.get(neighbor_id)) is None:
+                continue
+
+            if meeting_id is None or other[1] < meeting_hops:
+                meeting_id, meeting_hops = neighbor_id, other[1]
+
+    return next_frontier, meeting_id
+
+
+def _join(
+    graph: "ModGraph",
+    meeting_id: int,
+    forward: Dict[int, Tuple[int, int]],
+    backward: Dict[int, Tuple[int, int]],
+) -> List[int]:
+    edge_src, edge_dst = graph._edge_src, graph._edge_dst
+    chain: List[int] = []
+
+    node_id = meeting_id
+
+    while (edge_id := forward[node_id][0]) != START:
+        chain.append(edge_id)
+        node_id = edge_src[edge_id]
+
+    chain.reverse()
+    node_id = meeting_id
+
+    while (edge_id := backward[node_id][0]) != START:
+        chain.append(edge_id)
+        node_id = edge_dst[edge_id]
+
+    return chain
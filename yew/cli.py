@@ -0,0 +1,195 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from yew.daemon import (
+    DEFAULT_CONFIG_PATH,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SOCKET_PATH,
+    DaemonNotRunning,
+    GraphDaemon,
+    Request,
+    absolute_targets,
+    query,
+    query_daemon,
+)
+from yew.kinds import ImportKind
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="yew", description="Understand dependencies in your Python codebase")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET_PATH, help="daemon socket path")
+    parser.add_argument("-v", "--verbose", action="store_true", help="enable debug logging")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    daemon_parser = commands.add_parser("daemon", help="keep the graph warm and answer queries over the socket")
+    daemon_parser.add_argument("packages", nargs="+", type=Path)
+    daemon_parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="file polling interval")
+    daemon_parser.add_argument("--include-third-party", action="store_true")
+    daemon_parser.add_argument("--workers", type=int, default=5)
+
+    for command in ("dependents", "dependencies"):
+        query_parser = commands.add_parser(command, help=f"list transitive {command} of modules or files")
+        query_parser.add_argument("targets", nargs="+", help="module names or file paths")
+        query_parser.add_argument("--depth", type=int, default=None)
+        query_parser.add_argument("--first-party-only", action="store_true")
+        add_query_arguments(query_parser)
+
+    why_parser = commands.add_parser("why", help="show the shortest import chains from one module to another")
+    why_parser.add_argument("source", help="importing module name or file path")
+    why_parser.add_argument("target", help="imported module name or file path")
+    why_parser.add_argument("-k", type=int, default=1, help="number of chains to show, shortest first")
+    add_query_arguments(why_parser)
+
+    check_parser = commands.add_parser("check", help="check architecture contracts declared in pyproject.toml")
+    check_parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG_PATH, help="config with the contracts")
+    add_package_argument(check_parser)
+
+    commands.add_parser("stop", help="stop the daemon")
+
+    return parser
+
+
+def add_query_arguments(query_parser: argparse.ArgumentParser) -> None:
+    add_package_argument(query_parser)
+    query_parser.add_argument(
+        "--kind",
+        dest="kinds",
+        action="append",
+        choices=[kind.name.lower() for kind in ImportKind],
+        default=None,
+        help="follow only imports of the kind (repeatable), e.g. `--kind eager --kind optional`",
+    )
+
+
+def add_package_argument(query_parser: argparse.ArgumentParser) -> None:
+    query_parser.add_argument(
+        "-p",
+        "--package",
+        dest="packages",
+        action="append",
+        type=Path,
+        default=[],
+        help="package to build the graph from when the daemon is not running",
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.command == "daemon":
+        GraphDaemon(
+            args.packages,
+            socket_path=args.socket,
+            poll_interval=args.interval,
+            include_third_party=args.include_third_party,
+            workers=args.workers,
+        ).serve_forever()
+
+        return 0
+
+    if args.command == "stop":
+        try:
+            query_daemon(args.socket, {"command": "shutdown"})
+        except DaemonNotRunning as e:
+            print(e, file=sys.stderr)
+            return 1
+
+        return 0
+
+    try:
+        response = query(args.packages, build_request(args), socket_path=args.socket)
+    except DaemonNotRunning as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    if not response["ok"]:
+        print(response["error"], file=sys.stderr)
+        return 1
+
+    if args.command == "check":
+        return print_contracts(response["contracts"])
+
+    if args.command == "why":
+        return print_chains(response["chains"])
+
+    for mod_name in response["modules"]:
+        print(mod_name)
+
+    return 0
+
+
+def build_request(args: argparse.Namespace) -> Request:
+    """
+    Turn the query command arguments into the daemon request
+    """
+    if args.command == "check":
+        return {"command": "check", "config": str(args.config.absolute())}
+
+    if args.command == "why":
+        return {
+            "command": "chains",
+            "source": absolute_targets([args.source])[0],
+            "target": absolute_targets([args.target])[0],
+            "k": args.k,
+            "kinds": args.kinds,
+        }
+
+    return {
+        "command": args.command,
+        "targets": absolute_targets(args.targets),
+        "depth": args.depth,
+        "first_party_only": args.first_party_only,
+        "kinds": args.kinds,
+    }
+
+
+def print_chains(chains: List[List[Dict[str, Any]]]) -> int:
+    if not chains:
+        print("No import chain found", file=sys.stderr)
+        return 1
+
+    for index, chain in enumerate(chains):
+        if index:
+            print()
+
+        if not chain:
+            print("The source and the target are the same module")
+            continue
+
+        print(" -> ".join([chain[0]["importer"], *(hop["module"] for hop in chain)]))
+
+        for hop in chain:
+            print(f"  {hop['path']}:{hop['lineno']}: {hop['importer']} imports {hop['module']} ({hop['kind']})")
+
+    return 0
+
+
+def print_contracts(contracts: List[Dict[str, Any]]) -> int:
+    broken = [contract for contract in contracts if not contract["kept"]]
+
+    for contract in contracts:
+        print(f"{contract['name']}: {'KEPT' if contract['kept'] else 'BROKEN'}")
+
+    for contract in broken:
+        print()
+        print(f"{contract['name']}:")
+
+        for violation in contract["violations"]:
+            chain = violation["chain"]
+
+            print(f"  {violation['importer']} must not import {violation['imported']}:")
+            print(f"    {' -> '.join([chain[0]['importer'], *(hop['module'] for hop in chain)])}")
+
+            for hop in chain:
+                print(f"      {hop['path']}:{hop['lineno']}: {hop['importer']} imports {hop['module']} ({hop['kind']})")
+
+    print()
+    print(f"{len(contracts) - len(broken)} kept, {len(broken)} broken")
+
+    return 1 if broken else 0
@@ -1,12 +1,44 @@
 import dataclasses
+import enum
 import logging
+import sys
+from array import array
 from collections import deque
 from importlib import util as importlib_util
 from pathlib import Path
-from typing import Any, Deque, Dict, Final, List, Set, Tuple
+from typing import (
+    Any,
+    ClassVar,
+    Collection,
+    Deque,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from yew.adjacency import Adjacency
+from yew.chains import shortest_chains
+from yew.components import Condensation, condense
+from yew.diff import GraphDiff
+from yew.importtime import ImportTime
+from yew.kinds import ALL_KINDS_MASK, ImportKind, kinds_mask
+from yew.queries import ClosureIndex, Direction
+from yew.snapshot import load_snapshot, save_snapshot
+from yew.symbols import SymbolIndex
 
 logger = logging.getLogger(__name__)
 
+# do not rebuild adjacency indexes of the graph for less pending changes than this
+MIN_REINDEX_EDGES: Final[int] = 1024
+
 
 class ModuleNotFound(Exception):
     """
@@ -14,22 +46,58 @@ class ModuleNotFound(Exception):
     """
 
 
-@dataclasses.dataclass(frozen=True)
+class ModCategory(enum.IntEnum):
+    """
+    Where the module comes from
+    """
+
+    UNRESOLVED = 0
+    FIRST_PARTY = 1
+    BUILTIN = 2
+    STDLIB = 3
+    THIRD_PARTY = 4
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Classification:
+    category: ModCategory
+    distribution: Optional[str] = None  # the distribution that installs the third-party module
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
 class DirectImport:
     mod_name: "ModName"
     path: Path
     lineno: int
     col_offset: int
+    kind: ImportKind = ImportKind.EAGER
+    symbols: FrozenSet[str] = frozenset()  # names imported from the module (empty if the module itself is imported)
+    classification: Optional[Classification] = dataclasses.field(default=None, compare=False)
 
 
 class ModName:
+    """
+    Dotted module name.
+
+    Names are immutable interned flyweights: the same name is always the same object,
+    so its string form and hash are computed once and equality is an identity check
+    """
+
     SEP: Final[str] = "."
 
-    def __init__(self, mod_parts: List[str]) -> None:
-        self._mod_parts = mod_parts
+    __slots__ = ("_mod_parts", "_name", "_hash")
+
+    _interned: ClassVar[Dict[str, "ModName"]] = {}
+
+    _mod_parts: Tuple[str, ...]
+    _name: str
+    _hash: int
+
+    def __new__(cls, mod_parts: Iterable[str]) -> "ModName":
+        return cls.from_str(cls.join(list(mod_parts)))
 
     @property
-    def parts(self) -> List[str]:
+    def parts(self) -> Tuple[str, ...]:
         return self._mod_parts
 
     @property
@@ -61,6 +129,10 @@ class ModName:
         if not level_up:
             return self
 
+        if level_up >= len(self._mod_parts):
+            # the same as Python's "attempted relative import beyond top-level package"
+            raise ValueError(f"{self} has no package {level_up} level(s) up")
+
         return ModName(self._mod_parts[:-level_up])
 
     def __truediv__(self, part) -> "ModName":
@@ -74,7 +146,21 @@ class ModName:
 
     @classmethod
     def from_str(cls, mod_path: str) -> "ModName":
-        return cls(mod_path.split(cls.SEP))
+        try:
+            return cls._interned[mod_path]
+        except KeyError:
+            pass
+
+        mod_name = object.__new__(cls)
+        name = sys.intern(mod_path)
+
+        # the empty name has no parts rather than an empty one
+        object.__setattr__(mod_name, "_mod_parts", tuple(name.split(cls.SEP)) if name else ())
+        object.__setattr__(mod_name, "_name", name)
+        object.__setattr__(mod_name, "_hash", hash(name))
+
+        # another thread may have interned the name in the meantime
+        return cls._interned.setdefault(name, mod_name)
 
     @classmethod
     def from_path(cls, file_path: Path) -> "ModName":
@@ -103,7 +189,7 @@ class ModName:
         if file_name != "__init__":
             module_name_parts.append(file_name)
 
-        return cls(list(module_name_parts))
+        return cls(module_name_parts)
 
     @classmethod
     def from_object_path(cls, object_path: List[str]) -> Tuple["ModName", str | None]:
@@ -132,7 +218,7 @@ class ModName:
             raise ModuleNotFound(f"Could not import the module: {original_obj_path}") from e
 
     @classmethod
-    def join(cls, parts: List[str]) -> str:
+    def join(cls, parts: Sequence[str]) -> str:
         try:
             return cls.SEP.join(parts)
         except TypeError:
@@ -144,22 +230,29 @@ class ModName:
         return mod_name.split(cls.SEP)
 
     def __hash__(self) -> int:
-        return hash(tuple(self._mod_parts))
+        return self._hash
 
     def __eq__(self, mod_name: Any) -> bool:
         if isinstance(mod_name, ModName):
-            return self._mod_parts == mod_name.parts
+            return self is mod_name
 
         raise NotImplementedError
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # unpickled names are interned too
+        return ModName.from_str, (self._name,)
+
     def __str__(self) -> str:
-        return self.join(self._mod_parts)
+        return self._name
 
     def __repr__(self) -> str:
-        return f'"{str(self)}"'
+        return f'"{self._name}"'
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class ImportContext:
     """
     A module import with code reference
@@ -168,129 +261,812 @@ class ImportContext:
     lineno: int
     col_offset: int
     module: "Module"
+    kind: ImportKind = ImportKind.EAGER
+    symbols: Tuple[str, ...] = ()  # names imported from the module (empty if the module itself is imported)
 
     def __repr__(self) -> str:
-        return f"ImportContext('{self.module.mod_name}' at {self.lineno}:{self.col_offset})"
+        symbols = f", symbols={list(self.symbols)}" if self.symbols else ""
+
+        return (
+            f"ImportContext('{self.module.mod_name}' at {self.lineno}:{self.col_offset}, "
+            f"{self.kind.name.lower()}{symbols})"
+        )
+
+
+def _source_order(direct_import: DirectImport) -> Tuple[int, int, str]:
+    return direct_import.lineno, direct_import.col_offset, str(direct_import.mod_name)
+
+
+# (importing module, imported module with code reference) hops from the first importer to the imported module
+ImportChain = List[Tuple["Module", ImportContext]]
 
 
 class Module:
     """
-    Represents a single Python module file
+    Represents a single Python module file.
+
+    Modules are lightweight views over the graph storage, so imports are materialized only when requested
     """
 
-    def __init__(self, mod_name: ModName, file_path: Path) -> None:
-        self._mod_name = mod_name
-        self._file_path = file_path
+    __slots__ = ("_graph", "_node_id")
 
-        self._imports: Set["ImportContext"] | None = None
-        self._imported_by: Set["ImportContext"] = set()
+    def __init__(self, graph: "ModGraph", node_id: int) -> None:
+        self._graph = graph
+        self._node_id = node_id
 
     @property
     def mod_name(self) -> ModName:
-        return self._mod_name
+        return ModName.from_str(self._graph._names[self._node_id])
 
     @property
     def file_path(self) -> Path:
-        return self._file_path
+        return Path(self._graph._paths[self._node_id])
+
+    @property
+    def category(self) -> ModCategory:
+        return ModCategory(self._graph._categories[self._node_id])
+
+    @property
+    def import_time(self) -> Optional[ImportTime]:
+        """
+        Get the time it took to import the module (None if import times have not been attached to the graph)
+        """
+        return self._graph._import_times.get(self._node_id)
+
+    @property
+    def distribution(self) -> Optional[str]:
+        """
+        Get the distribution that installs the module (None if the module is not third-party)
+        """
+        return self._graph._distributions.get(self._node_id)
 
     @property
     def imports(self) -> Set["ImportContext"] | None:
         """
-        Get modules that are directly imported by the current one
+        Get modules that are directly imported by the current one (None if the module file has not been added yet)
         """
-        return self._imports
+        graph = self._graph
+
+        if not graph._added[self._node_id]:
+            return None
+
+        return {
+            graph._import_context(edge_id, graph._edge_dst[edge_id]) for edge_id in graph._out_edge_ids(self._node_id)
+        }
 
     @property
     def imported_by(self) -> Set["ImportContext"]:
         """
         Get modules that imports the current one
         """
-        return self._imported_by
+        graph = self._graph
 
-    def add_imports(self, imports: Set[ImportContext]) -> None:
-        if self._imports is None:
-            self._imports = set()
-
-        self._imports.update(imports)
+        return {
+            graph._import_context(edge_id, graph._edge_src[edge_id]) for edge_id in graph._in_edge_ids(self._node_id)
+        }
 
     def __hash__(self) -> int:
-        return hash(self.mod_name)
+        # the same as the hash of the module name, without looking the name up
+        return hash(self._graph._names[self._node_id])
 
     def __eq__(self, module: Any) -> bool:
         if isinstance(module, Module):
-            return self.mod_name == module.mod_name
+            return self._graph._names[self._node_id] == module._graph._names[module._node_id]
 
         raise NotImplementedError
 
     def __repr__(self) -> str:
-        repr: str = f"Module({self._mod_name}"
+        graph = self._graph
+        repr: str = f"Module({self.mod_name}"
 
-        if self._imports:
-            repr += f", import={len(self._imports)}"
+        if graph._added[self._node_id] and (imports := len(graph._out_edge_ids(self._node_id))):
+            repr += f", import={imports}"
 
-        repr += f", imported_by={len(self._imported_by)})"
+        repr += f", imported_by={len(graph._in_edge_ids(self._node_id))})"
 
         return repr
 
 
 class ModGraph:
     """
-    Module import graph
+    Module import graph.
+
+    Nodes are integer IDs with interned module names. Edges are stored in parallel arrays
+    (source, destination, line number and column offset) and indexed as CSR adjacency on demand.
+    Module and ImportContext objects are only built when the graph is queried.
+
+    Removed edges are tombstoned and edges added after indexing are kept in small pending lists,
+    so incremental updates don't rebuild the indexes until enough changes accumulate
     """
 
     def __init__(self) -> None:
-        self._mods_by_file_path: Dict[Path, Module] = {}
-        self._mods_by_mod_name: Dict[ModName, Module] = {}
+        self._names: List[str] = []
+        self._paths: List[str] = []
+        self._added = bytearray()  # 0 for placeholder nodes of modules that are imported, but not added yet
+        self._categories = bytearray()  # ModCategory of every node
+        self._distributions: Dict[int, str] = {}  # owning distributions of third-party nodes
+        self._import_times: Dict[int, ImportTime] = {}  # measured with `python -X importtime`
+        # names of modules that imports of added nodes look for, but that have not been found
+        self._unresolved: Dict[int, FrozenSet[str]] = {}
+
+        self._node_ids: Dict[str, int] = {}
+        self._node_ids_by_path: Dict[str, int] = {}
+
+        self._edge_src = array("i")
+        self._edge_dst = array("i")
+        self._edge_lineno = array("i")
+        self._edge_col = array("i")
+        self._edge_kind = bytearray()  # ImportKind of every edge
+        self._edge_symbols: Dict[int, Tuple[str, ...]] = {}  # imported names of edges that import objects
+        self._edge_alive = bytearray()
+        self._dead_edges = 0
+
+        self._imports_index: Adjacency | None = None
+        self._imported_by_index: Adjacency | None = None
+
+        self._pending_imports: Dict[int, List[int]] = {}
+        self._pending_imported_by: Dict[int, List[int]] = {}
+        self._pending_edges = 0
+
+        self._version = 0  # bumped on every change to invalidate memoized queries
+        self._closure_index: ClosureIndex | None = None
+        self._symbol_index: SymbolIndex | None = None
+
+    def add(
+        self,
+        mod_name: ModName,
+        file_path: Path,
+        direct_imports: Set[DirectImport],
+        unresolved: Collection[str] = (),
+    ) -> None:
+        """
+        Add a new module to the graph along with the names of modules its imports could not find, if any
+        (see stale_importers())
+        """
+        node_id = self._node_id(str(mod_name), file_path)
+
+        if self._added[node_id]:
+            # the module is added again, so its imports are merged with the existing ones
+            added_edges = {
+                (self._edge_dst[edge_id], self._edge_lineno[edge_id], self._edge_col[edge_id])
+                for edge_id in self._out_edge_ids(node_id)
+            }
+        else:
+            added_edges = set()
+
+        self._set_added(node_id, file_path)
+        self._set_unresolved(node_id, self._unresolved.get(node_id, frozenset()).union(unresolved))
+        self._add_edges(node_id, direct_imports, added_edges)
+
+        self._changed()
+
+    def update(
+        self,
+        mod_name: ModName,
+        file_path: Path,
+        direct_imports: Set[DirectImport],
+        unresolved: Collection[str] = (),
+    ) -> None:
+        """
+        Add the module or replace all its imports if it's in the graph already
+        """
+        node_id = self._node_id(str(mod_name), file_path)
+
+        prev_imported_ids = self._drop_imports(node_id)
+
+        self._set_added(node_id, file_path)
+        self._set_unresolved(node_id, frozenset(unresolved))
+        self._add_edges(node_id, direct_imports, set())
+        self._drop_orphans(prev_imported_ids)
 
-        self._unmet_nodes: Dict[ModName, Module] = {}
+        self._changed()
 
-    def add(self, mod_name: ModName, file_path: Path, direct_imports: Set[DirectImport]) -> None:
+    def remove(self, name: str | Path | ModName) -> None:
         """
-        Add a new module to the graph
+        Remove the module from the graph.
+
+        The module stays in the graph as a placeholder if other modules still import it
         """
-        module = Module(mod_name, file_path)
+        if (node_id := self._added_node_id(name)) is None:
+            raise KeyError(f"Module {name} is not in the graph")
 
-        if self._unmet_nodes.get(mod_name):
-            module = self._unmet_nodes.pop(mod_name)
+        prev_imported_ids = self._drop_imports(node_id)
 
-        mod_imports: Set[ImportContext] = set()
+        self._added[node_id] = 0
+        self._node_ids_by_path.pop(self._paths[node_id], None)
+        self._unresolved.pop(node_id, None)
 
-        for direct_import in direct_imports:
-            imported_module = self._mods_by_mod_name.get(direct_import.mod_name) or self._unmet_nodes.get(
-                direct_import.mod_name
-            )
+        self._drop_orphans({node_id, *prev_imported_ids})
 
-            if not imported_module:
-                imported_module = Module(direct_import.mod_name, direct_import.path)
-                self._unmet_nodes[direct_import.mod_name] = imported_module
+        self._changed()
 
-            imported_module.imported_by.add(
-                ImportContext(module=module, lineno=direct_import.lineno, col_offset=direct_import.col_offset)
-            )
+    def stale_importers(self, mod_names: Collection[str]) -> Set[Module]:
+        """
+        Find modules whose imports may resolve differently once modules of the given names have been added
+        or removed: their importers, importers of their parent packages that import them as objects
+        (e.g. `from pkg import mod` before pkg/mod.py exists) and modules whose imports have not found them
+        """
+        names = set(mod_names)
+        stale_ids: Set[int] = set()
+
+        for mod_name in names:
+            if (node_id := self._node_ids.get(mod_name)) is not None:
+                stale_ids.update(self._edge_src[edge_id] for edge_id in self._in_edge_ids(node_id))
+
+            parent_name, _, name = mod_name.rpartition(ModName.SEP)
+
+            if parent_name and (parent_id := self._node_ids.get(parent_name)) is not None:
+                stale_ids.update(
+                    self._edge_src[edge_id]
+                    for edge_id in self._in_edge_ids(parent_id)
+                    if name in self._edge_symbols.get(edge_id, ())
+                )
+
+        stale_ids.update(
+            node_id for node_id, unresolved in self._unresolved.items() if not names.isdisjoint(unresolved)
+        )
+
+        return {self._view(node_id) for node_id in stale_ids if self._added[node_id]}
+
+    def dependents(
+        self,
+        targets: Iterable[str | Path | ModName],
+        *,
+        depth: Optional[int] = None,
+        first_party_only: bool = False,
+        kinds: Optional[Collection[ImportKind]] = None,
+    ) -> Set[Module]:
+        """
+        Find modules that transitively import any of the targets (up to the given import depth),
+        following only imports of the given kinds (all kinds by default)
+        """
+        return self._closure("dependents", targets, depth=depth, first_party_only=first_party_only, kinds=kinds)
+
+    def dependencies(
+        self,
+        targets: Iterable[str | Path | ModName],
+        *,
+        depth: Optional[int] = None,
+        first_party_only: bool = False,
+        kinds: Optional[Collection[ImportKind]] = None,
+    ) -> Set[Module]:
+        """
+        Find modules that are transitively imported by any of the targets (up to the given import depth),
+        following only imports of the given kinds (all kinds by default)
+        """
+        return self._closure("dependencies", targets, depth=depth, first_party_only=first_party_only, kinds=kinds)
+
+    def symbol_dependents(
+        self,
+        changes: Mapping[str | Path | ModName, Optional[Collection[str]]],
+        *,
+        kinds: Optional[Collection[ImportKind]] = None,
+    ) -> Set[Module]:
+        """
+        Find modules affected by changes of the given top-level names of modules (None if a module has changed
+        as a whole), see changed_symbols() to find them out from two versions of the module source.
 
-            mod_imports.add(
-                ImportContext(module=imported_module, lineno=direct_import.lineno, col_offset=direct_import.col_offset)
-            )
+        Unlike dependents(), an importer is affected only if it imports a changed name or the module itself
+        and then only its definitions that refer to the import are followed further
+        """
+        node_changes: Dict[int, Optional[Set[str]]] = {}
 
-        module.add_imports(mod_imports)
+        for target, symbols in changes.items():
+            if (node_id := self._lookup_node_id(target)) is None:
+                logger.debug(f"{target} is not in the graph, skipping it")
+                continue
 
-        self._mods_by_file_path[module.file_path] = module
-        self._mods_by_mod_name[module.mod_name] = module
+            node_changes[node_id] = set(symbols) if symbols is not None else None
 
-    def __getitem__(self, name: str | Path | ModName) -> Module | None:
+        if self._symbol_index is None:
+            self._symbol_index = SymbolIndex(self)
+
+        return {self._view(node_id) for node_id in self._symbol_index.dependents(node_changes, kinds_mask(kinds))}
+
+    def import_chain(
+        self,
+        source: str | Path | ModName,
+        target: str | Path | ModName,
+        *,
+        kinds: Optional[Collection[ImportKind]] = None,
+    ) -> Optional[ImportChain]:
+        """
+        Find the shortest chain of imports that makes the source module import the target one (None if it doesn't).
+        Every hop is the importing module and the import with its line in the module's file
+        """
+        chains = self.import_chains(source, target, k=1, kinds=kinds)
+
+        return chains[0] if chains else None
+
+    def import_chains(
+        self,
+        source: str | Path | ModName,
+        target: str | Path | ModName,
+        k: int = 1,
+        *,
+        kinds: Optional[Collection[ImportKind]] = None,
+    ) -> List[ImportChain]:
+        """
+        Find up to k shortest import chains from the source to the target module, shortest first.
+        Chains differ in the modules they go through, the first import of a module by its importer is reported
+        """
+        if (source_id := self._lookup_node_id(source)) is None:
+            raise KeyError(f"Module {source} is not in the graph")
+
+        if (target_id := self._lookup_node_id(target)) is None:
+            raise KeyError(f"Module {target} is not in the graph")
+
+        edge_src, edge_dst = self._edge_src, self._edge_dst
+
+        return [
+            [(self._view(edge_src[edge_id]), self._import_context(edge_id, edge_dst[edge_id])) for edge_id in chain]
+            for chain in shortest_chains(self, source_id, target_id, k, kinds_mask(kinds))
+        ]
+
+    def set_import_times(self, import_times: Mapping[str, ImportTime]) -> int:
+        """
+        Attach measured import times to modules of the graph and return the number of matched modules
+        """
+        self._import_times = {
+            node_id: import_time
+            for mod_name, import_time in import_times.items()
+            if (node_id := self._node_ids.get(mod_name)) is not None
+        }
+
+        return len(self._import_times)
+
+    def diff(self, other: "ModGraph") -> GraphDiff:
+        """
+        Find modules and imports that have been added or removed in the other graph compared to this one.
+        Takes linear time in the total number of nodes and edges (see GraphDiff.summary for just the numbers)
+        """
+        return GraphDiff(self, other)
+
+    def condense(
+        self,
+        *,
+        first_party_only: bool = False,
+        kinds: Optional[Collection[ImportKind]] = None,
+    ) -> Condensation:
+        """
+        Group modules into import cycles and order them in topological layers (dependencies first).
+        Pass kinds to ignore some imports, e.g. TYPE_CHECKING ones that don't form cycles at runtime
+        """
+        return condense(self, first_party_only=first_party_only, kinds=kinds_mask(kinds))
+
+    def _closure(
+        self,
+        direction: Direction,
+        targets: Iterable[str | Path | ModName],
+        *,
+        depth: Optional[int],
+        first_party_only: bool,
+        kinds: Optional[Collection[ImportKind]],
+    ) -> Set[Module]:
+        node_ids: Set[int] = set()
+
+        for target in targets:
+            if (node_id := self._lookup_node_id(target)) is None:
+                logger.debug(f"{target} is not in the graph, skipping it")
+                continue
+
+            node_ids.add(node_id)
+
+        return {
+            self._view(node_id)
+            for node_id in self._closure_ids(direction, node_ids, depth, kinds_mask(kinds))
+            if not first_party_only or self._added[node_id]
+        }
+
+    def _closure_ids(
+        self,
+        direction: Direction,
+        node_ids: Iterable[int],
+        depth: Optional[int] = None,
+        kinds: int = ALL_KINDS_MASK,
+    ) -> Set[int]:
+        if self._closure_index is None:
+            self._closure_index = ClosureIndex(self)
+
+        return self._closure_index.closure(direction, node_ids, depth, kinds)
+
+    def _changed(self) -> None:
+        self._version += 1
+
+        if self._imports_index is None:
+            return
+
+        total_edges = len(self._edge_src)
+
+        if self._pending_edges > max(MIN_REINDEX_EDGES, total_edges // 4) or self._dead_edges > max(
+            MIN_REINDEX_EDGES, total_edges // 2
+        ):
+            # enough has changed to justify rebuilding the indexes on the next query
+            self._imports_index = None
+            self._imported_by_index = None
+
+    def _node_id(self, mod_name: str, file_path: Path) -> int:
+        """
+        Get the node ID of the module, creating a placeholder node if the module is not in the graph yet
+        """
+        if (node_id := self._node_ids.get(mod_name)) is not None:
+            return node_id
+
+        node_id = len(self._names)
+
+        self._names.append(sys.intern(mod_name))
+        self._paths.append(str(file_path))
+        self._added.append(0)
+        self._categories.append(ModCategory.UNRESOLVED)
+        self._node_ids[self._names[node_id]] = node_id
+
+        return node_id
+
+    def _set_added(self, node_id: int, file_path: Path) -> None:
+        if self._added[node_id]:
+            self._node_ids_by_path.pop(self._paths[node_id], None)
+
+        self._added[node_id] = 1
+        self._categories[node_id] = ModCategory.FIRST_PARTY
+        self._distributions.pop(node_id, None)
+        self._paths[node_id] = str(file_path)
+        self._node_ids_by_path[self._paths[node_id]] = node_id
+
+    def _set_unresolved(self, node_id: int, unresolved: FrozenSet[str]) -> None:
+        if unresolved:
+            self._unresolved[node_id] = unresolved
+        else:
+            self._unresolved.pop(node_id, None)
+
+    def _set_classification(self, node_id: int, classification: Classification) -> None:
+        self._categories[node_id] = classification.category
+
+        if classification.distribution:
+            self._distributions[node_id] = sys.intern(classification.distribution)
+        else:
+            self._distributions.pop(node_id, None)
+
+    def _add_edges(
+        self,
+        node_id: int,
+        direct_imports: Set[DirectImport],
+        added_edges: Set[Tuple[int, int, int]],
+    ) -> None:
+        # edges of a module are kept in source order, so queries that pick one of them are deterministic
+        for direct_import in sorted(direct_imports, key=_source_order):
+            imported_node_id = self._node_id(str(direct_import.mod_name), direct_import.path)
+
+            if (classification := direct_import.classification) and not self._added[imported_node_id]:
+                self._set_classification(imported_node_id, classification)
+
+            edge = (imported_node_id, direct_import.lineno, direct_import.col_offset)
+
+            if edge in added_edges:
+                continue
+
+            added_edges.add(edge)
+
+            edge_id = len(self._edge_src)
+
+            self._edge_src.append(node_id)
+            self._edge_dst.append(imported_node_id)
+            self._edge_lineno.append(direct_import.lineno)
+            self._edge_col.append(direct_import.col_offset)
+            self._edge_kind.append(direct_import.kind)
+
+            if direct_import.symbols:
+                self._edge_symbols[edge_id] = tuple(sorted(sys.intern(symbol) for symbol in direct_import.symbols))
+
+            self._edge_alive.append(1)
+
+            if self._imports_index is not None:
+                self._pending_imports.setdefault(node_id, []).append(edge_id)
+                self._pending_imported_by.setdefault(imported_node_id, []).append(edge_id)
+                self._pending_edges += 1
+
+    def _drop_imports(self, node_id: int) -> Set[int]:
+        """
+        Tombstone all imports of the module and return IDs of the previously imported modules
+        """
+        imported_ids: Set[int] = set()
+
+        for edge_id in self._out_edge_ids(node_id):
+            self._edge_alive[edge_id] = 0
+            self._dead_edges += 1
+
+            imported_ids.add(self._edge_dst[edge_id])
+
+        return imported_ids
+
+    def _drop_orphans(self, node_ids: Set[int]) -> None:
+        """
+        Delete placeholder nodes that are not imported by any module anymore
+        """
+        for node_id in node_ids:
+            if self._added[node_id] or self._node_ids.get(self._names[node_id]) != node_id:
+                continue
+
+            if not self._in_edge_ids(node_id):
+                del self._node_ids[self._names[node_id]]
+
+    def _index(self) -> Tuple[Adjacency, Adjacency]:
+        if self._imports_index is None or self._imported_by_index is None:
+            if self._dead_edges:
+                self._compact_edges()
+                self._imports_index = None
+
+            total_nodes = len(self._names)
+
+            if self._imports_index is None:
+                self._imports_index = Adjacency.build(self._edge_src, total_nodes)
+
+            self._imported_by_index = Adjacency.build(self._edge_dst, total_nodes)
+
+            self._pending_imports.clear()
+            self._pending_imported_by.clear()
+            self._pending_edges = 0
+
+        return self._imports_index, self._imported_by_index
+
+    def _set_indexes(self, *, imports_index: Adjacency, imported_by_index: Adjacency) -> None:
+        self._imports_index = imports_index
+        self._imported_by_index = imported_by_index
+
+        self._pending_imports.clear()
+        self._pending_imported_by.clear()
+        self._pending_edges = 0
+
+    def _compact_edges(self) -> None:
+        edge_alive = self._edge_alive
+        alive_edge_ids = [edge_id for edge_id in range(len(edge_alive)) if edge_alive[edge_id]]
+
+        for column in ("_edge_src", "_edge_dst", "_edge_lineno", "_edge_col"):
+            values = getattr(self, column)
+            setattr(self, column, array("i", [values[edge_id] for edge_id in alive_edge_ids]))
+
+        self._edge_kind = bytearray(self._edge_kind[edge_id] for edge_id in alive_edge_ids)
+
+        edge_symbols = self._edge_symbols
+        self._edge_symbols = {
+            new_edge_id: edge_symbols[edge_id]
+            for new_edge_id, edge_id in enumerate(alive_edge_ids)
+            if edge_id in edge_symbols
+        }
+        self._edge_alive = bytearray(b"\x01") * len(alive_edge_ids)
+        self._dead_edges = 0
+
+    def _out_edge_ids(self, node_id: int) -> Sequence[int]:
+        imports_index, _ = self._index()
+
+        return self._live_edge_ids(imports_index[node_id], self._pending_imports.get(node_id))
+
+    def _in_edge_ids(self, node_id: int) -> Sequence[int]:
+        _, imported_by_index = self._index()
+
+        return self._live_edge_ids(imported_by_index[node_id], self._pending_imported_by.get(node_id))
+
+    def _live_edge_ids(self, edge_ids: Sequence[int], pending_edge_ids: List[int] | None) -> Sequence[int]:
+        if pending_edge_ids:
+            edge_ids = [*edge_ids, *pending_edge_ids]
+
+        if not self._dead_edges:
+            return edge_ids
+
+        edge_alive = self._edge_alive
+
+        return [edge_id for edge_id in edge_ids if edge_alive[edge_id]]
+
+    def _dependencies(self, node_id: int, kinds: int = ALL_KINDS_MASK) -> Iterator[int]:
+        edge_dst = self._edge_dst
+
+        return (edge_dst[edge_id] for edge_id in self._filter_kinds(self._out_edge_ids(node_id), kinds))
+
+    def _dependents(self, node_id: int, kinds: int = ALL_KINDS_MASK) -> Iterator[int]:
+        edge_src = self._edge_src
+
+        return (edge_src[edge_id] for edge_id in self._filter_kinds(self._in_edge_ids(node_id), kinds))
+
+    def _filter_kinds(self, edge_ids: Sequence[int], kinds: int) -> Sequence[int]:
+        if kinds == ALL_KINDS_MASK:
+            return edge_ids
+
+        edge_kind = self._edge_kind
+
+        return [edge_id for edge_id in edge_ids if (1 << edge_kind[edge_id]) & kinds]
+
+    def _view(self, node_id: int) -> Module:
+        return Module(self, node_id)
+
+    def _import_context(self, edge_id: int, node_id: int) -> ImportContext:
+        """
+        Describe the edge from the point of view of the other end (the node ID is either its source or destination)
+        """
+        return ImportContext(
+            module=self._view(node_id),
+            lineno=self._edge_lineno[edge_id],
+            col_offset=self._edge_col[edge_id],
+            kind=ImportKind(self._edge_kind[edge_id]),
+            symbols=self._edge_symbols.get(edge_id, ()),
+        )
+
+    def _lookup_node_id(self, name: str | Path | ModName) -> int | None:
+        """
+        Find the node ID of the module including placeholders of modules that are imported, but not added
+        """
         if isinstance(name, Path):
-            return self._mods_by_file_path.get(name)
+            return self._node_ids_by_path.get(str(name))
 
         if isinstance(name, ModName):
-            return self._mods_by_mod_name.get(name)
+            return self._node_ids.get(str(name))
 
-        if module := self._mods_by_mod_name.get(ModName.from_str(name)):
-            return module
+        if (node_id := self._node_ids.get(name)) is not None:
+            return node_id
+
+        return self._node_ids_by_path.get(name)
+
+    def _added_node_id(self, name: str | Path | ModName) -> int | None:
+        node_id = self._lookup_node_id(name)
+
+        if node_id is None or not self._added[node_id]:
+            return None
+
+        return node_id
+
+    def __getitem__(self, name: str | Path | ModName) -> Module | None:
+        if (node_id := self._added_node_id(name)) is None:
+            return None
 
-        return self._mods_by_file_path.get(Path(name))
+        return self._view(node_id)
+
+    def save(self, path: Path) -> None:
+        """
+        Save the graph as a binary snapshot
+        """
+        save_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path: Path, *, verify: bool = True) -> "ModGraph":
+        """
+        Load the graph from a binary snapshot (verifying its checksum unless disabled)
+        """
+        graph = cls()
+        load_snapshot(graph, path, verify=verify)
+
+        return graph
+
+    @classmethod
+    def merge(cls, *graphs: "ModGraph") -> "ModGraph":
+        """
+        Combine partial graphs (e.g. built per package root on separate machines) into one.
+
+        Placeholders of modules imported from other partials are filled in by the partials that add them,
+        so merging the partials of all package roots gives the same graph as building them all at once.
+        Takes linear time in the total number of nodes and edges
+        """
+        merged = cls()
+
+        # modules added by several partials get their imports merged the same way as ModGraph.add() does
+        times_added: Dict[int, int] = {}
+        node_id_maps = [merged._merge_nodes(graph, times_added) for graph in graphs]
+
+        added_edges: Dict[int, Set[Tuple[int, int, int]]] = {}
+
+        for graph, node_id_map in zip(graphs, node_id_maps):
+            merged._merge_edges(graph, node_id_map, times_added, added_edges)
+
+        merged._changed()
+
+        return merged
+
+    def _merge_nodes(self, graph: "ModGraph", times_added: Dict[int, int]) -> List[int]:
+        """
+        Add nodes of the partial graph and map their IDs to the node IDs of this graph (-1 for dropped nodes)
+        """
+        node_id_map = [-1] * len(graph._names)
+
+        for node_id in sorted(graph._node_ids.values()):
+            name, path = graph._names[node_id], graph._paths[node_id]
+
+            if (new_node_id := self._node_ids.get(name)) is None:
+                new_node_id = len(self._names)
+
+                self._names.append(name)
+                self._paths.append(path)
+                self._added.append(0)
+                self._categories.append(ModCategory.UNRESOLVED)
+                self._node_ids[name] = new_node_id
+
+            node_id_map[node_id] = new_node_id
+
+            if graph._added[node_id]:
+                if self._added[new_node_id]:
+                    self._node_ids_by_path.pop(self._paths[new_node_id], None)
+
+                self._added[new_node_id] = 1
+                self._categories[new_node_id] = ModCategory.FIRST_PARTY
+                self._distributions.pop(new_node_id, None)
+                self._paths[new_node_id] = path
+                self._node_ids_by_path[path] = new_node_id
+
+                if unresolved := graph._unresolved.get(node_id):
+                    self._unresolved[new_node_id] = self._unresolved.get(new_node_id, frozenset()) | unresolved
+
+                times_added[new_node_id] = times_added.get(new_node_id, 0) + 1
+            elif not self._added[new_node_id] and graph._categories[node_id] != ModCategory.UNRESOLVED:
+                self._categories[new_node_id] = graph._categories[node_id]
+
+                if (distribution := graph._distributions.get(node_id)) is not None:
+                    self._distributions[new_node_id] = distribution
+
+        return node_id_map
+
+    def _merge_edges(
+        self,
+        graph: "ModGraph",
+        node_id_map: List[int],
+        times_added: Dict[int, int],
+        added_edges: Dict[int, Set[Tuple[int, int, int]]],
+    ) -> None:
+        """
+        Copy live edges of the partial graph, skipping imports that have been merged from other partials already
+        """
+        edge_src, edge_dst, edge_alive = graph._edge_src, graph._edge_dst, graph._edge_alive
+        edge_lineno, edge_col, edge_kind = graph._edge_lineno, graph._edge_col, graph._edge_kind
+
+        overlapping = any(times_added[node_id_map[node_id]] > 1 for node_id in graph._node_ids_by_path.values())
+
+        if not overlapping and not graph._dead_edges:
+            # the common case of disjoint partials: columns are copied in bulk
+            edge_offset = len(self._edge_src)
+            self._edge_symbols.update(
+                (edge_offset + edge_id, symbols) for edge_id, symbols in graph._edge_symbols.items()
+            )
+
+            self._edge_src.extend(array("i", [node_id_map[node_id] for node_id in edge_src]))
+            self._edge_dst.extend(array("i", [node_id_map[node_id] for node_id in edge_dst]))
+            self._edge_lineno.extend(edge_lineno)
+            self._edge_col.extend(edge_col)
+            self._edge_kind.extend(edge_kind)
+            self._edge_alive.extend(edge_alive)
+
+            return
+
+        for edge_id in range(len(edge_src)):
+            if not edge_alive[edge_id]:
+                continue
+
+            src_id, dst_id = node_id_map[edge_src[edge_id]], node_id_map[edge_dst[edge_id]]
+            lineno, col_offset = edge_lineno[edge_id], edge_col[edge_id]
+
+            if times_added[src_id] > 1:
+                edge = (dst_id, lineno, col_offset)
+                src_added_edges = added_edges.setdefault(src_id, set())
+
+                if edge in src_added_edges:
+                    continue
+
+                src_added_edges.add(edge)
+
+            self._edge_src.append(src_id)
+            self._edge_dst.append(dst_id)
+            self._edge_lineno.append(lineno)
+            self._edge_col.append(col_offset)
+            self._edge_kind.append(edge_kind[edge_id])
+            self._edge_alive.append(1)
+
+            if (symbols := graph._edge_symbols.get(edge_id)) is not None:
+                self._edge_symbols[len(self._edge_src) - 1] = symbols
+
+    def __iter__(self) -> Iterator[Module]:
+        """
+        Iterate over modules added to the graph (placeholders of imported modules are skipped)
+        """
+        for node_id in list(self._node_ids.values()):
+            if self._added[node_id]:
+                yield self._view(node_id)
 
     def __len__(self) -> int:
-        return len(self._mods_by_mod_name) + len(self._unmet_nodes)
+        return len(self._node_ids)
 
     def __repr__(self) -> str:
         return f"ModGraph(modules={len(self)})"
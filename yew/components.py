@@ -0,0 +1,262 @@
+import dataclasses
+import functools
+import logging
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence, Tuple
+
+from yew.kinds import ALL_KINDS_MASK
+
+if TYPE_CHECKING:
+    from yew.collection import ImportContext, ModGraph, ModName, Module
+
+logger = logging.getLogger(__name__)
+
+UNVISITED = -1
+
+
+@dataclasses.dataclass(frozen=True)
+class ImportCycle:
+    """
+    A strongly connected group of modules with the imports that tie them together
+    """
+
+    modules: Tuple["Module", ...]
+    imports: Tuple[Tuple["Module", "ImportContext"], ...]  # (importing module, imported module with code reference)
+
+
+class Condensation:
+    """
+    The module graph condensed into strongly connected components (import cycles) and ordered in topological layers.
+
+    Components are listed dependencies first. A component only depends on components from the previous layers,
+    so all components of a layer can be processed in parallel. Modules and cycles are materialized on first access
+    """
+
+    def __init__(
+        self,
+        graph: "ModGraph",
+        components: List[List[int]],
+        component_ids: "array[int]",
+        layers: List[List[int]],
+        cyclic_component_ids: List[int],
+        kinds: int = ALL_KINDS_MASK,
+    ) -> None:
+        self._graph = graph
+        self._components = components
+        self._component_ids = component_ids
+        self._layers = layers
+        self._cyclic_component_ids = cyclic_component_ids
+        self._kinds = kinds
+
+    @functools.cached_property
+    def components(self) -> Tuple[Tuple["Module", ...], ...]:
+        graph = self._graph
+
+        return tuple(tuple(graph._view(node_id) for node_id in component) for component in self._components)
+
+    @property
+    def layers(self) -> Tuple[Tuple[int, ...], ...]:
+        """
+        Get indexes of components per layer
+        """
+        return tuple(tuple(layer) for layer in self._layers)
+
+    @functools.cached_property
+    def cycles(self) -> Tuple[ImportCycle, ...]:
+        graph = self._graph
+        cycles: List[ImportCycle] = []
+
+        for component_id in self._cyclic_component_ids:
+            component = self._components[component_id]
+            imports = [
+                (graph._view(node_id), graph._import_context(edge_id, graph._edge_dst[edge_id]))
+                for node_id in component
+                for edge_id in graph._filter_kinds(graph._out_edge_ids(node_id), self._kinds)
+                if self._component_ids[graph._edge_dst[edge_id]] == component_id
+            ]
+
+            cycles.append(
+                ImportCycle(
+                    modules=tuple(graph._view(node_id) for node_id in component),
+                    imports=tuple(imports),
+                )
+            )
+
+        return tuple(cycles)
+
+    def component_of(self, name: "str | Path | ModName") -> int | None:
+        """
+        Get the index of the component that contains the module
+        """
+        if (node_id := self._graph._lookup_node_id(name)) is None:
+            return None
+
+        component_id = self._component_ids[node_id] if node_id < len(self._component_ids) else UNVISITED
+
+        return component_id if component_id != UNVISITED else None
+
+    def __repr__(self) -> str:
+        return (
+            f"Condensation(components={len(self._components)}, layers={len(self._layers)}, "
+            f"cycles={len(self._cyclic_component_ids)})"
+        )
+
+
+def strongly_connected_components(successors: Sequence[Sequence[int]], node_ids: Sequence[int]) -> List[List[int]]:
+    """
+    Find strongly connected components among the nodes with Tarjan's algorithm (successors are indexed by node IDs).
+
+    The traversal is iterative, so deep import chains don't hit the recursion limit.
+    Components are returned in the reverse topological order (every component comes after the ones it imports)
+    """
+    return _Tarjan(successors, node_ids).run()
+
+
+class _Tarjan:
+    """
+    State of the iterative Tarjan's traversal: nodes are visited depth-first with an explicit stack of frames,
+    each frame is a node with the iterator over its remaining successors
+    """
+
+    def __init__(self, successors: Sequence[Sequence[int]], node_ids: Sequence[int]) -> None:
+        total_nodes = len(successors)
+
+        self._successors = successors
+        self._node_ids = node_ids
+
+        self._included = bytearray(total_nodes)
+
+        for node_id in node_ids:
+            self._included[node_id] = 1
+
+        self._index = array("i", [UNVISITED]) * total_nodes
+        self._lowlink = array("i", [UNVISITED]) * total_nodes
+        self._on_stack = bytearray(total_nodes)
+
+        self._stack: List[int] = []
+        self._components: List[List[int]] = []
+        self._counter = 0
+
+    def run(self) -> List[List[int]]:
+        for root_id in self._node_ids:
+            if self._index[root_id] == UNVISITED:
+                self._traverse(root_id)
+
+        return self._components
+
+    def _traverse(self, root_id: int) -> None:
+        included, index, lowlink, on_stack = self._included, self._index, self._lowlink, self._on_stack
+
+        work: List[Tuple[int, Iterator[int]]] = [self._visit(root_id)]
+
+        while work:
+            node_id, neighbors = work[-1]
+
+            for neighbor_id in neighbors:
+                if not included[neighbor_id]:
+                    continue
+
+                if index[neighbor_id] == UNVISITED:
+                    work.append(self._visit(neighbor_id))
+                    break
+
+                if on_stack[neighbor_id] and index[neighbor_id] < lowlink[node_id]:
+                    lowlink[node_id] = index[neighbor_id]
+            else:
+                # all neighbors are visited, so the node is done
+                work.pop()
+                self._finish(node_id, work[-1][0] if work else None)
+
+    def _visit(self, node_id: int) -> Tuple[int, Iterator[int]]:
+        self._index[node_id] = self._lowlink[node_id] = self._counter
+        self._counter += 1
+        self._stack.append(node_id)
+        self._on_stack[node_id] = 1
+
+        return node_id, iter(self._successors[node_id])
+
+    def _finish(self, node_id: int, parent_id: Optional[int]) -> None:
+        lowlink = self._lowlink
+
+        if parent_id is not None and lowlink[node_id] < lowlink[parent_id]:
+            lowlink[parent_id] = lowlink[node_id]
+
+        if lowlink[node_id] != self._index[node_id]:
+            return
+
+        # the node is the root of a component, which is the rest of the stack above it
+        component: List[int] = []
+
+        while True:
+            member_id = self._stack.pop()
+            self._on_stack[member_id] = 0
+            component.append(member_id)
+
+            if member_id == node_id:
+                break
+
+        self._components.append(component)
+
+
+def condense(graph: "ModGraph", *, first_party_only: bool = False, kinds: int = ALL_KINDS_MASK) -> Condensation:
+    """
+    Condense the graph into components and group them into topological layers in linear time
+    following only imports of the given kinds (a bitmask, see kinds_mask())
+    """
+    node_ids = sorted(node_id for node_id in graph._node_ids.values() if not first_party_only or graph._added[node_id])
+    successors: List[Sequence[int]] = [()] * len(graph._names)
+
+    for node_id in node_ids:
+        successors[node_id] = list(graph._dependencies(node_id, kinds))
+
+    components = strongly_connected_components(successors, node_ids)
+
+    component_ids = array("i", [UNVISITED]) * len(graph._names)
+
+    for component_id, component in enumerate(components):
+        for node_id in component:
+            component_ids[node_id] = component_id
+
+    component_layers, cyclic_component_ids = _component_layers(components, component_ids, successors)
+    layers: List[List[int]] = [[] for _ in range(max(component_layers, default=-1) + 1)]
+
+    for component_id, layer in enumerate(component_layers):
+        layers[layer].append(component_id)
+
+    logger.debug(f"Condensed {len(node_ids)} modules into {len(components)} components and {len(layers)} layers")
+
+    return Condensation(graph, components, component_ids, layers, cyclic_component_ids, kinds)
+
+
+def _component_layers(
+    components: Sequence[Sequence[int]],
+    component_ids: "array[int]",
+    successors: Sequence[Sequence[int]],
+) -> Tuple["array[int]", List[int]]:
+    """
+    Get the layer of every component (one above the highest layer it imports) and IDs of the cyclic components
+    """
+    component_layers = array("i", [0]) * len(components)
+    cyclic_component_ids: List[int] = []
+
+    # the components are sorted dependencies first, so the layers of dependencies are known by the time they are needed
+    for component_id, component in enumerate(components):
+        layer = 0
+        is_cyclic = len(component) > 1
+
+        for node_id in component:
+            for neighbor_id in successors[node_id]:
+                neighbor_component_id = component_ids[neighbor_id]
+
+                if neighbor_component_id == component_id:
+                    is_cyclic = True
+                elif neighbor_component_id != UNVISITED and component_layers[neighbor_component_id] >= layer:
+                    layer = component_layers[neighbor_component_id] + 1
+
+        component_layers[component_id] = layer
+
+        if is_cyclic:
+            cyclic_component_ids.append(component_id)
+
+    return component_layers, cyclic_component_ids
@@ -0,0 +1,694 @@
+import abc
+import bisect
+import dataclasses
+import logging
+import re
+import sys
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from yew.chains import START
+from yew.kinds import ImportKind, kinds_mask
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+if TYPE_CHECKING:
+    from yew.collection import ImportChain, ModGraph
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = "*"  # matches one part of the module name, e.g. "app.*.models"
+
+
+class ContractError(Exception):
+    """
+    Raised when contracts are not configured properly
+    """
+
+
+@dataclasses.dataclass(frozen=True)
+class ContractPair:
+    """
+    Modules of the importer package must not import modules of the imported one,
+    unless they are also under the allowed package
+    """
+
+    importer: str
+    imported: str
+    allowed: Optional[str] = None
+
+
+@dataclasses.dataclass(frozen=True)
+class Contract(abc.ABC):
+    """
+    An architecture rule that is kept when no module of one package imports modules of another one.
+    Only imports of the given kinds are followed (all kinds by default)
+    """
+
+    name: str
+    kinds: Optional[Tuple[ImportKind, ...]] = None
+
+    @property
+    def direct_only(self) -> bool:
+        """
+        Whether only direct imports break the contract (otherwise import chains do)
+        """
+        return False
+
+    @abc.abstractmethod
+    def patterns(self) -> Tuple[str, ...]:
+        """
+        Get module names and patterns the contract is about, so changes of other modules don't affect its pairs
+        """
+
+    @abc.abstractmethod
+    def pairs(self, index: "ModuleIndex") -> Iterator[ContractPair]:
+        """
+        Get the importer and imported packages that must not be connected by imports
+        """
+
+
+@dataclasses.dataclass(frozen=True)
+class LayersContract(Contract):
+    """
+    Layers are listed from the highest to the lowest one. A layer may import lower layers, but not higher ones.
+    With containers, layers are subpackages of every container
+    """
+
+    layers: Tuple[str, ...] = ()
+    containers: Tuple[str, ...] = ()
+
+    def patterns(self) -> Tuple[str, ...]:
+        if not self.containers:
+            return self.layers
+
+        return tuple(f"{container}.{layer}" for container in self.containers for layer in self.layers)
+
+    def pairs(self, index: "ModuleIndex") -> Iterator[ContractPair]:
+        for container in self.containers or ("",):
+            layers = [f"{container}.{layer}" if container else layer for layer in self.layers]
+
+            for higher_index, higher in enumerate(layers):
+                for lower in layers[higher_index + 1 :]:
+                    yield ContractPair(importer=lower, imported=higher)
+
+
+@dataclasses.dataclass(frozen=True)
+class ForbiddenContract(Contract):
+    """
+    Source modules must not import forbidden modules (directly only if indirect imports are allowed)
+    """
+
+    source_modules: Tuple[str, ...] = ()
+    forbidden_modules: Tuple[str, ...] = ()
+    allow_indirect_imports: bool = False
+
+    @property
+    def direct_only(self) -> bool:
+        return self.allow_indirect_imports
+
+    def patterns(self) -> Tuple[str, ...]:
+        return (*self.source_modules, *self.forbidden_modules)
+
+    def pairs(self, index: "ModuleIndex") -> Iterator[ContractPair]:
+        for source_module in index.expand(self.source_modules):
+            for forbidden_module in index.expand(self.forbidden_modules):
+                yield ContractPair(importer=source_module, imported=forbidden_module)
+
+
+@dataclasses.dataclass(frozen=True)
+class IndependenceContract(Contract):
+    """
+    The modules must not import each other. Patterns expand to every matching module,
+    e.g. "app.*" makes all subpackages of the app independent
+    """
+
+    modules: Tuple[str, ...] = ()
+
+    def patterns(self) -> Tuple[str, ...]:
+        return self.modules
+
+    def pairs(self, index: "ModuleIndex") -> Iterator[ContractPair]:
+        modules = index.expand(self.modules)
+
+        for importer in modules:
+            for imported in modules:
+                if importer != imported:
+                    yield ContractPair(importer=importer, imported=imported)
+
+
+@dataclasses.dataclass(frozen=True)
+class PrivateContract(Contract):
+    """
+    Private modules of the containers (the ones with a name part that starts with an underscore)
+    may only be imported by modules of their parent package, not by its siblings or other modules of the containers
+    """
+
+    containers: Tuple[str, ...] = ()
+
+    @property
+    def direct_only(self) -> bool:
+        return True
+
+    def patterns(self) -> Tuple[str, ...]:
+        return self.containers
+
+    def pairs(self, index: "ModuleIndex") -> Iterator[ContractPair]:
+        for container in self.containers:
+            for mod_name in index.under(container):
+                *package_parts, name = mod_name.split(".")
+
+                # only the topmost private module of the subtree, the rest of it is covered by its package
+                if not _is_private(name) or any(_is_private(part) for part in package_parts):
+                    continue
+
+                yield ContractPair(importer=container, imported=mod_name, allowed=".".join(package_parts))
+
+
+CONTRACT_TYPES: Dict[str, type[Contract]] = {
+    "layers": LayersContract,
+    "forbidden": ForbiddenContract,
+    "independence": IndependenceContract,
+    "private": PrivateContract,
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Violation:
+    """
+    An import chain from a module of the importer package to a module of the imported one
+    """
+
+    importer: str
+    imported: str
+    chain: "ImportChain"
+
+
+@dataclasses.dataclass(frozen=True)
+class ContractResult:
+    contract: Contract
+    violations: Tuple[Violation, ...]
+
+    @property
+    def kept(self) -> bool:
+        return not self.violations
+
+
+class ModuleIndex:
+    """
+    Module names of the graph sorted, so all modules of a package are a contiguous range
+    """
+
+    def __init__(self, graph: "ModGraph") -> None:
+        self._graph = graph
+        self._names = sorted(graph._node_ids)
+
+    def under(self, package: str) -> List[str]:
+        """
+        Get the module and its submodules (all modules for the empty package name)
+        """
+        names = self._names
+
+        if not package:
+            return names
+
+        start, end = bisect.bisect_left(names, f"{package}."), bisect.bisect_left(names, f"{package}/")
+
+        return [package, *names[start:end]] if package in self._graph._node_ids else names[start:end]
+
+    def node_ids(self, package: str) -> Set[int]:
+        node_ids = self._graph._node_ids
+
+        return {node_ids[name] for name in self.under(package)}
+
+    def expand(self, patterns: Iterable[str]) -> List[str]:
+        """
+        Get modules and packages that match the patterns (only ones that are in the graph for names with wildcards)
+        """
+        modules: List[str] = []
+
+        for pattern in patterns:
+            if WILDCARD not in pattern:
+                modules.append(pattern)
+                continue
+
+            prefix = pattern.partition(WILDCARD)[0].rstrip(".")
+            regex = _pattern_regex(pattern, submodules=False)
+            total_parts = pattern.count(".") + 1
+
+            # packages don't have to be in the graph themselves (e.g. namespace ones), only their modules
+            packages = {".".join(name.split(".")[:total_parts]) for name in self.under(prefix)}
+
+            modules.extend(sorted(package for package in packages if regex.fullmatch(package)))
+
+        return modules
+
+
+@dataclasses.dataclass(frozen=True)
+class _Group:
+    """
+    Modules of the package except the ones under the excluded packages
+    """
+
+    package: str
+    excluded: Tuple[str, ...] = ()
+
+    def __contains__(self, mod_name: str) -> bool:
+        return _is_under(mod_name, self.package) and not any(_is_under(mod_name, package) for package in self.excluded)
+
+
+@dataclasses.dataclass
+class _ContractState:
+    """
+    What the last check of a contract has found.
+
+    Importer and imported packages of the contract pairs are numbered as groups, and every module keeps bitmasks
+    of the importer groups that reach it (forward) and of the imported groups it reaches (backward). A new import
+    can only break a pair if its importer is reached from the pair's importer group and the imported module
+    reaches the pair's imported group, so telling the affected pairs takes a few bitwise operations
+    """
+
+    patterns: List["re.Pattern[str]"]
+    node_ids: Set[int]  # modules of the packages the contract is about
+    pairs: List[ContractPair]
+    pair_groups: List[Tuple[int, int]]  # (importer group, imported group) of every pair
+    pair_ids: Dict[Tuple[int, int], int]
+    importer_groups: List[_Group]
+    imported_ids: List[List[int]]  # modules of every imported group
+    imported_pairs: List[int]  # mask of imported groups every importer group is paired with
+    target_groups: Dict[int, int]  # module -> mask of imported groups it belongs to
+    forward: List[int]  # module -> mask of importer groups that import it (transitively)
+    backward: List[int]  # module -> mask of imported groups it imports (transitively)
+    violations: Dict[int, Violation]  # by pair index
+    chain_names: Dict[int, Set[str]]  # modules on the violating chain by pair index
+
+
+class ContractChecker:
+    """
+    Check contracts against the module graph.
+
+    The first check() checks all contracts. After that, only the contract pairs that changes of the modules
+    reported via changed() may affect are checked again, the rest keep their previous results: pairs whose
+    violating chain goes through a changed module, and pairs a new import may connect, see _ContractState
+    """
+
+    def __init__(self, graph: "ModGraph", contracts: Sequence[Contract]) -> None:
+        self._graph = graph
+        self._contracts = list(contracts)
+        self._states: List[Optional[_ContractState]] = [None] * len(self._contracts)
+
+        self._changed: Set[str] = set()
+        self._index: Optional[ModuleIndex] = None
+        self._index_version = -1
+
+        self.rechecked: List[Contract] = []  # contracts that the last check() has checked again (some of their pairs)
+
+    def changed(self, mod_names: Iterable[str]) -> None:
+        """
+        Report modules that have been added, updated or removed in the graph since the last check
+        """
+        self._changed.update(mod_names)
+
+    def check(self) -> List[ContractResult]:
+        if not len(self._graph):
+            # every contract would be kept vacuously, e.g. when the packages have been mistyped
+            raise ContractError("The module graph is empty, there is nothing to check the contracts against")
+
+        changed, self._changed = self._changed, set()
+        self.rechecked = []
+        results: List[ContractResult] = []
+
+        for contract_index, contract in enumerate(self._contracts):
+            state = self._states[contract_index]
+
+            if state is None or (pair_indexes := self._affected_pairs(contract, state, changed)) is None:
+                state = self._states[contract_index] = self._build(contract)
+                pair_indexes = set(range(len(state.pairs)))
+
+            if pair_indexes:
+                self.rechecked.append(contract)
+
+            for pair_index in sorted(pair_indexes):
+                self._check_pair(contract, state, pair_index)
+
+            results.append(
+                ContractResult(
+                    contract=contract,
+                    violations=tuple(state.violations[pair_index] for pair_index in sorted(state.violations)),
+                )
+            )
+
+        logger.debug(f"{len(self.rechecked)} of {len(self._contracts)} contracts have been checked again")
+
+        return results
+
+    def _build(self, contract: Contract) -> _ContractState:
+        index = self._module_index()
+        kinds = kinds_mask(contract.kinds)
+        total_nodes = len(self._graph._names)
+
+        state = _ContractState(
+            patterns=[_pattern_regex(pattern) for pattern in contract.patterns()],
+            node_ids=set().union(*(index.node_ids(package) for package in index.expand(contract.patterns()))),
+            pairs=[],
+            pair_groups=[],
+            pair_ids={},
+            importer_groups=[],
+            imported_ids=[],
+            imported_pairs=[],
+            target_groups={},
+            forward=[] if contract.direct_only else [0] * total_nodes,
+            backward=[] if contract.direct_only else [0] * total_nodes,
+            violations={},
+            chain_names={},
+        )
+        self._add_pairs(state, contract.pairs(index), index)
+
+        if not contract.direct_only:
+            self._build_masks(state, index, kinds)
+
+        return state
+
+    def _add_pairs(self, state: _ContractState, pairs: Iterable[ContractPair], index: ModuleIndex) -> None:
+        """
+        Number importer and imported packages of the pairs as groups
+        """
+        importer_indexes: Dict[_Group, int] = {}
+        imported_indexes: Dict[str, int] = {}
+
+        for pair in pairs:
+            excluded = [pair.allowed] if pair.allowed is not None else []
+
+            # e.g. "app" must not import "app.infra", but modules of "app.infra" may import each other
+            if _is_under(pair.imported, pair.importer) or _is_under(pair.importer, pair.imported):
+                excluded.append(pair.imported)
+
+            importer = _Group(package=pair.importer, excluded=tuple(excluded))
+
+            if (importer_index := importer_indexes.get(importer)) is None:
+                importer_index = importer_indexes[importer] = len(state.importer_groups)
+                state.importer_groups.append(importer)
+                state.imported_pairs.append(0)
+
+            if (imported_index := imported_indexes.get(pair.imported)) is None:
+                imported_index = imported_indexes[pair.imported] = len(state.imported_ids)
+                state.imported_ids.append(sorted(index.node_ids(pair.imported)))
+
+                for node_id in state.imported_ids[imported_index]:
+                    state.target_groups[node_id] = state.target_groups.get(node_id, 0) | 1 << imported_index
+
+            state.pair_ids[importer_index, imported_index] = len(state.pairs)
+            state.pairs.append(pair)
+            state.pair_groups.append((importer_index, imported_index))
+            state.imported_pairs[importer_index] |= 1 << imported_index
+
+    def _build_masks(self, state: _ContractState, index: ModuleIndex, kinds: int) -> None:
+        for importer_index, importer in enumerate(state.importer_groups):
+            for node_id in index.node_ids(importer.package):
+                if self._graph._names[node_id] in importer:
+                    state.forward[node_id] |= 1 << importer_index
+
+        for node_id, imported_mask in state.target_groups.items():
+            state.backward[node_id] = imported_mask
+
+        self._propagate(state.forward, [node_id for node_id, mask in enumerate(state.forward) if mask], kinds)
+        self._propagate(state.backward, list(state.target_groups), kinds, reverse=True)
+
+    def _affected_pairs(self, contract: Contract, state: _ContractState, changed: Set[str]) -> Optional[Set[int]]:
+        """
+        Get indexes of the pairs that the changed modules may break or fix (None if the contract has to be built
+        again, since a module of its packages has been added)
+        """
+        # pairs whose violating chain goes through a changed module
+        pair_indexes = {
+            pair_index for pair_index, chain_names in state.chain_names.items() if not chain_names.isdisjoint(changed)
+        }
+
+        if (changed_ids := self._changed_ids(state, changed)) is None:
+            return None
+
+        if not changed_ids:
+            return pair_indexes
+
+        kinds = kinds_mask(contract.kinds)
+
+        if not contract.direct_only:
+            self._update_masks(state, changed_ids, kinds)
+
+        pair_indexes.update(self._connected_pairs(contract, state, changed_ids, kinds))
+
+        return pair_indexes
+
+    def _changed_ids(self, state: _ContractState, changed: Set[str]) -> Optional[List[int]]:
+        """
+        Get node IDs of the changed modules that are in the graph (None if a module of the contract packages is new)
+        """
+        changed_ids: List[int] = []
+
+        for mod_name in changed:
+            if (node_id := self._graph._lookup_node_id(mod_name)) is None:
+                # removed modules that are not on the violating chains can't fix the contract or break it
+                continue
+
+            if node_id not in state.node_ids and any(pattern.fullmatch(mod_name) for pattern in state.patterns):
+                return None
+
+            changed_ids.append(node_id)
+
+        return changed_ids
+
+    def _update_masks(self, state: _ContractState, changed_ids: List[int], kinds: int) -> None:
+        forward, backward = state.forward, state.backward
+
+        self._grow(state)
+
+        for node_id in changed_ids:
+            for imported_id in self._graph._dependencies(node_id, kinds):
+                backward[node_id] |= backward[imported_id]
+
+        # the masks only grow: removed imports leave them too wide, which costs a search but never misses one
+        self._propagate(forward, changed_ids, kinds)
+        self._propagate(backward, changed_ids, kinds, reverse=True)
+
+    def _connected_pairs(
+        self,
+        contract: Contract,
+        state: _ContractState,
+        changed_ids: List[int],
+        kinds: int,
+    ) -> Iterator[int]:
+        """
+        Find the kept pairs that imports of the changed modules may connect
+        """
+        graph = self._graph
+
+        for node_id in changed_ids:
+            mod_name = graph._names[node_id]
+
+            for imported_id in graph._dependencies(node_id, kinds):
+                if contract.direct_only:
+                    importer_mask = self._importer_mask(state, mod_name)
+                    imported_mask = state.target_groups.get(imported_id, 0)
+                else:
+                    importer_mask, imported_mask = state.forward[node_id], state.backward[imported_id]
+
+                for importer_index in _bits(importer_mask):
+                    for imported_index in _bits(state.imported_pairs[importer_index] & imported_mask):
+                        if (pair_index := state.pair_ids[importer_index, imported_index]) not in state.violations:
+                            yield pair_index
+
+    def _check_pair(self, contract: Contract, state: _ContractState, pair_index: int) -> None:
+        graph = self._graph
+        pair = state.pairs[pair_index]
+
+        state.violations.pop(pair_index, None)
+        state.chain_names.pop(pair_index, None)
+
+        if (chain := self._find_chain(contract, state, pair_index)) is None:
+            return
+
+        hops = [
+            (graph._view(graph._edge_src[edge_id]), graph._import_context(edge_id, graph._edge_dst[edge_id]))
+            for edge_id in chain
+        ]
+        state.violations[pair_index] = Violation(importer=pair.importer, imported=pair.imported, chain=hops)
+        state.chain_names[pair_index] = {
+            graph._names[node_id]
+            for edge_id in chain
+            for node_id in (graph._edge_src[edge_id], graph._edge_dst[edge_id])
+        }
+
+    def _find_chain(self, contract: Contract, state: _ContractState, pair_index: int) -> Optional[List[int]]:
+        """
+        Find edge IDs of the shortest import chain of the pair searching backward from its imported group.
+        Only modules reached from the importer group are visited, so the search stays within the chains
+        """
+        graph = self._graph
+        kinds = kinds_mask(contract.kinds)
+        importer_index, imported_index = state.pair_groups[pair_index]
+        importer, importer_bit = state.importer_groups[importer_index], 1 << importer_index
+
+        if contract.direct_only:
+            for node_id in state.imported_ids[imported_index]:
+                for edge_id in graph._filter_kinds(graph._in_edge_ids(node_id), kinds):
+                    if graph._names[graph._edge_src[edge_id]] in importer:
+                        return [edge_id]
+
+            return None
+
+        self._grow(state)
+        forward = state.forward
+
+        # node ID -> edge ID the node imports the next module of the chain by
+        visited: Dict[int, int] = {
+            node_id: START for node_id in state.imported_ids[imported_index] if forward[node_id] & importer_bit
+        }
+        queue: Deque[int] = deque(visited)
+
+        while queue:
+            for edge_id in graph._filter_kinds(graph._in_edge_ids(queue.popleft()), kinds):
+                node_id = graph._edge_src[edge_id]
+
+                if node_id in visited or not forward[node_id] & importer_bit:
+                    continue
+
+                visited[node_id] = edge_id
+
+                if graph._names[node_id] not in importer:
+                    queue.append(node_id)
+                    continue
+
+                chain: List[int] = []
+
+                while (edge_id := visited[node_id]) != START:
+                    chain.append(edge_id)
+                    node_id = graph._edge_dst[edge_id]
+
+                return chain
+
+        return None
+
+    def _propagate(self, masks: List[int], node_ids: Iterable[int], kinds: int, *, reverse: bool = False) -> None:
+        """
+        Merge masks of the given nodes into the masks of the nodes they import (or that import them if reverse),
+        transitively. A node is expanded again only when its mask grows
+        """
+        neighbors = self._graph._dependents if reverse else self._graph._dependencies
+        queue: Deque[int] = deque(node_ids)
+
+        while queue:
+            node_id = queue.popleft()
+            mask = masks[node_id]
+
+            for neighbor_id in neighbors(node_id, kinds):
+                if mask & ~masks[neighbor_id]:
+                    masks[neighbor_id] |= mask
+                    queue.append(neighbor_id)
+
+    def _grow(self, state: _ContractState) -> None:
+        # nodes that have been added to the graph since the contract was built
+        if (added := len(self._graph._names) - len(state.forward)) > 0:
+            state.forward.extend([0] * added)
+            state.backward.extend([0] * added)
+
+    def _importer_mask(self, state: _ContractState, mod_name: str) -> int:
+        mask = 0
+
+        for importer_index, importer in enumerate(state.importer_groups):
+            if mod_name in importer:
+                mask |= 1 << importer_index
+
+        return mask
+
+    def _module_index(self) -> ModuleIndex:
+        if self._index is None or self._index_version != self._graph._version:
+            self._index = ModuleIndex(self._graph)
+            self._index_version = self._graph._version
+
+        return self._index
+
+
+def load_contracts(config_path: Path) -> List[Contract]:
+    """
+    Read contracts from the [[tool.yew.contracts]] tables of pyproject.toml, e.g.
+
+        [[tool.yew.contracts]]
+        name = "Domain doesn't depend on infrastructure"
+        type = "forbidden"
+        source_modules = ["app.domain"]
+        forbidden_modules = ["app.infra"]
+    """
+    try:
+        with config_path.open("rb") as config_file:
+            config = tomllib.load(config_file)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ContractError(f"Could not read contracts from {config_path}: {e}") from e
+
+    contract_configs = config.get("tool", {}).get("yew", {}).get("contracts", [])
+
+    return [_parse_contract(contract_config) for contract_config in contract_configs]
+
+
+def _parse_contract(contract_config: Dict[str, Any]) -> Contract:
+    contract_config = dict(contract_config)
+
+    name = contract_config.pop("name", None)
+    contract_type = contract_config.pop("type", None)
+
+    if not name:
+        raise ContractError(f"Contract has no name: {contract_config}")
+
+    if (contract_cls := CONTRACT_TYPES.get(contract_type)) is None:
+        raise ContractError(
+            f"Contract '{name}' has unknown type {contract_type!r}, use one of: {', '.join(CONTRACT_TYPES)}"
+        )
+
+    fields = {field.name: field for field in dataclasses.fields(contract_cls)}
+    options: Dict[str, Any] = {}
+
+    for option, value in contract_config.items():
+        if option not in fields or option == "name":
+            raise ContractError(f"Contract '{name}' has unknown option {option!r}")
+
+        try:
+            if option == "kinds":
+                value = tuple(ImportKind[kind.upper()] for kind in value)
+            elif isinstance(value, list):
+                value = tuple(value)
+        except (KeyError, AttributeError, TypeError):
+            raise ContractError(f"Contract '{name}' has unknown import kinds: {value}") from None
+
+        options[option] = value
+
+    return contract_cls(name=name, **options)
+
+
+def _pattern_regex(pattern: str, *, submodules: bool = True) -> "re.Pattern[str]":
+    """
+    Match names of the module (and its submodules) with wildcards standing for any single name part
+    """
+    regex = r"[^.]+".join(re.escape(part) for part in pattern.split(WILDCARD))
+
+    return re.compile(rf"{regex}(\..+)?" if submodules else regex)
+
+
+def _is_under(mod_name: str, package: str) -> bool:
+    """
+    Tell whether the module is the package or its submodule (any module is under the empty package name)
+    """
+    return not package or mod_name == package or mod_name.startswith(f"{package}.")
+
+
+def _bits(mask: int) -> Iterator[int]:
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def _is_private(part: str) -> bool:
+    return part.startswith("_") and not part.startswith("__")
@@ -0,0 +1,431 @@
+import dataclasses
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Final, List, Optional, Sequence, Tuple
+
+from yew.collection import ImportChain, ModGraph
+from yew.contracts import ContractChecker, ContractError, load_contracts
+from yew.kinds import ImportKind
+from yew.mods.finders import ModFinder
+from yew.mods.graph import build_classifier, build_mod_graph, build_resolver, update_mod_graph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH: Final[Path] = Path(".yew.sock")
+DEFAULT_POLL_INTERVAL: Final[float] = 1.0
+DEFAULT_CONFIG_PATH: Final[Path] = Path("pyproject.toml")
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+FileState = Tuple[int, int]  # (mtime_ns, size)
+
+
+class DaemonNotRunning(Exception):
+    """
+    Raised when there is no daemon listening on the socket
+    """
+
+
+@dataclasses.dataclass
+class FileChanges:
+    added: List[Path] = dataclasses.field(default_factory=list)
+    modified: List[Path] = dataclasses.field(default_factory=list)
+    deleted: List[Path] = dataclasses.field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+
+class PollingWatcher:
+    """
+    Detect changed module files by periodically comparing file stats (no dependencies on OS-specific APIs)
+    """
+
+    def __init__(self, packages: Sequence[Path]) -> None:
+        self._packages = packages
+        self._mod_finder = ModFinder()
+
+        self._files: Dict[Path, FileState] = self._snapshot()
+
+    def poll(self) -> FileChanges:
+        """
+        Get files that have been changed since the previous poll
+        """
+        files = self._snapshot()
+        changes = FileChanges()
+
+        for file_path, state in files.items():
+            prev_state = self._files.get(file_path)
+
+            if prev_state is None:
+                changes.added.append(file_path)
+            elif prev_state != state:
+                changes.modified.append(file_path)
+
+        changes.deleted = [file_path for file_path in self._files if file_path not in files]
+
+        self._files = files
+
+        return changes
+
+    def _snapshot(self) -> Dict[Path, FileState]:
+        files: Dict[Path, FileState] = {}
+
+        for file_path in self._mod_finder.find(self._packages):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+
+            files[file_path] = (stat.st_mtime_ns, stat.st_size)
+
+        return files
+
+
+def handle_request(mod_graph: ModGraph, request: Request) -> Response:
+    """
+    Answer a dependency, import chain or contract check query against the graph
+    """
+    command = request.get("command")
+
+    if command == "ping":
+        return {"ok": True, "modules": len(mod_graph)}
+
+    if command == "check":
+        try:
+            return check_contracts(ContractChecker(mod_graph, load_contracts(_config_path(request))))
+        except ContractError as e:
+            return {"ok": False, "error": str(e)}
+
+    if command not in ("dependents", "dependencies", "chains"):
+        return {"ok": False, "error": f"Unknown command: {command}"}
+
+    kinds = request.get("kinds")
+
+    try:
+        import_kinds = [ImportKind[kind.upper()] for kind in kinds] if kinds is not None else None
+    except KeyError as e:
+        return {"ok": False, "error": f"Unknown import kind: {e.args[0].lower()}"}
+
+    if command == "chains":
+        return _chains(mod_graph, request, import_kinds)
+
+    targets = [_target(target) for target in request.get("targets", [])]
+    query = mod_graph.dependents if command == "dependents" else mod_graph.dependencies
+
+    modules = query(
+        targets,
+        depth=request.get("depth"),
+        first_party_only=request.get("first_party_only", False),
+        kinds=import_kinds,
+    )
+
+    return {"ok": True, "modules": sorted(str(module.mod_name) for module in modules)}
+
+
+def _chains(mod_graph: ModGraph, request: Request, kinds: Optional[List[ImportKind]]) -> Response:
+    try:
+        chains = mod_graph.import_chains(
+            _target(request["source"]),
+            _target(request["target"]),
+            request.get("k", 1),
+            kinds=kinds,
+        )
+    except KeyError as e:
+        return {"ok": False, "error": str(e.args[0])}
+
+    return {"ok": True, "chains": [_chain(chain) for chain in chains]}
+
+
+def check_contracts(checker: ContractChecker) -> Response:
+    """
+    Check the contracts and report violations of the broken ones along with the contracts that have been checked again
+    """
+    results = checker.check()
+
+    return {
+        "ok": True,
+        "contracts": [
+            {
+                "name": result.contract.name,
+                "kept": result.kept,
+                "violations": [
+                    {"importer": violation.importer, "imported": violation.imported, "chain": _chain(violation.chain)}
+                    for violation in result.violations
+                ],
+            }
+            for result in results
+        ],
+        "rechecked": [contract.name for contract in checker.rechecked],
+    }
+
+
+def _chain(chain: ImportChain) -> List[Dict[str, Any]]:
+    return [
+        {
+            "importer": str(module.mod_name),
+            "path": str(module.file_path),
+            "lineno": context.lineno,
+            "col_offset": context.col_offset,
+            "kind": context.kind.name.lower(),
+            "module": str(context.module.mod_name),
+        }
+        for module, context in chain
+    ]
+
+
+def _target(target: str) -> str | Path:
+    return Path(target) if target.endswith(".py") else target
+
+
+def _config_path(request: Request) -> Path:
+    return Path(request.get("config") or DEFAULT_CONFIG_PATH).absolute()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "_DaemonServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response: Response = {"ok": False, "error": f"Malformed request: {e}"}
+            else:
+                response = self.server.daemon.handle(request)
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+
+            if response.get("shutdown"):
+                # shutdown() waits for the serving loop, so it must not block the handler thread
+                threading.Thread(target=self.server.daemon.shutdown, daemon=True).start()
+                return
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, daemon: "GraphDaemon") -> None:
+        self.daemon = daemon
+
+        super().__init__(str(socket_path), _RequestHandler)
+
+
+class GraphDaemon:
+    """
+    Keep the module graph warm, update it as files change and answer queries over a Unix socket.
+
+    The protocol is one JSON object per line, e.g. {"command": "dependents", "targets": ["pkg.mod"], "depth": 2}.
+    Queries may be limited to import kinds, e.g. "kinds": ["eager", "optional"].
+    Import chains are queried with {"command": "chains", "source": "pkg.api", "target": "pkg.models", "k": 3}.
+    Contracts of a pyproject.toml are checked with {"command": "check", "config": "/path/to/pyproject.toml"},
+    the daemon keeps a checker per config, so only contracts that file changes may affect are checked again
+    """
+
+    def __init__(
+        self,
+        packages: Sequence[Path],
+        *,
+        socket_path: Path = DEFAULT_SOCKET_PATH,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        include_external: bool = False,
+        include_third_party: bool = False,
+        workers: int = 5,
+    ) -> None:
+        self._packages = [package.absolute() for package in packages]
+        self._socket_path = socket_path
+        self._poll_interval = poll_interval
+        self._include_external = include_external
+        self._include_third_party = include_third_party
+
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+
+        self._watcher = PollingWatcher(self._packages)
+        self._mod_graph = build_mod_graph(
+            self._packages,
+            include_external=include_external,
+            include_third_party=include_third_party,
+            workers=workers,
+        )
+
+        self._resolver = build_resolver(self._packages)
+        self._classifier = build_classifier(self._packages)
+
+        for module in self._mod_graph:
+            self._resolver.add(module.mod_name, module.file_path)
+
+        # config path -> (config mtime_ns, checker of its contracts)
+        self._checkers: Dict[Path, Tuple[int, ContractChecker]] = {}
+
+        self._server: Optional[_DaemonServer] = None
+
+    @property
+    def mod_graph(self) -> ModGraph:
+        return self._mod_graph
+
+    def handle(self, request: Request) -> Response:
+        if request.get("command") == "shutdown":
+            return {"ok": True, "shutdown": True}
+
+        with self._lock:
+            try:
+                if request.get("command") == "check":
+                    return check_contracts(self._checker(_config_path(request)))
+
+                return handle_request(self._mod_graph, request)
+            except ContractError as e:
+                return {"ok": False, "error": str(e)}
+            except Exception as e:
+                logger.exception(f"Could not handle the request: {request}")
+                return {"ok": False, "error": str(e)}
+
+    def refresh(self) -> FileChanges:
+        """
+        Apply file changes since the last refresh to the graph
+        """
+        changes = self._watcher.poll()
+
+        if not changes:
+            return changes
+
+        logger.info(
+            f"Updating the graph: {len(changes.added)} added, "
+            f"{len(changes.modified)} modified, {len(changes.deleted)} deleted files"
+        )
+
+        with self._lock:
+            # modules of the modified and deleted files are known before the update, the added ones after it
+            changed_modules = [self._mod_graph[file_path] for file_path in (*changes.modified, *changes.deleted)]
+
+            update_mod_graph(
+                self._mod_graph,
+                added=changes.added,
+                modified=changes.modified,
+                deleted=changes.deleted,
+                include_external=self._include_external,
+                include_third_party=self._include_third_party,
+                resolver=self._resolver,
+                classifier=self._classifier,
+            )
+
+            changed_modules.extend(self._mod_graph[file_path] for file_path in (*changes.added, *changes.modified))
+            mod_names = {str(module.mod_name) for module in changed_modules if module is not None}
+
+            for _, checker in self._checkers.values():
+                checker.changed(mod_names)
+
+        return changes
+
+    def _checker(self, config_path: Path) -> ContractChecker:
+        """
+        Get the checker of the config contracts, loading them again if the config has changed
+        """
+        try:
+            mtime_ns = config_path.stat().st_mtime_ns
+        except OSError as e:
+            raise ContractError(f"Could not read contracts from {config_path}: {e}") from e
+
+        if (cached := self._checkers.get(config_path)) is None or cached[0] != mtime_ns:
+            checker = ContractChecker(self._mod_graph, load_contracts(config_path))
+            cached = self._checkers[config_path] = (mtime_ns, checker)
+
+        return cached[1]
+
+    def serve_forever(self) -> None:
+        if self._socket_path.exists():
+            try:
+                query_daemon(self._socket_path, {"command": "ping"})
+            except DaemonNotRunning:
+                # a stale socket left by a daemon that has not been shut down gracefully
+                self._socket_path.unlink()
+            else:
+                raise RuntimeError(f"Another daemon is already listening on {self._socket_path}")
+
+        self._server = _DaemonServer(self._socket_path, self)
+
+        watcher_thread = threading.Thread(target=self._watch, name="yew-watcher", daemon=True)
+        watcher_thread.start()
+
+        logger.info(f"Serving the graph of {len(self._mod_graph)} modules on {self._socket_path}")
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            self._socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+
+        if self._server:
+            self._server.shutdown()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self._poll_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Could not update the graph")
+
+
+def query_daemon(socket_path: Path, request: Request, *, timeout: float = 5.0) -> Response:
+    """
+    Send a request to the daemon listening on the socket
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps(request).encode() + b"\n")
+
+            with client.makefile("rb") as reader:
+                response = reader.readline()
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise DaemonNotRunning(f"No daemon is listening on {socket_path}") from e
+
+    if not response:
+        raise DaemonNotRunning(f"The daemon on {socket_path} has closed the connection")
+
+    return json.loads(response)
+
+
+def query(
+    packages: Sequence[Path],
+    request: Request,
+    *,
+    socket_path: Path = DEFAULT_SOCKET_PATH,
+    **build_options: Any,
+) -> Response:
+    """
+    Query the daemon, falling back to building the graph of the packages in-process when the daemon is not running
+    """
+    try:
+        return query_daemon(socket_path, request)
+    except DaemonNotRunning:
+        if not packages:
+            # an empty graph would answer every query with nothing instead of failing
+            raise DaemonNotRunning(f"No packages given and no daemon is running on {socket_path}") from None
+
+        logger.info(f"No daemon is running on {socket_path}, building the graph in-process")
+
+    started_at = time.perf_counter()
+    mod_graph = build_mod_graph([package.absolute() for package in packages], **build_options)
+    logger.debug(f"The graph has been built in {time.perf_counter() - started_at:.2f}s")
+
+    return handle_request(mod_graph, request)
+
+
+def absolute_targets(targets: Sequence[str]) -> List[str]:
+    """
+    Make file targets absolute, so the daemon sees them the same way regardless of the client's working directory
+    """
+    return [os.path.abspath(target) if target.endswith(".py") else target for target in targets]
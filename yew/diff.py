@@ -0,0 +1,141 @@
+import dataclasses
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from yew.collection import ImportContext, ModGraph, Module
+
+
+@dataclasses.dataclass(frozen=True)
+class DiffSummary:
+    """
+    Numbers of added and removed modules and imports
+    """
+
+    added_modules: int
+    removed_modules: int
+    added_imports: int
+    removed_imports: int
+
+    @property
+    def changed(self) -> bool:
+        return any((self.added_modules, self.removed_modules, self.added_imports, self.removed_imports))
+
+
+class GraphDiff:
+    """
+    Differences between the base and the head graphs.
+
+    Modules are matched by their names (placeholders included) and imports by the names of the importing
+    and the imported modules, so moving an import to another line is not a change. Edges are compared
+    as integer keys straight from the edge columns, so the summary is cheap even for graphs loaded from snapshots.
+    Module and ImportContext objects are only built when the changed modules or imports are requested
+    """
+
+    def __init__(self, base: "ModGraph", head: "ModGraph") -> None:
+        self._base = base
+        self._head = head
+
+        head_node_ids, base_node_ids = head._node_ids, base._node_ids
+
+        self._added_node_ids = [node_id for name, node_id in head_node_ids.items() if name not in base_node_ids]
+        self._removed_node_ids = [node_id for name, node_id in base_node_ids.items() if name not in head_node_ids]
+
+        # base nodes are renumbered into head node IDs, the ones that are missing in the head go after them
+        self._stride = len(head._names) + len(self._removed_node_ids)
+        self._base_node_map = [-1] * len(base._names)
+
+        for name, node_id in base_node_ids.items():
+            self._base_node_map[node_id] = head_node_ids.get(name, -1)
+
+        for new_node_id, node_id in enumerate(self._removed_node_ids, start=len(head._names)):
+            self._base_node_map[node_id] = new_node_id
+
+        base_keys, head_keys = self._edge_keys(base, self._base_node_map), self._edge_keys(head)
+
+        self._added_keys = head_keys - base_keys
+        self._removed_keys = base_keys - head_keys
+
+    @property
+    def summary(self) -> DiffSummary:
+        return DiffSummary(
+            added_modules=len(self._added_node_ids),
+            removed_modules=len(self._removed_node_ids),
+            added_imports=len(self._added_keys),
+            removed_imports=len(self._removed_keys),
+        )
+
+    @cached_property
+    def added_modules(self) -> Set["Module"]:
+        return {self._head._view(node_id) for node_id in self._added_node_ids}
+
+    @cached_property
+    def removed_modules(self) -> Set["Module"]:
+        return {self._base._view(node_id) for node_id in self._removed_node_ids}
+
+    @cached_property
+    def added_imports(self) -> List[Tuple["Module", "ImportContext"]]:
+        """
+        Get imports that are in the head graph only as (importing module, import context) pairs.
+        Every location of the added import is listed
+        """
+        return self._imports(self._head, None, self._added_keys)
+
+    @cached_property
+    def removed_imports(self) -> List[Tuple["Module", "ImportContext"]]:
+        """
+        Get imports that are in the base graph only (with their locations in the base graph)
+        """
+        return self._imports(self._base, self._base_node_map, self._removed_keys)
+
+    def _edge_keys(self, graph: "ModGraph", node_map: Optional[List[int]] = None) -> Set[int]:
+        stride = self._stride
+        edge_src, edge_dst, edge_alive = graph._edge_src, graph._edge_dst, graph._edge_alive
+
+        if node_map is None:
+            return {src * stride + dst for src, dst, alive in zip(edge_src, edge_dst, edge_alive) if alive}
+
+        return {
+            node_map[src] * stride + node_map[dst] for src, dst, alive in zip(edge_src, edge_dst, edge_alive) if alive
+        }
+
+    def _imports(
+        self,
+        graph: "ModGraph",
+        node_map: Optional[List[int]],
+        keys: Set[int],
+    ) -> List[Tuple["Module", "ImportContext"]]:
+        if not keys:
+            return []
+
+        stride = self._stride
+        edge_src, edge_dst, edge_alive = graph._edge_src, graph._edge_dst, graph._edge_alive
+
+        # (importing module name, lineno, col_offset, edge ID), so imports are listed in a stable order
+        located_edges: List[Tuple[str, int, int, int]] = []
+
+        for edge_id in range(len(edge_src)):
+            if not edge_alive[edge_id]:
+                continue
+
+            src, dst = edge_src[edge_id], edge_dst[edge_id]
+            key = node_map[src] * stride + node_map[dst] if node_map is not None else src * stride + dst
+
+            if key in keys:
+                lineno, col_offset = graph._edge_lineno[edge_id], graph._edge_col[edge_id]
+                located_edges.append((graph._names[src], lineno, col_offset, edge_id))
+
+        located_edges.sort()
+
+        return [
+            (graph._view(edge_src[edge_id]), graph._import_context(edge_id, edge_dst[edge_id]))
+            for *_, edge_id in located_edges
+        ]
+
+    def __repr__(self) -> str:
+        summary = self.summary
+
+        return (
+            f"GraphDiff(modules=+{summary.added_modules}/-{summary.removed_modules}, "
+            f"imports=+{summary.added_imports}/-{summary.removed_imports})"
+        )
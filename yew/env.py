@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Sequence
+
+# entries of site directories that change whenever a distribution is installed, upgraded or removed
+DISTRIBUTION_SUFFIXES = (".dist-info", ".egg-info", ".pth")
+
+
+def env_fingerprint() -> str:
+    """
+    Fingerprint the interpreter and its import path, so import resolution results are not reused across environments
+    """
+    env = json.dumps([sys.version, sys.executable, sys.path])
+
+    return hashlib.sha256(env.encode()).hexdigest()
+
+
+def environment_paths(search_paths: Sequence[str | Path]) -> List[Path]:
+    """
+    Get the search paths that belong to the Python environment (the standard library and installed distributions)
+    rather than to the analyzed project
+    """
+    prefixes = {Path(prefix).absolute() for prefix in (sys.prefix, sys.base_prefix, sys.exec_prefix)}
+    env_paths: List[Path] = []
+
+    for search_path in search_paths:
+        search_path = Path(search_path or os.curdir).absolute()
+
+        if {"site-packages", "dist-packages"} & set(search_path.parts) or any(
+            search_path.is_relative_to(prefix) for prefix in prefixes
+        ):
+            env_paths.append(search_path)
+
+    return env_paths
+
+
+def site_fingerprint(env_paths: Sequence[Path]) -> str:
+    """
+    Fingerprint the interpreter and the installed distributions by mtimes of the environment paths
+    and their .dist-info entries, so it changes whenever packages are installed, upgraded or removed
+    """
+    states: List[object] = [sys.version, sys.executable]
+
+    for env_path in env_paths:
+        try:
+            with os.scandir(env_path) as entries:
+                distributions = sorted(
+                    (entry.name, entry.stat().st_mtime_ns)
+                    for entry in entries
+                    if entry.name.endswith(DISTRIBUTION_SUFFIXES)
+                )
+
+            states.append([str(env_path), env_path.stat().st_mtime_ns, distributions])
+        except OSError:
+            states.append([str(env_path), None])
+
+    return hashlib.sha256(json.dumps(states).encode()).hexdigest()
@@ -0,0 +1,157 @@
+import dataclasses
+import heapq
+import logging
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Final, Iterable, List, Optional, Pattern, Set, Tuple
+
+from yew.kinds import ImportKind, kinds_mask
+
+if TYPE_CHECKING:
+    from yew.collection import ImportContext, ModGraph, Module
+
+logger = logging.getLogger(__name__)
+
+# e.g. "import time:       332 |        954 |   _frozen_importlib_external" (nesting is indented by 2 spaces)
+IMPORTTIME_LINE: Final[Pattern[str]] = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s?(\s*)(\S+)\s*$")
+
+HEAVIEST_LIMIT: Final[int] = 5
+
+# imports executed when the importing module is imported (lazy and TYPE_CHECKING-only ones are not)
+STARTUP_KINDS_MASK: Final[int] = kinds_mask((ImportKind.EAGER, ImportKind.OPTIONAL))
+
+
+@dataclasses.dataclass(frozen=True)
+class ImportTime:
+    """
+    Time it took to import the module in microseconds, alone and together with modules it has imported first
+    """
+
+    self_us: int
+    cumulative_us: int
+    depth: int = 0  # how deep in the import chain the module has been imported first
+
+
+@dataclasses.dataclass(frozen=True)
+class LazyImportCandidate:
+    """
+    An eager import that pulls in costly modules and could be deferred to where it's used
+    """
+
+    module: "Module"
+    import_context: "ImportContext"
+    cost_us: int
+    heaviest: Tuple[Tuple["Module", int], ...]  # the costliest modules pulled in by the import
+
+
+def parse_importtime(lines: Iterable[str]) -> Dict[str, ImportTime]:
+    """
+    Parse `python -X importtime` output. Unrelated lines (e.g. the rest of stderr) are skipped.
+
+    If the log covers several interpreter runs, the slowest import of each module is kept
+    """
+    import_times: Dict[str, ImportTime] = {}
+
+    for line in lines:
+        if not (match := IMPORTTIME_LINE.match(line)):
+            continue
+
+        self_us, cumulative_us, indent, mod_name = match.groups()
+        import_time = ImportTime(int(self_us), int(cumulative_us), depth=len(indent) // 2)
+
+        prev_import_time = import_times.get(mod_name)
+
+        if prev_import_time and prev_import_time.cumulative_us >= import_time.cumulative_us:
+            continue
+
+        import_times[mod_name] = import_time
+
+    return import_times
+
+
+def load_importtime(path: Path) -> Dict[str, ImportTime]:
+    """
+    Parse `python -X importtime` output saved to the file (e.g. `python -X importtime -c "import app" 2> import.log`)
+    """
+    with open(path, encoding="utf-8", errors="replace") as log:
+        return parse_importtime(log)
+
+
+def lazy_import_candidates(
+    graph: "ModGraph",
+    *,
+    min_cost_us: int = 0,
+    limit: Optional[int] = None,
+) -> List[LazyImportCandidate]:
+    """
+    Rank imports of first-party modules by the import time of everything they pull in transitively.
+
+    The cost of an import counts first-party modules by their self time (their own imports are in the graph)
+    and other modules by their cumulative time (their imports are not). Only eager and optional imports are followed,
+    as lazy and TYPE_CHECKING-only ones don't run at import time. Build the graph with third-party modules
+    included, otherwise the heaviest imports are filtered out before they get into the graph
+    """
+    if not graph._import_times:
+        logger.warning("No import times have been attached to the graph, see ModGraph.set_import_times()")
+        return []
+
+    costs: Dict[int, Tuple[int, List[Tuple[int, int]]]] = {}
+    candidates: List[LazyImportCandidate] = []
+
+    for node_id in sorted(graph._node_ids.values()):
+        if not graph._added[node_id]:
+            continue
+
+        for edge_id in graph._filter_kinds(graph._out_edge_ids(node_id), STARTUP_KINDS_MASK):
+            imported_id = graph._edge_dst[edge_id]
+
+            if (cost := costs.get(imported_id)) is None:
+                cost = costs[imported_id] = _import_cost(graph, imported_id)
+
+            total_us, heaviest = cost
+
+            if not total_us or total_us < min_cost_us:
+                continue
+
+            candidates.append(
+                LazyImportCandidate(
+                    module=graph._view(node_id),
+                    import_context=graph._import_context(edge_id, imported_id),
+                    cost_us=total_us,
+                    heaviest=tuple((graph._view(heavy_id), heavy_us) for heavy_us, heavy_id in heaviest),
+                )
+            )
+
+    candidates.sort(
+        key=lambda candidate: (-candidate.cost_us, str(candidate.module.mod_name), candidate.import_context.lineno)
+    )
+
+    return candidates[:limit] if limit is not None else candidates
+
+
+def _import_cost(graph: "ModGraph", node_id: int) -> Tuple[int, List[Tuple[int, int]]]:
+    """
+    Estimate how long it takes to import the module with everything it imports transitively
+    """
+    node_ids = {node_id, *graph._closure_ids("dependencies", [node_id], kinds=STARTUP_KINDS_MASK)}
+    names: Set[str] = {graph._names[pulled_id] for pulled_id in node_ids}
+
+    costs: List[Tuple[int, int]] = []
+
+    for pulled_id in node_ids:
+        if (import_time := graph._import_times.get(pulled_id)) is None:
+            continue
+
+        if graph._added[pulled_id]:
+            costs.append((import_time.self_us, pulled_id))
+            continue
+
+        parent_name = graph._names[pulled_id].rpartition(".")[0]
+
+        if parent_name and parent_name in names:
+            # the cumulative time of the parent package usually includes its submodules already
+            continue
+
+        costs.append((import_time.cumulative_us, pulled_id))
+
+    return sum(cost_us for cost_us, _ in costs), heapq.nlargest(HEAVIEST_LIMIT, costs)
@@ -0,0 +1,43 @@
+import ast
+import enum
+import sys
+from typing import Collection, Final, FrozenSet, Optional
+
+
+class ImportKind(enum.IntEnum):
+    """
+    When the import is executed. Kinds are ordered, so nested blocks take the most specific one
+    (e.g. a try block in a function is lazy rather than optional)
+    """
+
+    EAGER = 0  # on module import
+    OPTIONAL = 1  # on module import, but failures are handled (e.g. `try: import x except ImportError: ...`)
+    LAZY = 2  # when a function is called
+    TYPE_CHECKING = 3  # never at runtime (under `if TYPE_CHECKING:`)
+
+
+ALL_KINDS: Final[FrozenSet[ImportKind]] = frozenset(ImportKind)
+ALL_KINDS_MASK: Final[int] = (1 << len(ImportKind)) - 1
+
+# try statements (except* blocks are available since Python 3.11)
+if sys.version_info >= (3, 11):
+    TryNode = ast.Try | ast.TryStar
+    TRY_NODES: Final = (ast.Try, ast.TryStar)
+else:
+    TryNode = ast.Try
+    TRY_NODES: Final = (ast.Try,)
+
+
+def kinds_mask(kinds: Optional[Collection[ImportKind]]) -> int:
+    """
+    Pack import kinds into a bitmask (all kinds if None)
+    """
+    if kinds is None:
+        return ALL_KINDS_MASK
+
+    mask = 0
+
+    for kind in kinds:
+        mask |= 1 << kind
+
+    return mask
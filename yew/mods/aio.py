@@ -0,0 +1,180 @@
+import asyncio
+import logging
+from functools import partial
+from itertools import chain, islice
+from pathlib import Path
+from typing import AsyncIterator, Collection, Final, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from yew.collection import ImportKind, ModGraph, ModName, Module
+from yew.mods.cache import ParseCache
+from yew.mods.filters import ImportFilter
+from yew.mods.graph import (
+    ModuleFileBatch,
+    ParsedModuleFile,
+    build_classifier,
+    build_resolver,
+    cached_imports,
+    decode_record,
+    discover_module_files,
+    filter_parsed_file,
+    parse_module_files,
+)
+from yew.mods.parsers import ModParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY: Final[int] = 8
+DEFAULT_BATCH_SIZE: Final[int] = 16
+
+
+def _discover_batch(
+    module_files: Iterator[Tuple[ModName, Path]],
+    batch_size: int,
+    mod_parser: ModParser,
+    mod_filter: ImportFilter,
+    cache: Optional[ParseCache],
+) -> Tuple[List[ParsedModuleFile], ModuleFileBatch]:
+    """
+    Discover up to batch_size more files, resolving the cached ones right away and batching the rest for parsing
+    """
+    cached_files: List[ParsedModuleFile] = []
+    batch: ModuleFileBatch = []
+
+    for mod_name, file_path in islice(module_files, batch_size):
+        if (cached_file := cached_imports(cache, mod_parser, mod_name, file_path, None)) is not None:
+            cached_files.append(filter_parsed_file(mod_filter, cached_file))
+        else:
+            batch.append((str(mod_name), str(file_path)))
+
+    return cached_files, batch
+
+
+async def _parse_batch(
+    batch: ModuleFileBatch,
+    mod_parser: ModParser,
+    mod_filter: ImportFilter,
+    cache: Optional[ParseCache],
+) -> List[ParsedModuleFile]:
+    records = await asyncio.to_thread(parse_module_files, mod_parser, batch)
+    return [filter_parsed_file(mod_filter, decode_record(record, cache)) for record in records]
+
+
+async def aiter_mod_graph(
+    packages: Sequence[Path],
+    *,
+    include_external: bool = False,
+    include_third_party: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache: Optional[ParseCache] = None,
+    find_spec_fallback: bool = False,
+) -> AsyncIterator[ParsedModuleFile]:
+    """
+    Asynchronously yield parsed module files as they are ready (that doubles as the build progress)
+
+    Files are discovered, read and parsed in batches off the event loop. Discovery stays ahead of parsing
+    by at most `concurrency` batches, so memory is bounded regardless of the tree size.
+    Cancelling the consumer cancels all batches that are in flight
+    """
+    mod_resolver = build_resolver(packages, find_spec_fallback=find_spec_fallback)
+    mod_parser = ModParser(mod_resolver)
+    mod_filter = ImportFilter(
+        include_external=include_external,
+        include_third_party=include_third_party,
+        classifier=build_classifier(packages),
+    )
+    module_files = discover_module_files(packages, mod_resolver, None)
+
+    pending: Set["asyncio.Task[List[ParsedModuleFile]]"] = set()
+    discovering = True
+
+    try:
+        while discovering or pending:
+            if discovering and len(pending) < concurrency:
+                cached_files, batch = await asyncio.to_thread(
+                    _discover_batch, module_files, batch_size, mod_parser, mod_filter, cache
+                )
+                discovering = bool(cached_files or batch)
+
+                for parsed_file in cached_files:
+                    yield parsed_file
+
+                if batch:
+                    pending.add(asyncio.create_task(_parse_batch(batch, mod_parser, mod_filter, cache)))
+
+                continue
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for parsed_file in chain.from_iterable(task.result() for task in done):
+                yield parsed_file
+    finally:
+        for task in pending:
+            task.cancel()
+
+        # let the cancelled batches unwind before the generator is closed
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if cache:
+        await asyncio.to_thread(cache.save)
+
+
+async def abuild_mod_graph(
+    packages: Sequence[Path],
+    *,
+    include_external: bool = False,
+    include_third_party: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    cache: Optional[ParseCache] = None,
+    find_spec_fallback: bool = False,
+) -> ModGraph:
+    """
+    Build a module import graph without blocking the event loop (see build_mod_graph() for the options)
+    """
+    mod_graph = ModGraph()
+
+    async for mod_name, file_path, imported_mods, unresolved in aiter_mod_graph(
+        packages,
+        include_external=include_external,
+        include_third_party=include_third_party,
+        concurrency=concurrency,
+        batch_size=batch_size,
+        cache=cache,
+        find_spec_fallback=find_spec_fallback,
+    ):
+        mod_graph.add(mod_name, file_path, imported_mods, unresolved)
+
+    return mod_graph
+
+
+async def adependents(
+    mod_graph: ModGraph,
+    targets: Iterable[str | Path | ModName],
+    *,
+    depth: Optional[int] = None,
+    first_party_only: bool = False,
+    kinds: Optional[Collection[ImportKind]] = None,
+) -> Set[Module]:
+    """
+    Find modules that transitively import any of the targets off the event loop
+    """
+    return await asyncio.to_thread(
+        partial(mod_graph.dependents, list(targets), depth=depth, first_party_only=first_party_only, kinds=kinds)
+    )
+
+
+async def adependencies(
+    mod_graph: ModGraph,
+    targets: Iterable[str | Path | ModName],
+    *,
+    depth: Optional[int] = None,
+    first_party_only: bool = False,
+    kinds: Optional[Collection[ImportKind]] = None,
+) -> Set[Module]:
+    """
+    Find modules that are transitively imported by any of the targets off the event loop
+    """
+    return await asyncio.to_thread(
+        partial(mod_graph.dependencies, list(targets), depth=depth, first_party_only=first_party_only, kinds=kinds)
+    )
@@ -0,0 +1,373 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Final, List, Literal, Optional, Sequence, Set, Tuple, cast
+
+from yew.collection import ModName
+from yew.env import env_fingerprint, environment_paths, site_fingerprint
+
+if TYPE_CHECKING:
+    from yew.mods.parsers import ImportStatement
+    from yew.mods.resolvers import Resolution
+
+logger = logging.getLogger(__name__)
+
+CachedModuleFile = Tuple[ModName, List["ImportStatement"]]
+# (origin, search locations), None if the name is not a module, False if it has not been found statically
+EncodedResolution = Tuple[str, List[str]] | None | Literal[False]
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """
+    Cache effectiveness counters collected during a single build
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __repr__(self) -> str:
+        return f"CacheStats(hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+
+
+class ParseCache:
+    """
+    Persistent on-disk cache of parsed module imports.
+
+    Entries are keyed by the file path and validated by mtime, size and content hash.
+    The whole cache is dropped when the interpreter or sys.path fingerprint changes.
+
+    Import statements are cached as written rather than resolved, since what they resolve to depends on other files
+    (e.g. `from pkg import helpers` imports the pkg.helpers module only once it exists), so they are resolved
+    again on every build
+    """
+
+    VERSION: Final[int] = 4
+    FILE_NAME: Final[str] = "parse-cache.json"
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = cache_dir
+        self._fingerprint = env_fingerprint()
+
+        self._entries: Dict[str, Dict[str, Any]] | None = None
+        self._touched: Set[str] = set()
+
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def cache_file(self) -> Path:
+        return self._cache_dir / self.FILE_NAME
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
+    def get(self, file_path: Path) -> Optional[CachedModuleFile]:
+        """
+        Get cached import statements of the file if it has not changed since it was cached
+        """
+        entries = self._load()
+        key = str(file_path)
+
+        entry = entries.get(key)
+
+        if entry is None:
+            self._count_miss()
+            return None
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self._evict(key)
+            self._count_miss()
+            return None
+
+        if stat.st_size != entry["size"]:
+            self._evict(key)
+            self._count_miss()
+            return None
+
+        if stat.st_mtime_ns != entry["mtime_ns"]:
+            # the file was touched, but its content may still be the same (e.g. after git checkout)
+            if self.hash_content(file_path.read_bytes()) != entry["hash"]:
+                self._evict(key)
+                self._count_miss()
+                return None
+
+            entry["mtime_ns"] = stat.st_mtime_ns
+
+        with self._lock:
+            self._touched.add(key)
+            self._stats.hits += 1
+
+        # JSON turns statement tuples into lists
+        statements = cast(List["ImportStatement"], [tuple(statement) for statement in entry["statements"]])
+
+        return ModName.from_str(entry["mod_name"]), statements
+
+    def put(
+        self,
+        file_path: Path,
+        mod_name: ModName,
+        statements: List["ImportStatement"],
+        *,
+        content_hash: str,
+        mtime_ns: int,
+        size: int,
+    ) -> None:
+        """
+        Cache import statements of the file. The content hash must be computed via ParseCache.hash_content()
+        and the mtime and size must be taken before the content was read, so a later edit is never hidden
+        """
+        entries = self._load()
+        key = str(file_path)
+
+        entry = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "hash": content_hash,
+            "mod_name": str(mod_name),
+            "statements": statements,
+        }
+
+        with self._lock:
+            entries[key] = entry
+            self._touched.add(key)
+
+    def save(self) -> None:
+        """
+        Persist the cache, evicting entries of files that do not exist anymore
+        """
+        entries = self._load()
+
+        for key in list(entries):
+            if key not in self._touched and not os.path.exists(key):
+                self._evict(key)
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        payload = {
+            "version": self.VERSION,
+            "fingerprint": self._fingerprint,
+            "entries": entries,
+        }
+
+        # write to a temp file first, so concurrent builds never read a partially written cache
+        tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp_file, self.cache_file)
+
+        logger.info(f"Parse cache saved to {self.cache_file}: {self._stats}")
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+
+        with self._lock:
+            if self._entries is not None:
+                return self._entries
+
+            self._entries = self._read()
+
+        return self._entries
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            payload = json.loads(self.cache_file.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read the parse cache at {self.cache_file}, ignoring it: {e}")
+            return {}
+
+        entries: Dict[str, Dict[str, Any]] = payload.get("entries", {})
+
+        if payload.get("version") != self.VERSION or payload.get("fingerprint") != self._fingerprint:
+            logger.info("Python environment has changed since the parse cache was built, invalidating it")
+            self._stats.evictions += len(entries)
+
+            return {}
+
+        return entries
+
+    def _evict(self, key: str) -> None:
+        assert self._entries is not None
+
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats.evictions += 1
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self._stats.misses += 1
+
+    @staticmethod
+    def hash_content(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+
+class ResolutionCache:
+    """
+    Persistent on-disk cache of module resolutions in the Python environment (the standard library
+    and installed distributions).
+
+    Maps dotted names to their origins and search locations, or to None if the name is not a module
+    (i.e. an object is imported from its parent module). Resolutions of first-party modules are never cached.
+    The whole cache is dropped when the interpreter changes or distributions are installed, upgraded or removed
+    """
+
+    VERSION: Final[int] = 1
+    FILE_NAME: Final[str] = "resolution-cache.json"
+
+    def __init__(self, cache_dir: Path, search_paths: Optional[Sequence[str | Path]] = None) -> None:
+        self._cache_dir = cache_dir
+        self._env_paths = environment_paths(sys.path if search_paths is None else search_paths)
+        self._fingerprint = site_fingerprint(self._env_paths)
+
+        self._entries: Dict[str, EncodedResolution] | None = None
+        self._new_entries: Dict[str, EncodedResolution] = {}
+
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    @property
+    def cache_file(self) -> Path:
+        return self._cache_dir / self.FILE_NAME
+
+    @property
+    def env_paths(self) -> List[Path]:
+        return self._env_paths
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
+    def in_environment(self, path: Path) -> bool:
+        """
+        Check whether the path belongs to the Python environment, so its resolution can be cached
+        """
+        return any(path.is_relative_to(env_path) for env_path in self._env_paths)
+
+    def get(self, mod_name: str, *, find_spec_fallback: bool = False) -> Optional["Resolution"]:
+        """
+        Get the cached resolution of the module (None if the name is known not to be a module).
+        Raise KeyError if the name has not been resolved before (or only statically for the find_spec() fallback)
+        """
+        entries = self._load()
+
+        if mod_name not in entries or (entries[mod_name] is False and find_spec_fallback):
+            with self._lock:
+                self._stats.misses += 1
+
+            raise KeyError(mod_name)
+
+        with self._lock:
+            self._stats.hits += 1
+
+        if not (entry := entries[mod_name]):
+            return None
+
+        origin, search_locations = entry
+
+        return Path(origin), [Path(location) for location in search_locations]
+
+    def put(self, mod_name: str, resolution: Optional["Resolution"], *, find_spec_fallback: bool = False) -> None:
+        entry: EncodedResolution = None if find_spec_fallback else False
+
+        if resolution is not None:
+            origin, search_locations = resolution
+            entry = str(origin), [str(location) for location in search_locations]
+
+        self.update({mod_name: entry})
+
+    def update(self, entries: Dict[str, EncodedResolution]) -> None:
+        """
+        Add resolutions of other processes (see pop_new_entries())
+        """
+        cached_entries = self._load()
+
+        with self._lock:
+            cached_entries.update(entries)
+            self._new_entries.update(entries)
+
+    def pop_new_entries(self) -> Dict[str, EncodedResolution]:
+        """
+        Get resolutions added since the last call, so worker processes can send them back to the main one
+        """
+        with self._lock:
+            new_entries, self._new_entries = self._new_entries, {}
+
+        return new_entries
+
+    def save(self) -> None:
+        """
+        Persist the cache if anything has been added to it
+        """
+        if not self._new_entries and self.cache_file.exists():
+            return
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        payload = {
+            "version": self.VERSION,
+            "fingerprint": self._fingerprint,
+            "entries": self._load(),
+        }
+
+        # write to a temp file first, so concurrent builds never read a partially written cache
+        tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp_file, self.cache_file)
+
+        self._new_entries = {}
+
+        logger.info(f"Resolution cache saved to {self.cache_file}: {self._stats}")
+
+    def _load(self) -> Dict[str, EncodedResolution]:
+        if self._entries is not None:
+            return self._entries
+
+        with self._lock:
+            if self._entries is not None:
+                return self._entries
+
+            self._entries = self._read()
+
+        return self._entries
+
+    def _read(self) -> Dict[str, EncodedResolution]:
+        try:
+            payload = json.loads(self.cache_file.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read the resolution cache at {self.cache_file}, ignoring it: {e}")
+            return {}
+
+        entries: Dict[str, EncodedResolution] = payload.get("entries", {})
+
+        if payload.get("version") != self.VERSION or payload.get("fingerprint") != self._fingerprint:
+            logger.info("Python environment has changed since the resolution cache was built, invalidating it")
+            self._stats.evictions += len(entries)
+
+            return {}
+
+        return entries
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # worker processes get the loaded entries, but not the lock
+        state = self.__dict__.copy()
+        del state["_lock"]
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
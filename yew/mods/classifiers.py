@@ -0,0 +1,134 @@
+import logging
+import site
+import sys
+import sysconfig
+from importlib import metadata
+from pathlib import Path
+from typing import Collection, Dict, Generic, List, Mapping, Optional, Sequence, TypeVar
+
+from yew.collection import Classification, ModCategory, ModName
+from yew.mods.resolvers import BUILTIN_ORIGIN
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _TrieNode(Generic[T]):
+    __slots__ = ("children", "value")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode[T]] = {}
+        self.value: Optional[T] = None
+
+
+class PathTrie(Generic[T]):
+    """
+    Map directories to values and find the value of the closest directory that contains the path
+    """
+
+    def __init__(self) -> None:
+        self._root: _TrieNode[T] = _TrieNode()
+
+    def insert(self, path: Path, value: T) -> None:
+        node = self._root
+
+        for part in path.parts:
+            node = node.children.setdefault(part, _TrieNode())
+
+        node.value = value
+
+    def longest_prefix(self, path: Path) -> Optional[T]:
+        node = self._root
+        value = node.value
+
+        for part in path.parts:
+            if (child := node.children.get(part)) is None:
+                break
+
+            node = child
+
+            if node.value is not None:
+                value = node.value
+
+        return value
+
+
+class ModClassifier:
+    """
+    Classify imported modules as built-in, stdlib, third-party, first-party or unresolved.
+
+    Module locations are matched against the stdlib, site-packages and first-party directories with a path trie,
+    so the innermost directory wins (e.g. site-packages nested in the stdlib directory).
+    A top-level package lives in a single place, so classifications are memoized per top-level name
+    """
+
+    def __init__(
+        self,
+        first_party_paths: Collection[Path] = (),
+        *,
+        site_paths: Optional[Sequence[str | Path]] = None,
+        stdlib_paths: Optional[Sequence[str | Path]] = None,
+    ) -> None:
+        if site_paths is None:
+            site_paths = [*site.getsitepackages()]
+
+            if site.ENABLE_USER_SITE:
+                site_paths.append(site.getusersitepackages())
+
+        if stdlib_paths is None:
+            stdlib_paths = [sysconfig.get_path("stdlib"), sysconfig.get_path("platstdlib")]
+
+        self._trie: PathTrie[ModCategory] = PathTrie()
+
+        for stdlib_path in stdlib_paths:
+            self._trie.insert(Path(stdlib_path).absolute(), ModCategory.STDLIB)
+
+        for site_path in site_paths:
+            self._trie.insert(Path(site_path).absolute(), ModCategory.THIRD_PARTY)
+
+        # inserted last, so analyzed packages that are installed into site-packages are still first-party
+        for first_party_path in first_party_paths:
+            self._trie.insert(first_party_path.absolute(), ModCategory.FIRST_PARTY)
+
+        self._classified: Dict[str, Classification] = {}
+        self._packages_distributions: Optional[Mapping[str, List[str]]] = None
+
+    def classify(self, mod_name: ModName, path: Path) -> Classification:
+        """
+        Classify the module given the path it has been resolved to
+        """
+        top_level = mod_name.parts[0]
+
+        if (classification := self._classified.get(top_level)) is None:
+            classification = self._classify(top_level, path)
+            self._classified[top_level] = classification
+
+            logger.debug(f"classified {top_level} as {classification.category.name.lower()}")
+
+        return classification
+
+    def _classify(self, top_level: str, path: Path) -> Classification:
+        if top_level in sys.builtin_module_names or path == BUILTIN_ORIGIN:
+            return Classification(ModCategory.BUILTIN)
+
+        category = self._trie.longest_prefix(path) if path.is_absolute() else None
+
+        if category is None:
+            # e.g. frozen modules
+            category = ModCategory.STDLIB if top_level in sys.stdlib_module_names else ModCategory.UNRESOLVED
+
+        if category == ModCategory.THIRD_PARTY:
+            return Classification(category, distribution=self._distribution(top_level))
+
+        return Classification(category)
+
+    def _distribution(self, top_level: str) -> Optional[str]:
+        if self._packages_distributions is None:
+            # scanning installed distributions is slow, so it's done once and only if there are third-party imports
+            self._packages_distributions = metadata.packages_distributions()
+
+        if distributions := self._packages_distributions.get(top_level):
+            return distributions[0]
+
+        return None
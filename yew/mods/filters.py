@@ -1,39 +1,50 @@
 import logging
-import site
-import sys
-from pathlib import Path
-from typing import Set
+from typing import Final, FrozenSet, Optional, Set
 
-from yew.collection import DirectImport
+from yew.collection import DirectImport, ModCategory
+from yew.mods.classifiers import ModClassifier
 
 logger = logging.getLogger(__name__)
 
+THIRD_PARTY_CATEGORIES: Final[FrozenSet[ModCategory]] = frozenset(
+    (ModCategory.BUILTIN, ModCategory.STDLIB, ModCategory.THIRD_PARTY)
+)
+
 
 class ImportFilter:
-    def __init__(self, include_external: bool = False, include_third_party: bool = False) -> None:
+    def __init__(
+        self,
+        include_external: bool = False,
+        include_third_party: bool = False,
+        classifier: Optional[ModClassifier] = None,
+    ) -> None:
         self._include_external = include_external
         self._include_third_party = include_third_party
+        self._classifier = classifier or ModClassifier()
 
     def filter(self, imports: Set[DirectImport]) -> Set[DirectImport]:
-        return {direct_import for direct_import in imports if not self._is_third_party(direct_import)}
-
-    def _is_third_party(self, direct_import: DirectImport) -> bool:
-        if self._include_third_party:
-            return False
-
-        mod_name_str = str(direct_import.mod_name)
-
-        if mod_name_str in sys.builtin_module_names:
-            logger.debug(f"skipping {mod_name_str} as a built-in module")
-            return True
-
-        if mod_name_str in sys.stdlib_module_names:
-            logger.debug(f"skipping {mod_name_str} as a stdlib module")
-            return True
-
-        for site_path in site.getsitepackages():
-            if Path(site_path) in direct_import.path.parents:
-                logger.debug(f"skipping {mod_name_str} as a third-party module")
-                return True
-
-        return False
+        """
+        Classify imported modules and drop built-in, stdlib and third-party ones unless they are included
+        """
+        classify = self._classifier.classify
+        filtered_imports: Set[DirectImport] = set()
+
+        for direct_import in imports:
+            classification = classify(direct_import.mod_name, direct_import.path)
+
+            if not self._include_third_party and classification.category in THIRD_PARTY_CATEGORIES:
+                continue
+
+            filtered_imports.add(
+                DirectImport(
+                    mod_name=direct_import.mod_name,
+                    path=direct_import.path,
+                    lineno=direct_import.lineno,
+                    col_offset=direct_import.col_offset,
+                    kind=direct_import.kind,
+                    symbols=direct_import.symbols,
+                    classification=classification,
+                )
+            )
+
+        return filtered_imports
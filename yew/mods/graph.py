@@ -1,18 +1,513 @@
 import logging
-import tokenize
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import List, Optional, Sequence, Set, Tuple
+from typing import Callable, Dict, Final, FrozenSet, Generator, Iterator, List, Literal, Optional, Sequence, Set, Tuple
 
-from yew.collection import DirectImport, ModGraph, ModName
+from yew.collection import DirectImport, ImportKind, ModGraph, ModName, Module
+from yew.mods.cache import EncodedResolution, ParseCache, ResolutionCache
+from yew.mods.classifiers import ModClassifier
 from yew.mods.filters import ImportFilter
 from yew.mods.finders import ModFinder
-from yew.mods.parsers import ModParser
+from yew.mods.parsers import ImportStatement, ModParser
+from yew.mods.resolvers import ModResolver
+from yew.mods.stats import BuildStats, FileMetrics
 
-ParsedModuleFile = Tuple[ModName, Path, Set[DirectImport]]
+# module name, path, imports and names of modules that the imports look for, but that have not been found
+ParsedModuleFile = Tuple[ModName, Path, Set[DirectImport], FrozenSet[str]]
+
+# Compact picklable records that worker processes send back instead of ModName and Path objects
+ImportRecord = Tuple[str, str, int, int, int, List[str]]  # (mod_name, path, lineno, col_offset, kind, symbols)
+# (file_path, mod_name, content_hash, mtime_ns, size, import statements to cache, resolved imports,
+# unresolved module names, metrics if timed)
+ModuleRecord = Tuple[
+    str, str, str, int, int, List[ImportStatement], List[ImportRecord], List[str], Optional[FileMetrics]
+]
+ModuleFileBatch = List[Tuple[str, str]]  # [(mod_name, file_path), ...]
+# records of the batch and the module resolutions that worker processes have added to their copies of the cache
+ParsedBatch = Tuple[List[ModuleRecord], Dict[str, EncodedResolution]]
+
+ExecutorMode = Literal["thread", "process", "auto"]
+
+# the process pool pays off only when there is enough parsing to amortize worker startup
+AUTO_PROCESS_MIN_FILES: Final[int] = 256
+PROCESS_BATCH_SIZE: Final[int] = 32
 
 logger = logging.getLogger(__name__)
 
+_worker_parser: Optional[ModParser] = None
+
+
+def parse_module_file(
+    mod_parser: ModParser,
+    mod_name: ModName,
+    file_path: Path,
+    *,
+    timed: bool = False,
+) -> Optional[ModuleRecord]:
+    """
+    Read and parse an individual module file into a compact import record (measuring each step if timed)
+    """
+    logger.debug(f"Parsing {file_path} file")
+
+    if timed:
+        return _timed_parse_module_file(mod_parser, mod_name, file_path)
+
+    # stat before reading: if the file changes in between, the cached mtime is stale and the content gets rehashed
+    stat = file_path.stat()
+    source = file_path.read_bytes()
+
+    try:
+        statements = mod_parser.parse_statements(mod_parser.parse_tree(source))
+    except SyntaxError as e:
+        logger.warning(f"Syntax error in {file_path} file at {e.lineno}:{e.offset}: {e.msg}")
+        return None
+
+    imported_mods = mod_parser.resolve_statements(mod_name, statements)
+    unresolved = mod_parser.unresolved_names(mod_name, statements, imported_mods)
+
+    return _module_record(mod_name, file_path, source, stat, statements, imported_mods, unresolved)
+
+
+def _timed_parse_module_file(mod_parser: ModParser, mod_name: ModName, file_path: Path) -> Optional[ModuleRecord]:
+    counters = mod_parser.resolver.counters()
+    started_at = time.perf_counter()
+
+    stat = file_path.stat()
+    source = file_path.read_bytes()
+    read_at = time.perf_counter()
+
+    try:
+        ast_tree = mod_parser.parse_tree(source)
+    except SyntaxError as e:
+        logger.warning(f"Syntax error in {file_path} file at {e.lineno}:{e.offset}: {e.msg}")
+        return None
+
+    parsed_at = time.perf_counter()
+    statements = mod_parser.parse_statements(ast_tree)
+    imported_mods = mod_parser.resolve_statements(mod_name, statements)
+    unresolved = mod_parser.unresolved_names(mod_name, statements, imported_mods)
+    resolved_at = time.perf_counter()
+
+    new_counters = mod_parser.resolver.counters()
+    metrics: FileMetrics = (
+        f"{os.getpid()}/{threading.current_thread().name}",
+        read_at - started_at,
+        parsed_at - read_at,
+        resolved_at - parsed_at,
+        new_counters.get("find_spec_calls", 0) - counters.get("find_spec_calls", 0),
+        new_counters.get("resolution_failures", 0) - counters.get("resolution_failures", 0),
+    )
+
+    return _module_record(mod_name, file_path, source, stat, statements, imported_mods, unresolved, metrics)
+
+
+def _module_record(
+    mod_name: ModName,
+    file_path: Path,
+    source: bytes,
+    stat: os.stat_result,
+    statements: List[ImportStatement],
+    imported_mods: Set[DirectImport],
+    unresolved: FrozenSet[str],
+    metrics: Optional[FileMetrics] = None,
+) -> ModuleRecord:
+    import_records: List[ImportRecord] = [
+        (
+            str(direct_import.mod_name),
+            str(direct_import.path),
+            direct_import.lineno,
+            direct_import.col_offset,
+            int(direct_import.kind),
+            sorted(direct_import.symbols),
+        )
+        for direct_import in imported_mods
+    ]
+
+    content_hash = ParseCache.hash_content(source)
+
+    return (
+        str(file_path),
+        str(mod_name),
+        content_hash,
+        stat.st_mtime_ns,
+        stat.st_size,
+        statements,
+        import_records,
+        sorted(unresolved),
+        metrics,
+    )
+
+
+def _init_worker(resolver: ModResolver) -> None:
+    global _worker_parser
+
+    _worker_parser = ModParser(resolver)
+
+
+def parse_module_files(
+    mod_parser: ModParser,
+    module_files: ModuleFileBatch,
+    *,
+    timed: bool = False,
+) -> List[ModuleRecord]:
+    """
+    Parse a batch of module files skipping ones with syntax errors
+    """
+    records: List[ModuleRecord] = []
+
+    for mod_name, file_path in module_files:
+        if record := parse_module_file(mod_parser, ModName.from_str(mod_name), Path(file_path), timed=timed):
+            records.append(record)
+
+    return records
+
+
+def _parse_module_batch(module_files: ModuleFileBatch, *, timed: bool = False) -> ParsedBatch:
+    """
+    Parse a batch of module files in a worker process
+    """
+    assert _worker_parser is not None
+
+    records = parse_module_files(_worker_parser, module_files, timed=timed)
+    resolution_cache = _worker_parser.resolver.cache
+
+    return records, resolution_cache.pop_new_entries() if resolution_cache else {}
+
+
+def _parse_module_files_batch(
+    mod_parser: ModParser,
+    module_files: ModuleFileBatch,
+    *,
+    timed: bool = False,
+) -> ParsedBatch:
+    """
+    Parse a batch of module files in a thread (the resolution cache is shared, so there are no resolutions to add)
+    """
+    return parse_module_files(mod_parser, module_files, timed=timed), {}
+
+
+def decode_record(record: ModuleRecord, cache: Optional[ParseCache]) -> ParsedModuleFile:
+    """
+    Turn the module record back into the module name, path, imports and unresolved names
+    (caching the import statements if the cache is given)
+    """
+    file_path_str, mod_name_str, content_hash, mtime_ns, size, statements, import_records, unresolved, _ = record
+
+    file_path, mod_name = Path(file_path_str), ModName.from_str(mod_name_str)
+
+    imported_mods = {
+        DirectImport(
+            mod_name=ModName.from_str(imported_name),
+            path=Path(path),
+            lineno=lineno,
+            col_offset=col_offset,
+            kind=ImportKind(kind),
+            symbols=frozenset(symbols),
+        )
+        for imported_name, path, lineno, col_offset, kind, symbols in import_records
+    }
+
+    if cache:
+        cache.put(file_path, mod_name, statements, content_hash=content_hash, mtime_ns=mtime_ns, size=size)
+
+    return mod_name, file_path, imported_mods, frozenset(unresolved)
+
+
+def _first_party_roots(mod_graph: ModGraph) -> Set[Path]:
+    """
+    Find directories that top-level packages of the graph modules are importable from
+    """
+    roots: Set[Path] = set()
+
+    for module in mod_graph:
+        mod_parts = module.mod_name.parts
+
+        if len(mod_parts) == 1:
+            # top-level packages are at <root>/<package>/__init__.py and top-level modules are at <root>/<module>.py
+            roots.add(module.file_path.parents[1 if module.file_path.stem == "__init__" else 0])
+
+    return roots
+
+
+def _package_root(package: Path) -> Path:
+    """
+    Find the directory the top-level package of the given one is importable from
+    """
+    package_root = package.absolute()
+
+    while (package_root / "__init__.py").exists():
+        package_root = package_root.parent
+
+    return package_root
+
+
+def build_resolver(
+    packages: Sequence[Path],
+    *,
+    find_spec_fallback: bool = False,
+    resolution_cache: Optional[ResolutionCache] = None,
+) -> ModResolver:
+    """
+    Set up the module resolver for analyzing the given packages
+    """
+    mod_resolver = ModResolver(find_spec_fallback=find_spec_fallback, cache=resolution_cache)
+
+    for package in packages:
+        # modules may be imported before they are discovered, so they must be resolvable from the package roots
+        mod_resolver.add_search_path(_package_root(package))
+
+    return mod_resolver
+
+
+def build_classifier(packages: Sequence[Path]) -> ModClassifier:
+    """
+    Set up the module classifier that treats modules from the given packages as first-party
+    """
+    return ModClassifier({_package_root(package) for package in packages})
+
+
+class _ParsePool:
+    """
+    Parse batches of module files in a thread or process pool with no more than max_pending batches in flight
+    """
+
+    def __init__(
+        self,
+        mod_resolver: ModResolver,
+        mod_parser: ModParser,
+        *,
+        use_processes: bool,
+        workers: int,
+        max_pending: int,
+        timed: bool,
+    ) -> None:
+        self._pool: Executor
+        self._parse_batch: Callable[[ModuleFileBatch], ParsedBatch]
+
+        if use_processes:
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(mod_resolver,))
+            self._parse_batch, self.batch_size = partial(_parse_module_batch, timed=timed), PROCESS_BATCH_SIZE
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=workers)
+            self._parse_batch, self.batch_size = partial(_parse_module_files_batch, mod_parser, timed=timed), 1
+
+        self._max_pending = max_pending
+        self.pending: Set[Future[ParsedBatch]] = set()
+
+    @property
+    def full(self) -> bool:
+        return len(self.pending) >= self._max_pending
+
+    def submit(self, batch: ModuleFileBatch) -> None:
+        self.pending.add(self._pool.submit(self._parse_batch, batch))
+
+    def collect(self, *, block: bool) -> Iterator[ParsedBatch]:
+        """
+        Get the parsed batches that are ready (waiting for at least one if block)
+        """
+        done, self.pending = wait(self.pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            yield future.result()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(cancel_futures=True)
+
+
+def discover_module_files(
+    packages: Sequence[Path],
+    mod_resolver: ModResolver,
+    stats: Optional[BuildStats],
+) -> Iterator[Tuple[ModName, Path]]:
+    """
+    Find module files of the packages, registering each of them with the resolver as it's found
+    """
+    found_files = ModFinder().find(packages)
+
+    for file_path in stats.timed_iter(found_files, "discover") if stats else found_files:
+        mod_name = ModName.from_path(file_path)
+        mod_resolver.add(mod_name, file_path)
+
+        yield mod_name, file_path
+
+
+def _pick_processes(
+    module_files: Iterator[Tuple[ModName, Path]],
+    executor: ExecutorMode,
+    workers: int,
+) -> Tuple[bool, Iterator[Tuple[ModName, Path]]]:
+    """
+    Tell whether to parse in worker processes, looking ahead in the auto mode to find out whether the tree
+    is large enough to pay off starting them (the returned module files include the ones looked at)
+    """
+    if executor != "auto":
+        return executor == "process", module_files
+
+    head = list(islice(module_files, AUTO_PROCESS_MIN_FILES))
+    use_processes = len(head) == AUTO_PROCESS_MIN_FILES and workers > 1 and (os.cpu_count() or 1) > 1
+
+    return use_processes, chain(head, module_files)
+
+
+def cached_imports(
+    cache: Optional[ParseCache],
+    mod_parser: ModParser,
+    mod_name: ModName,
+    file_path: Path,
+    stats: Optional[BuildStats],
+) -> Optional[ParsedModuleFile]:
+    """
+    Resolve cached import statements of the file (None if the file has to be parsed)
+    """
+    if cache is None:
+        return None
+
+    cached_file = cache.get(file_path)
+
+    if stats:
+        stats.cache_hits += cached_file is not None
+        stats.cache_misses += cached_file is None
+
+    if cached_file is None:
+        return None
+
+    # cached files are resolved every time, since imports may resolve differently as the codebase changes
+    statements = cached_file[1]
+    imported_mods = mod_parser.resolve_statements(mod_name, statements)
+
+    return mod_name, file_path, imported_mods, mod_parser.unresolved_names(mod_name, statements, imported_mods)
+
+
+def filter_parsed_file(
+    mod_filter: ImportFilter,
+    parsed_file: ParsedModuleFile,
+    stats: Optional[BuildStats] = None,
+) -> ParsedModuleFile:
+    """
+    Keep only the imports of the parsed file that pass the filter (counting them if stats are given)
+    """
+    mod_name, file_path, imported_mods, unresolved = parsed_file
+
+    if not stats:
+        return mod_name, file_path, mod_filter.filter(imported_mods), unresolved
+
+    started_at = time.perf_counter()
+    imported_mods = mod_filter.filter(imported_mods)
+    stats.add_time("filter", time.perf_counter() - started_at)
+
+    stats.files += 1
+    stats.imports += len(imported_mods)
+
+    return mod_name, file_path, imported_mods, unresolved
+
+
+def _decode_batches(
+    parsed_batches: Iterator[ParsedBatch],
+    mod_filter: ImportFilter,
+    cache: Optional[ParseCache],
+    resolution_cache: Optional[ResolutionCache],
+    stats: Optional[BuildStats],
+) -> Iterator[ParsedModuleFile]:
+    for records, resolutions in parsed_batches:
+        if resolution_cache and resolutions:
+            resolution_cache.update(resolutions)
+
+        for record in records:
+            parsed_file = decode_record(record, cache)
+
+            if stats and (metrics := record[8]):
+                stats.add_file(parsed_file[1], metrics)
+
+            yield filter_parsed_file(mod_filter, parsed_file, stats)
+
+
+def iter_mod_graph(
+    packages: Sequence[Path],
+    *,
+    include_external: bool = False,
+    include_third_party: bool = False,
+    workers: int = 5,
+    executor: ExecutorMode = "thread",
+    cache: Optional[ParseCache] = None,
+    resolution_cache: Optional[ResolutionCache] = None,
+    find_spec_fallback: bool = False,
+    max_pending: Optional[int] = None,
+    stats: Optional[BuildStats] = None,
+    other_shards: Sequence[Path] = (),
+) -> Generator[ParsedModuleFile, None, None]:
+    """
+    Yield parsed module files as soon as they are ready, while the packages are still being discovered
+
+    Discovery, parsing and consumption are pipelined: no more than max_pending files (or batches of files
+    in the process mode) are parsed at once, so memory stays bounded regardless of the tree size.
+    See build_mod_graph() for the rest of the options
+    """
+    mod_resolver = build_resolver(
+        [*packages, *other_shards],
+        find_spec_fallback=find_spec_fallback,
+        resolution_cache=resolution_cache,
+    )
+    mod_filter = ImportFilter(
+        include_external=include_external,
+        include_third_party=include_third_party,
+        classifier=build_classifier([*packages, *other_shards]),
+    )
+    # the main thread resolves imports of the cached files
+    mod_parser = ModParser(mod_resolver)
+
+    use_processes, module_files = _pick_processes(
+        discover_module_files(packages, mod_resolver, stats), executor, workers
+    )
+    parse_pool = _ParsePool(
+        mod_resolver,
+        mod_parser,
+        use_processes=use_processes,
+        workers=workers,
+        max_pending=max_pending or workers * 4,
+        timed=stats is not None,
+    )
+
+    def decoded(parsed_batches: Iterator[ParsedBatch]) -> Iterator[ParsedModuleFile]:
+        return _decode_batches(parsed_batches, mod_filter, cache, resolution_cache, stats)
+
+    try:
+        batch: ModuleFileBatch = []
+
+        for mod_name, file_path in module_files:
+            if (cached_file := cached_imports(cache, mod_parser, mod_name, file_path, stats)) is not None:
+                yield filter_parsed_file(mod_filter, cached_file, stats)
+                continue
+
+            batch.append((str(mod_name), str(file_path)))
+
+            if len(batch) < parse_pool.batch_size:
+                continue
+
+            parse_pool.submit(batch)
+            batch = []
+
+            # wait for parsing to catch up if too many files are in flight (backpressure)
+            yield from decoded(parse_pool.collect(block=parse_pool.full))
+
+        if batch:
+            parse_pool.submit(batch)
+
+        while parse_pool.pending:
+            yield from decoded(parse_pool.collect(block=True))
+    finally:
+        parse_pool.shutdown()
+
+    if cache:
+        cache.save()
+
+    if resolution_cache:
+        resolution_cache.save()
+
 
 def build_mod_graph(
     packages: Sequence[Path],
@@ -20,56 +515,168 @@ def build_mod_graph(
     include_external: bool = False,
     include_third_party: bool = False,
     workers: int = 5,
+    executor: ExecutorMode = "thread",
+    cache: Optional[ParseCache] = None,
+    resolution_cache: Optional[ResolutionCache] = None,
+    find_spec_fallback: bool = False,
+    stats: Optional[BuildStats] = None,
+    other_shards: Sequence[Path] = (),
 ) -> ModGraph:
     """
     Build a module import graph
+
+    Files are parsed either in a thread pool or in batches in a process pool (ast parsing holds the GIL,
+    so only processes scale with the number of CPU cores). The "auto" mode picks processes for large trees.
+
+    Imports are resolved statically against the discovered files, the package roots and sys.path.
+    Set find_spec_fallback to resolve what is not found there via importlib (that imports parent packages).
+
+    When the parse cache is given, files that have not changed since the previous build are not parsed again.
+    When the resolution cache is given, imports of the standard library and installed distributions are resolved
+    from it until the Python environment changes.
+
+    Pass BuildStats to find out where the build time goes (there is no instrumentation overhead otherwise)
+
+    To build a large codebase in shards, build each shard with the rest of package roots as other_shards.
+    Their modules are not parsed, but imports of them are kept as placeholders, so ModGraph.merge() of the partial
+    graphs gives the same graph as building all package roots at once
     """
     mod_graph = ModGraph()
 
-    mod_finder = ModFinder()
-    mod_parser = ModParser()
-    mod_filter = ImportFilter(
+    for mod_name, file_path, imported_mods, unresolved in iter_mod_graph(
+        packages,
         include_external=include_external,
         include_third_party=include_third_party,
-    )
+        workers=workers,
+        executor=executor,
+        cache=cache,
+        resolution_cache=resolution_cache,
+        find_spec_fallback=find_spec_fallback,
+        stats=stats,
+        other_shards=other_shards,
+    ):
+        if not stats:
+            mod_graph.add(mod_name, file_path, imported_mods, unresolved)
+            continue
 
-    def process_module_file(file_path: Path) -> Optional[ParsedModuleFile]:
-        """
-        Process an individual module file
-        """
-        logger.debug(f"Parsing {file_path} file")
+        started_at = time.perf_counter()
+        mod_graph.add(mod_name, file_path, imported_mods, unresolved)
+        stats.add_time("insert", time.perf_counter() - started_at)
 
-        mod_name = ModName.from_path(file_path)
+    return mod_graph
 
-        with tokenize.open(file_path) as file:
-            content = file.read()
 
-        try:
-            imported_mods = mod_parser.parse(mod_name, content)
-        except SyntaxError as e:
-            logger.warning(f"Syntax error in {file_path} file at {e.lineno}:{e.offset}: {e.msg}")
-            return None
+def _graph_resolver(mod_graph: ModGraph, *, find_spec_fallback: bool, cache: Optional[ResolutionCache]) -> ModResolver:
+    """
+    Set up a resolver that knows the modules of the graph
+    """
+    resolver = ModResolver(find_spec_fallback=find_spec_fallback, cache=cache)
 
-        filtered_imports = mod_filter.filter(imported_mods)
+    for module in mod_graph:
+        resolver.add(module.mod_name, module.file_path)
 
-        return mod_name, file_path, filtered_imports
+    return resolver
 
-    futures: List[Future[ParsedModuleFile]] = []
 
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        for file_path in mod_finder.find(packages):
-            futures.append(
-                executor.submit(process_module_file, file_path),  # type: ignore[arg-type]
-            )
+def _stale_files(
+    mod_graph: ModGraph,
+    *,
+    added: Sequence[Path],
+    modified: Sequence[Path],
+    deleted: Sequence[Path],
+) -> List[Tuple[ModName, Path]]:
+    """
+    Find the rest of the modules whose imports have to be resolved again, since modules appear or disappear
+    """
+    changed_names: Set[str] = set()
 
-        for future in as_completed(futures):
-            result = future.result()
+    for file_path in added:
+        if mod_graph[file_path] is None:
+            changed_names.add(str(ModName.from_path(file_path)))
 
-            if not result:
-                continue
+    for file_path in deleted:
+        if (deleted_module := mod_graph[file_path]) is not None:
+            changed_names.add(str(deleted_module.mod_name))
 
-            mod_name, file_path, filtered_imports = result
+    changed_paths = {*added, *modified, *deleted}
 
-            mod_graph.add(mod_name, file_path, filtered_imports)
+    stale_modules = sorted(mod_graph.stale_importers(changed_names), key=lambda module: module.file_path)
 
-    return mod_graph
+    return [(module.mod_name, module.file_path) for module in stale_modules if module.file_path not in changed_paths]
+
+
+def _remove_deleted(mod_graph: ModGraph, resolver: ModResolver, deleted: Sequence[Path]) -> None:
+    for file_path in deleted:
+        deleted_module: Optional[Module] = mod_graph[file_path]
+
+        if deleted_module is None:
+            logger.debug(f"{file_path} is not in the graph, nothing to remove")
+            continue
+
+        resolver.remove(deleted_module.mod_name)
+        mod_graph.remove(file_path)
+
+
+def update_mod_graph(
+    mod_graph: ModGraph,
+    *,
+    added: Sequence[Path] = (),
+    modified: Sequence[Path] = (),
+    deleted: Sequence[Path] = (),
+    include_external: bool = False,
+    include_third_party: bool = False,
+    resolver: Optional[ModResolver] = None,
+    classifier: Optional[ModClassifier] = None,
+    cache: Optional[ParseCache] = None,
+    resolution_cache: Optional[ResolutionCache] = None,
+    find_spec_fallback: bool = False,
+) -> None:
+    """
+    Update the module import graph in place after files have been added, modified or deleted
+
+    Only the given files are parsed again, so the update takes time proportional to the change. Modules whose
+    imports may resolve differently once modules are added or deleted are parsed again too (see stale_importers()).
+    Pass the resolver and the classifier to reuse between updates, otherwise they are set up from modules in the graph.
+    """
+    if resolver is None:
+        resolver = _graph_resolver(mod_graph, find_spec_fallback=find_spec_fallback, cache=resolution_cache)
+    else:
+        resolver.invalidate()
+
+    if classifier is None:
+        classifier = ModClassifier(_first_party_roots(mod_graph))
+
+    mod_filter = ImportFilter(
+        include_external=include_external,
+        include_third_party=include_third_party,
+        classifier=classifier,
+    )
+
+    stale_files = _stale_files(mod_graph, added=added, modified=modified, deleted=deleted)
+
+    _remove_deleted(mod_graph, resolver, deleted)
+
+    module_files: List[Tuple[ModName, Path]] = []
+
+    for file_path in [*added, *modified]:
+        mod_name = ModName.from_path(file_path)
+        resolver.add(mod_name, file_path)
+
+        module_files.append((mod_name, file_path))
+
+    mod_parser = ModParser(resolver)
+
+    for mod_name, file_path in [*module_files, *stale_files]:
+        if not (record := parse_module_file(mod_parser, mod_name, file_path)):
+            # keep the last known imports of the module until its syntax is fixed
+            continue
+
+        mod_name, file_path, imported_mods, unresolved = decode_record(record, cache)
+
+        mod_graph.update(mod_name, file_path, mod_filter.filter(imported_mods), unresolved)
+
+    if cache:
+        cache.save()
+
+    if resolver.cache:
+        resolver.cache.save()
@@ -1,24 +1,35 @@
 import ast
 import logging
-from typing import List, Protocol, Set
+from typing import Dict, Final, FrozenSet, Iterator, List, Optional, Protocol, Sequence, Set, Tuple
 
-from yew.collection import DirectImport, ModName, ModuleNotFound
+from yew.collection import DirectImport, ImportKind, ModName, ModuleNotFound
+from yew.kinds import TRY_NODES, TryNode
+from yew.mods.resolvers import ModResolver
 
 logger = logging.getLogger(__name__)
 
 NodeClass = type[ast.Import | ast.ImportFrom]
+# (module, level, names, lineno, col_offset, kind) of an import statement as written, before it is resolved.
+# `import x` statements have no module and level 0 (from-imports always have either of them)
+ImportStatement = Tuple[Optional[str], int, List[str], int, int, int]
+
+# fields that hold nested statements (including except handlers and match cases that hold statements themselves)
+STMT_BLOCK_FIELDS: Final[Tuple[str, ...]] = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# exceptions that make imports in the try block optional when caught
+IMPORT_ERRORS: Final[FrozenSet[str]] = frozenset(("ImportError", "ModuleNotFoundError", "Exception", "BaseException"))
 
 
 class Parser(Protocol):
-    def __call__(self, module_name: ModName, node: ast.AST) -> set[DirectImport]:
+    def __call__(self, mod_name: ModName, node: ast.AST, kind: ImportKind = ImportKind.EAGER) -> set[DirectImport]:
         ...
 
 
 class ImportParser:
-    def __init__(self) -> None:
-        ...
+    def __init__(self, resolver: ModResolver) -> None:
+        self._resolver = resolver
 
-    def __call__(self, mod_name: ModName, node: ast.AST) -> set[DirectImport]:
+    def __call__(self, mod_name: ModName, node: ast.AST, kind: ImportKind = ImportKind.EAGER) -> set[DirectImport]:
         """
         Parse `import x` statements
         """
@@ -33,9 +44,10 @@ class ImportParser:
                 imported_mods.add(
                     DirectImport(
                         mod_name=mod_name,
-                        path=mod_name.file_path,
+                        path=self._resolver.file_path(mod_name),
                         lineno=node.lineno,
                         col_offset=node.col_offset,
+                        kind=kind,
                     )
                 )
             except ModuleNotFound:
@@ -46,83 +58,292 @@ class ImportParser:
 
 
 class ImportFromParser:
-    def __init__(self) -> None:
-        ...
+    def __init__(self, resolver: ModResolver) -> None:
+        self._resolver = resolver
 
-    def __call__(self, mod_name: ModName, node: ast.AST) -> set[DirectImport]:
+    def __call__(self, mod_name: ModName, node: ast.AST, kind: ImportKind = ImportKind.EAGER) -> set[DirectImport]:
         """
-        Parse `from x import ...` statements
+        Parse `from x import ...` statements.
+
+        Imported objects are kept as symbols of the import of their module (`*` stands for the star import)
         """
         assert isinstance(node, ast.ImportFrom)
 
-        imported_modules: Set[DirectImport] = set()
-
-        base_module: List[str] = []
+        if (base_module := self.base_module(mod_name, node.module, node.level)) is None:
+            return set()
 
-        if node.level == 0:
-            base_module = ModName.split(str(node.module))
+        imported_symbols = self._imported_symbols(base_module, node.names)
 
-        if node.level >= 1:
-            level_up = node.level
+        imported_modules: Set[DirectImport] = set()
 
+        for mod_name, symbols in imported_symbols.items():
             try:
-                if mod_name.is_package:
-                    level_up -= 1
+                imported_modules.add(
+                    DirectImport(
+                        mod_name=mod_name,
+                        path=self._resolver.file_path(mod_name),
+                        lineno=node.lineno,
+                        col_offset=node.col_offset,
+                        kind=kind,
+                        symbols=frozenset(symbols or ()),
+                    )
+                )
             except ModuleNotFound:
-                return set()
+                logger.warning(f"Could not find {mod_name} module. Could be an optional import. Skipping it")
+                continue
 
+        return imported_modules
+
+    def base_module(self, mod_name: ModName, module: Optional[str], level: int) -> Optional[List[str]]:
+        """
+        Get the module path the names are imported from
+        (None if the importing module of a relative import is unknown or the import goes beyond its top-level package)
+        """
+        if level == 0:
+            return ModName.split(str(module))
+
+        level_up = level
+
+        try:
+            if self._resolver.is_package(mod_name):
+                level_up -= 1
+        except ModuleNotFound:
+            return None
+
+        try:
             base_module = [*mod_name.resolve(level_up).parts]
+        except ValueError:
+            logger.warning(f"Relative import in {mod_name} goes beyond its top-level package. Skipping it")
+            return None
 
-            if node.module:
-                # could be none in case of `from . import Field`
-                base_module.append(node.module)
+        if module:
+            # could be none in case of `from . import Field`
+            base_module.append(module)
 
-        for alias in node.names:
+        return base_module
+
+    def _imported_symbols(self, base_module: List[str], aliases: List[ast.alias]) -> Dict[ModName, Optional[Set[str]]]:
+        """
+        Group imported object names by the module they are imported from (None if the module itself is imported)
+        """
+        imported_symbols: Dict[ModName, Optional[Set[str]]] = {}
+
+        for alias in aliases:
             obj_path = [*base_module, alias.name]
 
             logger.debug(f"Analyzing {ModName.join(obj_path)} import")
 
             try:
-                mod_name, obj = ModName.from_object_path(obj_path)
-
-                logger.debug(f"- {mod_name}, obj: {obj}")
-
-                imported_modules.add(
-                    DirectImport(
-                        mod_name=mod_name,
-                        path=mod_name.file_path,
-                        lineno=node.lineno,
-                        col_offset=node.col_offset,
-                    )
-                )
+                mod_name, obj = self._resolver.from_object_path(obj_path)
             except ModuleNotFound:
                 logger.warning(
                     f"Could not find {ModName.join(obj_path)} module. Could be an optional import. Skipping it"
                 )
                 continue
 
-        return imported_modules
+            logger.debug(f"- {mod_name}, obj: {obj}")
+
+            symbols = imported_symbols.setdefault(mod_name, set())
+
+            if obj is None:
+                imported_symbols[mod_name] = None
+            elif symbols is not None:
+                symbols.add(obj)
+
+        return imported_symbols
 
 
 class ModParser:
-    def __init__(self) -> None:
+    def __init__(self, resolver: Optional[ModResolver] = None) -> None:
+        self._resolver = resolver or ModResolver()
+
+        self._import_from_parser = ImportFromParser(self._resolver)
         self._parsers: dict[NodeClass, Parser] = {
-            ast.Import: ImportParser(),  # type: ignore[dict-item]
-            ast.ImportFrom: ImportFromParser(),  # type: ignore[dict-item]
+            ast.Import: ImportParser(self._resolver),
+            ast.ImportFrom: self._import_from_parser,
         }
 
-    def parse(self, module_name: ModName, content: str) -> Set[DirectImport]:
-        try:
-            ast_tree = ast.parse(content)
-        except SyntaxError:
-            raise
+    @property
+    def resolver(self) -> ModResolver:
+        return self._resolver
+
+    def parse(self, module_name: ModName, content: str | bytes) -> Set[DirectImport]:
+        """
+        Parse imports of the module source (the source is decoded by the parser if given as bytes)
+        """
+        ast_tree = self.parse_tree(content)
+
+        if ast_tree is None:
+            return set()
+
+        return self.parse_imports(module_name, ast_tree)
+
+    def parse_tree(self, content: str | bytes) -> Optional[ast.Module]:
+        """
+        Build AST of the module source (None if the source has no imports for sure)
+        """
+        has_imports = b"import" in content if isinstance(content, bytes) else "import" in content
+
+        if not has_imports:
+            # no imports for sure, so there is no need to build AST
+            return None
 
+        return ast.parse(content)
+
+    def parse_imports(self, module_name: ModName, ast_tree: ast.Module) -> Set[DirectImport]:
+        """
+        Resolve imports found in the module AST
+        """
         imported_mods: Set[DirectImport] = set()
 
-        for node in ast.walk(ast_tree):
-            for node_class, node_parser in self._parsers.items():
-                if isinstance(node, node_class):
-                    imported_mods |= node_parser(module_name, node)
-                    continue
+        for node, kind in iter_kinded_import_nodes(ast_tree):
+            node_parser = self._parsers[type(node)]
+            imported_mods |= node_parser(module_name, node, kind)
 
         return imported_mods
+
+    def parse_statements(self, ast_tree: Optional[ast.Module]) -> List[ImportStatement]:
+        """
+        Find import statements of the module AST without resolving them, so they can be cached
+        and resolved against the current state of the codebase later
+        """
+        if ast_tree is None:
+            return []
+
+        return [
+            (
+                node.module if isinstance(node, ast.ImportFrom) else None,
+                node.level if isinstance(node, ast.ImportFrom) else 0,
+                [alias.name for alias in node.names],
+                node.lineno,
+                node.col_offset,
+                int(kind),
+            )
+            for node, kind in iter_kinded_import_nodes(ast_tree)
+        ]
+
+    def resolve_statements(self, module_name: ModName, statements: Sequence[ImportStatement]) -> Set[DirectImport]:
+        """
+        Resolve import statements found by parse_statements()
+        """
+        imported_mods: Set[DirectImport] = set()
+
+        for module, level, names, lineno, col_offset, kind in statements:
+            aliases = [ast.alias(name=name) for name in names]
+            node: ast.Import | ast.ImportFrom
+
+            if module is None and level == 0:
+                node = ast.Import(names=aliases, lineno=lineno, col_offset=col_offset)
+            else:
+                node = ast.ImportFrom(module=module, names=aliases, level=level, lineno=lineno, col_offset=col_offset)
+
+            imported_mods |= self._parsers[type(node)](module_name, node, ImportKind(kind))
+
+        return imported_mods
+
+    def unresolved_names(
+        self,
+        module_name: ModName,
+        statements: Sequence[ImportStatement],
+        imported_mods: Set[DirectImport],
+    ) -> FrozenSet[str]:
+        """
+        Find names of modules that the import statements look for, but that have not been found among
+        the resolved imports (e.g. optional dependencies or modules that have not been created yet)
+        """
+        resolved = {str(direct_import.mod_name) for direct_import in imported_mods}
+        unresolved: Set[str] = set()
+
+        for module, level, names, *_ in statements:
+            if module is None and level == 0:
+                unresolved.update(name for name in names if name not in resolved)
+                continue
+
+            if (base_module := self._import_from_parser.base_module(module_name, module, level)) is None:
+                continue
+
+            # the names are imported from the base module or are its submodules if it has been found
+            base_name = ModName.join(base_module)
+
+            if base_name not in resolved and not any(f"{base_name}.{name}" in resolved for name in names):
+                unresolved.add(base_name)
+
+        return frozenset(unresolved)
+
+
+def iter_import_nodes(ast_tree: ast.Module) -> Iterator[ast.Import | ast.ImportFrom]:
+    """
+    Find all import statements, including ones nested into functions, classes, conditions or try blocks
+    """
+    for node, _ in iter_kinded_import_nodes(ast_tree):
+        yield node
+
+
+def iter_kinded_import_nodes(ast_tree: ast.Module) -> Iterator[Tuple[ast.Import | ast.ImportFrom, ImportKind]]:
+    """
+    Find all import statements along with their kind in the same pass.
+
+    Imports are statements, so only statement blocks are traversed and expression subtrees are never visited.
+    The kind of a block is inherited by nested blocks unless they narrow it down further
+    (e.g. a try block in a function is still lazy, see ImportKind for the order)
+    """
+    blocks: List[Tuple[Sequence[ast.stmt], ImportKind]] = [(ast_tree.body, ImportKind.EAGER)]
+
+    while blocks:
+        block, block_kind = blocks.pop()
+
+        for node in block:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                yield node, block_kind
+                continue
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                blocks.append((node.body, max(block_kind, ImportKind.LAZY)))
+                continue
+
+            if isinstance(node, ast.If) and _is_type_checking(node.test):
+                blocks.append((node.body, ImportKind.TYPE_CHECKING))
+
+                if node.orelse:
+                    blocks.append((node.orelse, block_kind))
+
+                continue
+
+            if isinstance(node, TRY_NODES) and _catches_import_errors(node):
+                optional_kind = max(block_kind, ImportKind.OPTIONAL)
+
+                # imports in the try block and fallback imports in the handlers happen only if others fail
+                blocks.append((node.body, optional_kind))
+                blocks.extend((handler.body, optional_kind) for handler in node.handlers)
+                blocks.extend((sub_block, block_kind) for sub_block in (node.orelse, node.finalbody) if sub_block)
+                continue
+
+            for field in STMT_BLOCK_FIELDS:
+                if sub_block := getattr(node, field, None):
+                    blocks.append((sub_block, block_kind))
+
+
+def _is_type_checking(test: ast.expr) -> bool:
+    """
+    Check whether the condition is `TYPE_CHECKING` or `<module>.TYPE_CHECKING` (e.g. typing.TYPE_CHECKING)
+    """
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+
+    return isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"
+
+
+def _catches_import_errors(node: TryNode) -> bool:
+    for handler in node.handlers:
+        if handler.type is None:
+            return True
+
+        exc_types = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+
+        for exc_type in exc_types:
+            exc_name = exc_type.attr if isinstance(exc_type, ast.Attribute) else getattr(exc_type, "id", None)
+
+            if exc_name in IMPORT_ERRORS:
+                return True
+
+    return False
@@ -0,0 +1,319 @@
+import logging
+import os
+import sys
+import threading
+from importlib import machinery
+from pathlib import Path
+from typing import Dict, Final, List, Optional, Sequence, Set, Tuple
+
+from yew.collection import ModName, ModuleNotFound
+from yew.mods.cache import ResolutionCache
+
+logger = logging.getLogger(__name__)
+
+# the same order importlib's FileFinder tries loaders in
+MODULE_SUFFIXES: Final[List[str]] = [
+    *machinery.EXTENSION_SUFFIXES,
+    *machinery.SOURCE_SUFFIXES,
+    *machinery.BYTECODE_SUFFIXES,
+]
+
+BUILTIN_ORIGIN: Final[Path] = Path("built-in")
+
+# the resolved module origin and the directories to look for its submodules in (empty for non-packages)
+Resolution = Tuple[Path, List[Path]]
+
+
+class ModResolver:
+    """
+    Resolve module names to file paths statically, without importing anything.
+
+    Modules discovered by ModFinder are registered upfront. Everything else is looked up
+    in the sys.path entries that are scanned once and memoized, so each resolution is a dict lookup.
+    Falling back to importlib's find_spec() (which imports parent packages) is opt-in.
+    Submodules that modules alias at runtime (e.g. os.path) are taken from sys.modules if they are there.
+
+    With the resolution cache, modules of the Python environment (and names that turn out to be objects
+    imported from them) are resolved once per environment rather than once per run. Names that may be shadowed
+    by project directories on the search paths are always resolved again
+    """
+
+    def __init__(
+        self,
+        search_paths: Optional[Sequence[str | Path]] = None,
+        *,
+        find_spec_fallback: bool = False,
+        cache: Optional[ResolutionCache] = None,
+    ) -> None:
+        if search_paths is None:
+            search_paths = sys.path
+
+        self._search_paths = [Path(path or os.curdir).absolute() for path in search_paths]
+        self._find_spec_fallback = find_spec_fallback
+
+        self._resolved: Dict[str, Optional[Resolution]] = {}
+        self._top_level: Dict[str, List[Path]] | None = None
+        self._dir_entries: Dict[Path, Set[str]] = {}
+
+        if cache is not None and [path for path in self._search_paths if cache.in_environment(path)] != cache.env_paths:
+            logger.info("The resolution cache has been built for other search paths, not using it")
+            cache = None
+
+        self._cache = cache
+        self._project_names: Set[str] | None = None  # top-level names in search paths outside of the environment
+
+        # resolution events by thread, so each parsing thread can attribute them to the file it parses
+        self._counters: Dict[int, Dict[str, int]] = {}
+
+    def add(self, mod_name: ModName, file_path: Path) -> None:
+        """
+        Register a module file that has been discovered in the analyzed packages
+        """
+        search_locations = [file_path.parent] if file_path.stem == "__init__" else []
+
+        self._resolved[str(mod_name)] = (file_path, search_locations)
+
+    def add_search_path(self, search_path: Path) -> None:
+        """
+        Look up modules in the directory after all other search paths
+        """
+        search_path = search_path.absolute()
+
+        if search_path in self._search_paths:
+            return
+
+        self._search_paths.append(search_path)
+        self.invalidate()
+
+    def remove(self, mod_name: ModName) -> None:
+        """
+        Forget the module (e.g. when its file has been deleted)
+        """
+        self._resolved.pop(str(mod_name), None)
+
+    def invalidate(self) -> None:
+        """
+        Drop memoized directory listings and failed lookups, so files created since then can be resolved
+        """
+        self._dir_entries.clear()
+        self._top_level = None
+        self._project_names = None
+
+        for mod_name, resolution in list(self._resolved.items()):
+            if resolution is None:
+                del self._resolved[mod_name]
+
+    def file_path(self, mod_name: ModName) -> Path:
+        """
+        Get the file path of the module (the directory in case of namespace packages)
+        """
+        resolution = self._resolve(str(mod_name))
+
+        if resolution is None:
+            self._count("resolution_failures")
+            raise ModuleNotFound(f"Could not find package '{mod_name}' under Python path.")
+
+        origin, _ = resolution
+
+        return origin
+
+    def is_package(self, mod_name: ModName) -> bool:
+        resolution = self._resolve(str(mod_name))
+
+        if resolution is None:
+            self._count("resolution_failures")
+            raise ModuleNotFound(f"Could not find package '{mod_name}' under Python path.")
+
+        _, search_locations = resolution
+
+        return bool(search_locations)
+
+    def from_object_path(self, object_path: List[str]) -> Tuple[ModName, str | None]:
+        """
+        Split the imported path into the module and the imported object name (if an object is imported)
+        """
+        if self._resolve(ModName.join(object_path)) is not None:
+            return ModName(object_path), None
+
+        *mod_parts, object_name = object_path
+
+        if not mod_parts or self._resolve(ModName.join(mod_parts)) is None:
+            self._count("resolution_failures")
+            raise ModuleNotFound(f"{ModName.join(object_path)} could not be found")
+
+        return ModName(mod_parts), object_name
+
+    @property
+    def cache(self) -> Optional[ResolutionCache]:
+        return self._cache
+
+    def counters(self) -> Dict[str, int]:
+        """
+        Get counts of find_spec() calls and resolution failures that happened in the current thread
+        """
+        return dict(self._counters.get(threading.get_ident(), {}))
+
+    def _count(self, counter: str) -> None:
+        counters = self._counters.setdefault(threading.get_ident(), {})
+        counters[counter] = counters.get(counter, 0) + 1
+
+    def _resolve(self, mod_name: str) -> Optional[Resolution]:
+        try:
+            return self._resolved[mod_name]
+        except KeyError:
+            pass
+
+        cache = self._cache if self._cache is not None and not self._is_shadowed(mod_name) else None
+        resolution: Optional[Resolution]
+
+        if cache is not None:
+            try:
+                resolution = self._resolved[mod_name] = cache.get(mod_name, find_spec_fallback=self._find_spec_fallback)
+
+                return resolution
+            except KeyError:
+                pass
+
+        parent_name, _, name = mod_name.rpartition(ModName.SEP)
+
+        if not parent_name:
+            resolution = self._find_top_level(name)
+        elif (parent := self._resolve(parent_name)) is not None:
+            _, search_locations = parent
+            resolution = self._find_in(search_locations, name) if search_locations else self._find_alias(mod_name)
+        else:
+            resolution = None
+
+        if resolution is None and self._find_spec_fallback:
+            resolution = self._find_spec(mod_name)
+
+        self._resolved[mod_name] = resolution
+
+        if cache is not None and self._depends_on_environment(resolution or self._resolved.get(parent_name)):
+            cache.put(mod_name, resolution, find_spec_fallback=self._find_spec_fallback)
+
+        return resolution
+
+    def _depends_on_environment(self, resolution: Optional[Resolution]) -> bool:
+        """
+        Check whether the resolution of a name that is not shadowed by the project depends only on the Python
+        environment, so it can be cached. Pass the parent's resolution for names that have not been found:
+        they are objects of environment modules or not in the environment at all if the parent is not found either
+        """
+        if resolution is None:
+            return True
+
+        if self._cache is None:
+            return False
+
+        origin, _ = resolution
+
+        return origin == BUILTIN_ORIGIN or self._cache.in_environment(origin)
+
+    def _is_shadowed(self, mod_name: str) -> bool:
+        """
+        Check whether the top-level package of the module may be found in the project rather than in the environment
+        """
+        if self._project_names is None:
+            self._project_names = {
+                entry.partition(".")[0]
+                for search_path in self._search_paths
+                if self._cache is not None and not self._cache.in_environment(search_path)
+                for entry in self._list_dir(search_path)
+            }
+
+        return mod_name.partition(ModName.SEP)[0] in self._project_names
+
+    def _find_top_level(self, name: str) -> Optional[Resolution]:
+        if name in sys.builtin_module_names:
+            return BUILTIN_ORIGIN, []
+
+        if self._top_level is None:
+            self._top_level = self._scan_search_paths()
+
+        if not (search_locations := self._top_level.get(name)):
+            return None
+
+        return self._find_in(search_locations, name)
+
+    def _scan_search_paths(self) -> Dict[str, List[Path]]:
+        """
+        Index which search paths may contain each top-level name (in the sys.path precedence order)
+        """
+        top_level: Dict[str, List[Path]] = {}
+
+        for search_path in self._search_paths:
+            names = {entry.partition(".")[0] for entry in self._list_dir(search_path)}
+
+            for name in names:
+                top_level.setdefault(name, []).append(search_path)
+
+        return top_level
+
+    def _find_in(self, search_locations: List[Path], name: str) -> Optional[Resolution]:
+        """
+        Find the module in the given directories the same way importlib's FileFinder does
+        """
+        namespace_portions: List[Path] = []
+
+        for location in search_locations:
+            entries = self._list_dir(location)
+
+            if name in entries:
+                package_dir = location / name
+                package_entries = self._list_dir(package_dir)
+
+                for suffix in MODULE_SUFFIXES:
+                    if f"__init__{suffix}" in package_entries:
+                        return package_dir / f"__init__{suffix}", [package_dir]
+
+            for suffix in MODULE_SUFFIXES:
+                if f"{name}{suffix}" in entries:
+                    return location / f"{name}{suffix}", []
+
+            if name in entries and (location / name).is_dir():
+                namespace_portions.append(location / name)
+
+        if namespace_portions:
+            return namespace_portions[0], namespace_portions
+
+        return None
+
+    def _find_alias(self, mod_name: str) -> Optional[Resolution]:
+        """
+        Find a submodule of a plain module, which can only be an alias the module has set in sys.modules
+        (e.g. os.path is posixpath or ntpath). Modules that have not been imported yet are not looked into
+        """
+        if (module := sys.modules.get(mod_name)) is None:
+            return None
+
+        # frozen stdlib modules still have their source file
+        origin = Path(file_name) if (file_name := getattr(module, "__file__", None)) else BUILTIN_ORIGIN
+
+        return origin, [Path(path) for path in getattr(module, "__path__", ())]
+
+    def _list_dir(self, directory: Path) -> Set[str]:
+        try:
+            return self._dir_entries[directory]
+        except KeyError:
+            pass
+
+        try:
+            entries = set(os.listdir(directory))
+        except OSError:
+            entries = set()
+
+        self._dir_entries[directory] = entries
+
+        return entries
+
+    def _find_spec(self, mod_name: str) -> Optional[Resolution]:
+        logger.debug(f"Could not resolve {mod_name} statically, falling back to find_spec()")
+        self._count("find_spec_calls")
+
+        try:
+            origin = ModName.from_str(mod_name).file_path
+        except ModuleNotFound:
+            return None
+
+        return origin, [origin.parent] if origin.stem == "__init__" else []
@@ -0,0 +1,134 @@
+import dataclasses
+import heapq
+import itertools
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Final, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+PHASES: Final[Tuple[str, ...]] = ("discover", "read", "parse", "resolve", "filter", "insert")
+MAIN_WORKER: Final[str] = "main"
+
+T = TypeVar("T")
+
+# compact picklable per-file measurements that workers send back along with the module record:
+# (worker, read time, parse time, resolve time, find_spec() calls, resolution failures)
+FileMetrics = Tuple[str, float, float, float, int, int]
+
+
+@dataclasses.dataclass
+class FileStats:
+    """
+    Time spent on a single module file by phase
+    """
+
+    file_path: Path
+    worker: str
+    phases: Dict[str, float]
+    find_spec_calls: int = 0
+    resolution_failures: int = 0
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+
+@dataclasses.dataclass
+class BuildStats:
+    """
+    Opt-in instrumentation of a graph build: time per phase (overall and per worker), counters and the slowest files.
+
+    Pass it to build_mod_graph() to get it filled. Per-file stats are streamed to on_file as soon as files are parsed
+    """
+
+    slowest_limit: int = 10
+    on_file: Optional[Callable[[FileStats], None]] = None
+
+    phase_times: Dict[str, float] = dataclasses.field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    worker_times: Dict[str, Dict[str, float]] = dataclasses.field(default_factory=dict)
+
+    files: int = 0
+    imports: int = 0
+    find_spec_calls: int = 0
+    resolution_failures: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    _slowest: List[Tuple[float, int, FileStats]] = dataclasses.field(default_factory=list, repr=False)
+    _sequence: Iterator[int] = dataclasses.field(default_factory=itertools.count, repr=False)
+    _lock: threading.Lock = dataclasses.field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add_time(self, phase: str, elapsed: float, worker: str = MAIN_WORKER) -> None:
+        with self._lock:
+            self.phase_times[phase] += elapsed
+
+            worker_times = self.worker_times.setdefault(worker, dict.fromkeys(PHASES, 0.0))
+            worker_times[phase] += elapsed
+
+    def timed_iter(self, items: Iterable[T], phase: str) -> Iterator[T]:
+        """
+        Account for the time spent on producing the items (e.g. walking directories) as the phase time
+        """
+        iterator = iter(items)
+
+        while True:
+            started_at = time.perf_counter()
+            item = next(iterator, None)
+            self.add_time(phase, time.perf_counter() - started_at)
+
+            if item is None:
+                return
+
+            yield item
+
+    def add_file(self, file_path: Path, metrics: FileMetrics) -> None:
+        """
+        Account for the file parsed by a worker
+        """
+        worker, read_time, parse_time, resolve_time, find_spec_calls, resolution_failures = metrics
+
+        file_stats = FileStats(
+            file_path=file_path,
+            worker=worker,
+            phases={"read": read_time, "parse": parse_time, "resolve": resolve_time},
+            find_spec_calls=find_spec_calls,
+            resolution_failures=resolution_failures,
+        )
+
+        for phase, elapsed in file_stats.phases.items():
+            self.add_time(phase, elapsed, worker)
+
+        with self._lock:
+            self.find_spec_calls += find_spec_calls
+            self.resolution_failures += resolution_failures
+
+            # a min-heap of the slowest files, so the fastest of them is replaced first
+            entry = (file_stats.total, next(self._sequence), file_stats)
+
+            if len(self._slowest) < self.slowest_limit:
+                heapq.heappush(self._slowest, entry)
+            elif self._slowest and entry[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+        if self.on_file:
+            self.on_file(file_stats)
+
+    @property
+    def slowest_files(self) -> List[FileStats]:
+        return [file_stats for _, _, file_stats in sorted(self._slowest, key=lambda entry: -entry[0])]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "phase_times": self.phase_times,
+            "worker_times": self.worker_times,
+            "files": self.files,
+            "imports": self.imports,
+            "find_spec_calls": self.find_spec_calls,
+            "resolution_failures": self.resolution_failures,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "slowest_files": [
+                {"file_path": str(file_stats.file_path), "worker": file_stats.worker, "phases": file_stats.phases}
+                for file_stats in self.slowest_files
+            ],
+        }
@@ -0,0 +1,232 @@
+import logging
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+import pytest
+
+from yew.collection import ModGraph, ModName, Module
+from yew.mods.cache import ParseCache, ResolutionCache
+from yew.mods.graph import build_mod_graph
+from yew.symbols import changed_symbols
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_NAME = "yew-impact"
+
+
+class ImpactSelector:
+    """
+    Deselect test modules that don't transitively import any of the changed modules.
+
+    Changed files are taken from the command line or from `git diff` against the base revision (plus untracked files).
+    Tests are kept when there is no way to tell whether they are affected: their modules are not in the graph,
+    a conftest.py above them has changed, a changed module is not in the graph (e.g. it has been deleted)
+    or the changed files could not be found out at all.
+
+    With --yew-symbols, changed top-level definitions are found by comparing files with the base revision,
+    so tests that import only unchanged names of the changed modules are deselected too
+    """
+
+    def __init__(self, config: pytest.Config) -> None:
+        self._config = config
+
+        self._changed: Optional[Set[Path]] = None
+        self._deselected: List[pytest.Item] = []
+        self._deselected_modules = 0
+        self._build_time = 0.0
+        self._error: Optional[str] = None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config: pytest.Config, items: List[pytest.Item]) -> None:
+        try:
+            changed = self._changed = self._changed_files()
+        except (OSError, subprocess.CalledProcessError) as e:
+            self._error = f"could not get changed files from git ({e}), running all tests"
+            return
+
+        changed_modules = {file_path for file_path in changed if file_path.suffix == ".py"}
+        changed_conftest_dirs = [file_path.parent for file_path in changed_modules if file_path.name == "conftest.py"]
+
+        started_at = time.perf_counter()
+        mod_graph = build_mod_graph(
+            self._packages(items),
+            cache=self._parse_cache(),
+            resolution_cache=self._resolution_cache(),
+        )
+
+        if unknown_modules := {file_path for file_path in changed_modules if mod_graph[file_path] is None}:
+            # deleted modules (or modules outside the packages) can't be traced to the tests that imported them
+            self._error = f"{len(unknown_modules)} changed modules are not in the import graph, running all tests"
+            return
+
+        impacted = {module.file_path for module in self._dependents(mod_graph, changed_modules)} | changed_modules
+        self._build_time = time.perf_counter() - started_at
+
+        selected: List[pytest.Item] = []
+        deselected_modules: Set[Path] = set()
+
+        for item in items:
+            test_path = item.path.absolute()
+
+            if (
+                test_path in impacted
+                or mod_graph[test_path] is None
+                or any(conftest_dir in test_path.parents for conftest_dir in changed_conftest_dirs)
+            ):
+                selected.append(item)
+                continue
+
+            self._deselected.append(item)
+            deselected_modules.add(test_path)
+
+        self._deselected_modules = len(deselected_modules)
+
+        if self._deselected:
+            config.hook.pytest_deselected(items=self._deselected)
+            items[:] = selected
+
+    def pytest_terminal_summary(self, terminalreporter: pytest.TerminalReporter) -> None:
+        if self._error:
+            terminalreporter.write_line(f"yew: {self._error}", yellow=True)
+            return
+
+        if self._changed is None:
+            return
+
+        terminalreporter.write_line(
+            f"yew: deselected {len(self._deselected)} tests in {self._deselected_modules} modules "
+            f"that don't import any of {len(self._changed)} changed files"
+            f"{' (symbol-level)' if self._config.getoption('yew_symbols') else ''} "
+            f"(the import graph has been built in {self._build_time:.2f}s)"
+        )
+
+        if self._config.option.verbose > 0:
+            for file_path in sorted(self._changed):
+                terminalreporter.write_line(f"yew: changed {file_path}")
+
+    def _dependents(self, mod_graph: ModGraph, changed_modules: Set[Path]) -> Set[Module]:
+        if not self._config.getoption("yew_symbols") or self._config.getoption("yew_changed") is not None:
+            return mod_graph.dependents(changed_modules)
+
+        base = self._config.getoption("yew_base") or "HEAD"
+        changes: Dict[str | Path | ModName, Optional[Set[str]]] = {}
+
+        for file_path in changed_modules:
+            try:
+                old_content = subprocess.run(
+                    ["git", "show", f"{base}:./{file_path.name}"],
+                    cwd=file_path.parent,
+                    capture_output=True,
+                    check=True,
+                ).stdout
+                changes[file_path] = changed_symbols(old_content, file_path.read_bytes())
+            except (OSError, subprocess.CalledProcessError):
+                # the file has been added or deleted
+                changes[file_path] = None
+
+        return mod_graph.symbol_dependents(changes)
+
+    def _changed_files(self) -> Set[Path]:
+        root_path = self._config.rootpath
+        changed_files: Optional[List[str]] = self._config.getoption("yew_changed")
+
+        if changed_files is not None:
+            return {(root_path / changed_file).absolute() for changed_file in changed_files}
+
+        base = self._config.getoption("yew_base") or "HEAD"
+        top_level = Path(_git(root_path, "rev-parse", "--show-toplevel")[0])
+
+        changed_paths = [
+            *_git(root_path, "diff", "--name-only", base),
+            *_git(root_path, "ls-files", "--others", "--exclude-standard", "--full-name"),
+        ]
+
+        return {(top_level / changed_path).absolute() for changed_path in changed_paths}
+
+    def _packages(self, items: Sequence[pytest.Item]) -> List[Path]:
+        """
+        Get the source and test packages to build the graph from (top-level packages of the rootdir by default)
+        """
+        if packages := self._config.getini("yew_packages"):
+            return [Path(package).absolute() for package in packages]
+
+        root_path = self._config.rootpath
+        package_dirs: Set[Path] = set()
+
+        for search_dir in (root_path, root_path / "src"):
+            if search_dir.is_dir():
+                package_dirs.update(path.parent for path in search_dir.glob("*/__init__.py"))
+
+        for item in items:
+            package_dir = item.path.parent
+
+            if not (package_dir / "__init__.py").exists():
+                continue
+
+            while (package_dir.parent / "__init__.py").exists():
+                package_dir = package_dir.parent
+
+            package_dirs.add(package_dir)
+
+        return sorted(package_dir.absolute() for package_dir in package_dirs)
+
+    def _parse_cache(self) -> Optional[ParseCache]:
+        # the cache is missing when the cacheprovider plugin is disabled (-p no:cacheprovider)
+        if (cache := getattr(self._config, "cache", None)) is None:
+            return None
+
+        return ParseCache(cache.mkdir("yew"))
+
+    def _resolution_cache(self) -> Optional[ResolutionCache]:
+        if (cache := getattr(self._config, "cache", None)) is None:
+            return None
+
+        return ResolutionCache(cache.mkdir("yew"))
+
+
+def _git(cwd: Path, *args: str) -> List[str]:
+    output = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+    return [line for line in output.splitlines() if line]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("yew", "test impact selection by the module import graph")
+    group.addoption(
+        "--yew-impacted",
+        action="store_true",
+        default=False,
+        help="run only tests that transitively import changed modules",
+    )
+    group.addoption(
+        "--yew-changed",
+        action="append",
+        default=None,
+        metavar="PATH",
+        help="changed file relative to the rootdir (repeatable, taken from `git diff` by default)",
+    )
+    group.addoption(
+        "--yew-base",
+        default=None,
+        metavar="REF",
+        help="git revision to find changed files against (HEAD by default, i.e. uncommitted changes)",
+    )
+    group.addoption(
+        "--yew-symbols",
+        action="store_true",
+        default=False,
+        help="select tests by changed top-level definitions rather than whole changed modules (needs git)",
+    )
+    parser.addini(
+        "yew_packages",
+        type="paths",
+        default=[],
+        help="source and test packages to build the import graph from (top-level packages of the rootdir by default)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if config.getoption("yew_impacted"):
+        config.pluginmanager.register(ImpactSelector(config), PLUGIN_NAME)
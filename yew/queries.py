@@ -0,0 +1,85 @@
+import logging
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, FrozenSet, Iterable, Literal, Optional, Set, Tuple
+
+from yew.kinds import ALL_KINDS_MASK
+
+if TYPE_CHECKING:
+    from yew.collection import ModGraph
+
+logger = logging.getLogger(__name__)
+
+Direction = Literal["dependents", "dependencies"]
+
+
+class ClosureIndex:
+    """
+    Memoized transitive closures over the module graph.
+
+    Closures are computed by BFS over node IDs. A full closure of every visited node is reused
+    by subsequent queries, so overlapping queries don't traverse the same subgraphs again.
+    The memo is dropped as soon as the graph changes
+    """
+
+    def __init__(self, graph: "ModGraph") -> None:
+        self._graph = graph
+        self._version = graph._version
+
+        self._closures: Dict[Tuple[Direction, int, Optional[int], int], FrozenSet[int]] = {}
+
+    def closure(
+        self,
+        direction: Direction,
+        node_ids: Iterable[int],
+        depth: Optional[int] = None,
+        kinds: int = ALL_KINDS_MASK,
+    ) -> Set[int]:
+        """
+        Find nodes that are reachable from any of the given nodes in at most depth hops (unlimited if None)
+        over imports of the given kinds (a bitmask, see kinds_mask())
+        """
+        if self._version != self._graph._version:
+            self._closures.clear()
+            self._version = self._graph._version
+
+        reachable: Set[int] = set()
+
+        for node_id in node_ids:
+            reachable |= self._node_closure(direction, node_id, depth, kinds)
+
+        return reachable
+
+    def _node_closure(self, direction: Direction, node_id: int, depth: Optional[int], kinds: int) -> FrozenSet[int]:
+        key = (direction, node_id, depth, kinds)
+
+        if (closure := self._closures.get(key)) is not None:
+            return closure
+
+        neighbors = self._graph._dependents if direction == "dependents" else self._graph._dependencies
+
+        visited: Set[int] = set()
+        queue: Deque[Tuple[int, int]] = deque([(node_id, 0)])
+
+        while queue:
+            current_id, current_depth = queue.popleft()
+
+            if depth is not None and current_depth >= depth:
+                continue
+
+            for neighbor_id in neighbors(current_id, kinds):
+                if neighbor_id in visited:
+                    continue
+
+                visited.add(neighbor_id)
+
+                if depth is None and (neighbor_closure := self._closures.get((direction, neighbor_id, None, kinds))):
+                    # the rest of the subgraph has been traversed already
+                    visited |= neighbor_closure
+                    continue
+
+                queue.append((neighbor_id, current_depth + 1))
+
+        closure = frozenset(visited)
+        self._closures[key] = closure
+
+        return closure
@@ -0,0 +1,225 @@
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import compress
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Final, List, Tuple
+
+from yew.adjacency import Adjacency
+from yew.env import env_fingerprint
+
+if TYPE_CHECKING:
+    from yew.collection import ModGraph
+
+logger = logging.getLogger(__name__)
+
+MAGIC: Final[bytes] = b"YEWG"
+VERSION: Final[int] = 5
+
+# magic, version, flags, node count, edge count, interpreter fingerprint, body checksum
+HEADER: Final[struct.Struct] = struct.Struct("<4sHHII32s32s")
+
+# string tables (module names and paths), node flags and categories, owning distributions of third-party nodes,
+# module names that imports of every node have not found (comma-separated), edge import kinds, imported symbols
+# (comma-separated) and the rest of edge columns sorted by the source node with their CSR offsets
+# and the reverse CSR index (edges grouped by the destination node)
+SECTIONS: Final[Tuple[str, ...]] = (
+    "names",
+    "paths",
+    "added",
+    "categories",
+    "distributions",
+    "unresolved",
+    "kinds",
+    "symbols",
+    "offsets",
+    "src",
+    "dst",
+    "lineno",
+    "col",
+    "rev_offsets",
+    "rev_edge_ids",
+)
+ARRAY_SECTIONS: Final[Tuple[str, ...]] = SECTIONS[8:]
+SECTION_TABLE: Final[struct.Struct] = struct.Struct(f"<{len(SECTIONS) * 2}Q")  # (offset, size) per section
+
+ALIGNMENT: Final[int] = 8
+STR_SEP: Final[str] = "\0"
+SYMBOL_SEP: Final[str] = ","
+
+
+class SnapshotError(Exception):
+    """
+    Raised when the graph snapshot is corrupted or has an unsupported format
+    """
+
+
+def save_snapshot(graph: "ModGraph", path: Path) -> None:
+    """
+    Save the graph in a compact binary format.
+
+    Sections are 8-byte aligned, so the file can be memory-mapped and edge arrays read without parsing
+    """
+    node_ids = sorted(graph._node_ids.values())
+    new_node_ids: Dict[int, int] = {node_id: new_node_id for new_node_id, node_id in enumerate(node_ids)}
+
+    offsets = array("i", [0])
+    kinds = bytearray()
+    symbols: List[str] = []
+    columns: Dict[str, array] = {column: array("i") for column in ("src", "dst", "lineno", "col")}
+
+    for new_node_id, node_id in enumerate(node_ids):
+        for edge_id in graph._out_edge_ids(node_id):
+            columns["src"].append(new_node_id)
+            columns["dst"].append(new_node_ids[graph._edge_dst[edge_id]])
+            columns["lineno"].append(graph._edge_lineno[edge_id])
+            columns["col"].append(graph._edge_col[edge_id])
+            kinds.append(graph._edge_kind[edge_id])
+            symbols.append(SYMBOL_SEP.join(graph._edge_symbols.get(edge_id, ())))
+
+        offsets.append(len(columns["src"]))
+
+    imported_by_index = Adjacency.build(columns["dst"], len(node_ids))
+    assert imported_by_index.edge_ids is not None
+
+    sections: Dict[str, bytes] = {
+        "names": STR_SEP.join(graph._names[node_id] for node_id in node_ids).encode(),
+        "paths": STR_SEP.join(graph._paths[node_id] for node_id in node_ids).encode(),
+        "added": bytes(graph._added[node_id] for node_id in node_ids),
+        "categories": bytes(graph._categories[node_id] for node_id in node_ids),
+        "distributions": STR_SEP.join(graph._distributions.get(node_id, "") for node_id in node_ids).encode(),
+        "unresolved": STR_SEP.join(
+            SYMBOL_SEP.join(sorted(graph._unresolved.get(node_id, ()))) for node_id in node_ids
+        ).encode(),
+        "kinds": bytes(kinds),
+        "symbols": STR_SEP.join(symbols).encode(),
+        "offsets": _to_le_bytes(offsets),
+        **{column: _to_le_bytes(values) for column, values in columns.items()},
+        "rev_offsets": _to_le_bytes(imported_by_index.offsets),
+        "rev_edge_ids": _to_le_bytes(imported_by_index.edge_ids),
+    }
+
+    body = bytearray(SECTION_TABLE.size)
+    section_table: List[int] = []
+
+    for section in SECTIONS:
+        body += bytes(-(HEADER.size + len(body)) % ALIGNMENT)
+
+        section_table.extend((len(body), len(sections[section])))
+        body += sections[section]
+
+    SECTION_TABLE.pack_into(body, 0, *section_table)
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(node_ids),
+        len(columns["src"]),
+        bytes.fromhex(env_fingerprint()),
+        hashlib.sha256(body).digest(),
+    )
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(header + body)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(graph: "ModGraph", path: Path, *, verify: bool = True) -> None:
+    """
+    Load the snapshot into an empty graph. Module objects are not created upfront, they are views over the storage
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+        if len(snapshot) < HEADER.size + SECTION_TABLE.size:
+            raise SnapshotError(f"{path} is not a graph snapshot")
+
+        magic, version, _, total_nodes, total_edges, fingerprint, checksum = HEADER.unpack_from(snapshot, 0)
+
+        if magic != MAGIC:
+            raise SnapshotError(f"{path} is not a graph snapshot")
+
+        if version != VERSION:
+            raise SnapshotError(f"{path} has snapshot format v{version}, but only v{VERSION} is supported")
+
+        if fingerprint.hex() != env_fingerprint():
+            logger.warning(f"{path} has been built in another Python environment, third-party paths may differ")
+
+        with memoryview(snapshot) as view, view[HEADER.size :] as body:
+            if verify and hashlib.sha256(body).digest() != checksum:
+                raise SnapshotError(f"{path} is corrupted: checksum mismatch")
+
+            section_table = SECTION_TABLE.unpack_from(body, 0)
+            sections = {
+                section: body[section_table[idx * 2] : section_table[idx * 2] + section_table[idx * 2 + 1]]
+                for idx, section in enumerate(SECTIONS)
+            }
+
+            names = bytes(sections["names"]).decode().split(STR_SEP) if total_nodes else []
+            paths = bytes(sections["paths"]).decode().split(STR_SEP) if total_nodes else []
+            added = bytearray(sections["added"])
+            categories = bytearray(sections["categories"])
+            distributions = bytes(sections["distributions"]).decode().split(STR_SEP) if total_nodes else []
+            unresolved = bytes(sections["unresolved"]).decode().split(STR_SEP) if total_nodes else []
+            kinds = bytearray(sections["kinds"])
+            symbols = bytes(sections["symbols"]).decode().split(STR_SEP) if total_edges else []
+
+            columns = {column: _from_le_bytes(sections[column]) for column in ARRAY_SECTIONS}
+
+            for section in sections.values():
+                section.release()
+
+    if len(names) != total_nodes or len(columns["src"]) != total_edges or len(kinds) != total_edges:
+        raise SnapshotError(f"{path} is corrupted: unexpected number of nodes or edges")
+
+    graph._names = names
+    graph._paths = paths
+    graph._added = added
+    graph._categories = categories
+    graph._distributions = {node_id: distribution for node_id, distribution in enumerate(distributions) if distribution}
+    graph._unresolved = {
+        node_id: frozenset(node_unresolved.split(SYMBOL_SEP))
+        for node_id, node_unresolved in enumerate(unresolved)
+        if node_unresolved
+    }
+    graph._node_ids = dict(zip(names, range(total_nodes)))
+    graph._node_ids_by_path = dict(zip(compress(paths, added), compress(range(total_nodes), added)))
+
+    graph._edge_src = columns["src"]
+    graph._edge_dst = columns["dst"]
+    graph._edge_lineno = columns["lineno"]
+    graph._edge_col = columns["col"]
+    graph._edge_kind = kinds
+    graph._edge_symbols = {
+        edge_id: tuple(sys.intern(symbol) for symbol in edge_symbols.split(SYMBOL_SEP))
+        for edge_id, edge_symbols in enumerate(symbols)
+        if edge_symbols
+    }
+    graph._edge_alive = bytearray(b"\x01") * total_edges
+
+    # edges are stored sorted by their source, so the imports index is just the offsets
+    graph._set_indexes(
+        imports_index=Adjacency(columns["offsets"]),
+        imported_by_index=Adjacency(columns["rev_offsets"], columns["rev_edge_ids"]),
+    )
+
+
+def _to_le_bytes(values: "array[int]") -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+
+    return values.tobytes()
+
+
+def _from_le_bytes(data: memoryview) -> "array[int]":
+    values = array("i")
+    values.frombytes(data)
+
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values
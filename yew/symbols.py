@@ -0,0 +1,346 @@
+import ast
+import dataclasses
+import hashlib
+import logging
+import os
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Final, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from yew.kinds import ALL_KINDS_MASK, TRY_NODES, TryNode
+
+if TYPE_CHECKING:
+    from yew.collection import ModGraph
+
+logger = logging.getLogger(__name__)
+
+STAR: Final[str] = "*"
+
+# changed top-level names of a module (None if the module has changed as a whole, e.g. its module-level code)
+ChangedSymbols = Optional[Set[str]]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Definition:
+    """
+    A top-level name of the module with the fingerprint of the statements that bind it
+    """
+
+    name: str
+    fingerprint: bytes
+    references: FrozenSet[str]  # names the statements refer to
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ImportBinding:
+    """
+    Names bound by an import statement
+    """
+
+    names: Mapping[str, str]  # bound names by the imported name
+    owner: Optional[str] = None  # the top-level definition the import is nested in (None for module-level imports)
+
+
+@dataclasses.dataclass(frozen=True)
+class ModuleSymbols:
+    """
+    Top-level definitions of the module and what they refer to.
+
+    Module-level code that doesn't define anything (e.g. calls or conditions) is kept as side effects:
+    if it refers to a changed name, the whole module is affected
+    """
+
+    definitions: Dict[str, Definition]
+    imports: Dict[Tuple[int, int], ImportBinding]  # by the import statement position (lineno, col_offset)
+    side_effects: Definition
+
+    @classmethod
+    def from_source(cls, content: str | bytes) -> "ModuleSymbols":
+        return _SymbolCollector().collect(ast.parse(content))
+
+    def affected_by(self, names: Iterable[str]) -> ChangedSymbols:
+        """
+        Find definitions that transitively refer to any of the names (None if the module-level code refers to them)
+        """
+        referenced_by: Dict[str, List[str]] = {}
+
+        for definition in self.definitions.values():
+            for reference in definition.references:
+                referenced_by.setdefault(reference, []).append(definition.name)
+
+        affected: Set[str] = set()
+        queue: Deque[str] = deque(names)
+
+        while queue:
+            name = queue.popleft()
+
+            if name in affected:
+                continue
+
+            affected.add(name)
+            queue.extend(referenced_by.get(name, ()))
+
+        if not affected.isdisjoint(self.side_effects.references):
+            return None
+
+        return affected
+
+
+def changed_symbols(old_content: str | bytes, new_content: str | bytes) -> ChangedSymbols:
+    """
+    Compare two versions of the module source and find top-level names whose definitions have changed.
+
+    Formatting and comments are ignored. None means the module-level code has changed (or could not be parsed)
+    """
+    try:
+        old_symbols, new_symbols = ModuleSymbols.from_source(old_content), ModuleSymbols.from_source(new_content)
+    except (SyntaxError, ValueError):
+        return None
+
+    if old_symbols.side_effects.fingerprint != new_symbols.side_effects.fingerprint:
+        return None
+
+    old_definitions, new_definitions = old_symbols.definitions, new_symbols.definitions
+
+    return {
+        name
+        for name in old_definitions.keys() | new_definitions.keys()
+        if name not in old_definitions
+        or name not in new_definitions
+        or old_definitions[name].fingerprint != new_definitions[name].fingerprint
+    }
+
+
+class SymbolIndex:
+    """
+    Per-module index of top-level definitions that answers change impact queries at the symbol level.
+
+    Modules are indexed lazily from their files (only when an import of a changed name has to be followed)
+    and reindexed when their files change
+    """
+
+    def __init__(self, graph: "ModGraph") -> None:
+        self._graph = graph
+
+        self._symbols: Dict[str, Tuple[int, int, Optional[ModuleSymbols]]] = {}  # by path with its mtime and size
+
+    def symbols(self, node_id: int) -> Optional[ModuleSymbols]:
+        """
+        Get top-level definitions of the module (None if the module file can't be read or parsed)
+        """
+        path = self._graph._paths[node_id]
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        if (indexed := self._symbols.get(path)) is not None and indexed[:2] == (stat.st_mtime_ns, stat.st_size):
+            return indexed[2]
+
+        try:
+            with open(path, "rb") as file:
+                module_symbols: Optional[ModuleSymbols] = ModuleSymbols.from_source(file.read())
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.debug(f"Could not index symbols of {path}: {e}")
+            module_symbols = None
+
+        self._symbols[path] = (stat.st_mtime_ns, stat.st_size, module_symbols)
+
+        return module_symbols
+
+    def dependents(
+        self,
+        changes: Mapping[int, ChangedSymbols],
+        kinds: int = ALL_KINDS_MASK,
+    ) -> Dict[int, ChangedSymbols]:
+        """
+        Find modules affected by changes of the given names of modules (None if a module has changed as a whole)
+        along with their affected names. Only imports of the given kinds are followed (a bitmask, see kinds_mask())
+        """
+        graph = self._graph
+        edge_src = graph._edge_src
+
+        affected: Dict[int, ChangedSymbols] = {}
+        queue: Deque[Tuple[int, ChangedSymbols]] = deque(
+            (node_id, self._affected_names(node_id, changed)) for node_id, changed in changes.items()
+        )
+
+        while queue:
+            node_id, changed = queue.popleft()
+
+            for edge_id in graph._filter_kinds(graph._in_edge_ids(node_id), kinds):
+                importer_id = edge_src[edge_id]
+                importer_changed = self._importer_changed(edge_id, node_id, changed)
+
+                if importer_changed is not None and not importer_changed:
+                    continue
+
+                if importer_id not in affected:
+                    affected[importer_id] = importer_changed
+                elif (prev_changed := affected[importer_id]) is None:
+                    continue
+                elif importer_changed is None:
+                    affected[importer_id] = None
+                elif importer_changed <= prev_changed:
+                    continue
+                else:
+                    prev_changed |= importer_changed
+                    importer_changed = prev_changed
+
+                queue.append((importer_id, importer_changed))
+
+        return affected
+
+    def _affected_names(self, node_id: int, changed: ChangedSymbols) -> ChangedSymbols:
+        """
+        Expand the changed names of the module with its definitions that refer to them (e.g. a helper that calls
+        a changed function), so that importers of those definitions are affected too
+        """
+        if changed is None or (module_symbols := self.symbols(node_id)) is None:
+            return changed
+
+        return module_symbols.affected_by(changed)
+
+    def _importer_changed(self, edge_id: int, node_id: int, changed: ChangedSymbols) -> ChangedSymbols:
+        """
+        Find names of the importing module affected by the changed names of the imported one
+        """
+        graph = self._graph
+        imported_symbols = graph._edge_symbols.get(edge_id, ())
+
+        if changed is not None and imported_symbols and STAR not in imported_symbols:
+            if changed.isdisjoint(imported_symbols):
+                # none of the changed names is imported, so there is no need to look into the importing module
+                return set()
+
+        if (module_symbols := self.symbols(graph._edge_src[edge_id])) is None:
+            return None
+
+        if (binding := module_symbols.imports.get((graph._edge_lineno[edge_id], graph._edge_col[edge_id]))) is None:
+            # the importing module has changed since the graph was built
+            return None
+
+        if binding.owner is not None:
+            bound_names = {binding.owner}
+        elif STAR in imported_symbols:
+            if changed is None:
+                return None
+
+            bound_names = set(changed)
+        elif imported_symbols:
+            names = imported_symbols if changed is None else changed.intersection(imported_symbols)
+            bound_names = {binding.names[name] for name in names if name in binding.names}
+        else:
+            # the module itself is imported (`import pkg.mod` or `from pkg import mod`)
+            mod_name = graph._names[node_id]
+            bound_name = binding.names.get(mod_name) or binding.names.get(mod_name.rpartition(".")[2])
+
+            if bound_name is None:
+                return None
+
+            bound_names = {bound_name}
+
+        return module_symbols.affected_by(bound_names)
+
+
+class _SymbolCollector:
+    def __init__(self) -> None:
+        self._statements: Dict[str, List[ast.AST]] = {}
+        self._imports: Dict[Tuple[int, int], ImportBinding] = {}
+        self._side_effects: List[ast.AST] = []
+
+    def collect(self, ast_tree: ast.Module) -> ModuleSymbols:
+        self._visit_block(ast_tree.body)
+
+        return ModuleSymbols(
+            definitions={name: _definition(name, nodes) for name, nodes in self._statements.items()},
+            imports=self._imports,
+            side_effects=_definition("", self._side_effects),
+        )
+
+    def _visit_block(self, block: List[ast.stmt]) -> None:
+        for node in block:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self._visit_definition(node)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                self._visit_import(node)
+            elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                self._visit_assignment(node)
+            elif isinstance(node, ast.If):
+                self._side_effects.append(node.test)
+                self._visit_block(node.body)
+                self._visit_block(node.orelse)
+            elif isinstance(node, TRY_NODES):
+                self._visit_try(node)
+            else:
+                self._side_effects.append(node)
+
+    def _visit_definition(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) -> None:
+        self._bind(node.name, node)
+
+        for nested_node in ast.walk(node):
+            if isinstance(nested_node, (ast.Import, ast.ImportFrom)):
+                self._imports[(nested_node.lineno, nested_node.col_offset)] = ImportBinding(
+                    names=_bound_names(nested_node), owner=node.name
+                )
+
+    def _visit_import(self, node: ast.Import | ast.ImportFrom) -> None:
+        self._imports[(node.lineno, node.col_offset)] = ImportBinding(names=_bound_names(node))
+
+        for alias in node.names:
+            # each imported name is fingerprinted separately, so importing one more name doesn't change others
+            alias_node: ast.Import | ast.ImportFrom = (
+                ast.Import([alias])
+                if isinstance(node, ast.Import)
+                else ast.ImportFrom(node.module, [alias], node.level)
+            )
+            self._bind(_bound_names(alias_node)[alias.name], alias_node)
+
+    def _visit_assignment(self, node: ast.Assign | ast.AnnAssign | ast.AugAssign) -> None:
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        bound_names = {name.id for target in targets for name in ast.walk(target) if isinstance(name, ast.Name)}
+
+        for bound_name in bound_names:
+            self._bind(bound_name, node)
+
+        if not bound_names:
+            # e.g. attribute or item assignments
+            self._side_effects.append(node)
+
+    def _visit_try(self, node: TryNode) -> None:
+        self._visit_block(node.body)
+
+        for handler in node.handlers:
+            if handler.type:
+                self._side_effects.append(handler.type)
+
+            self._visit_block(handler.body)
+
+        self._visit_block(node.orelse)
+        self._visit_block(node.finalbody)
+
+    def _bind(self, name: str, node: ast.AST) -> None:
+        self._statements.setdefault(name, []).append(node)
+
+
+def _bound_names(node: ast.Import | ast.ImportFrom) -> Dict[str, str]:
+    if isinstance(node, ast.Import):
+        # `import a.b` binds `a`
+        return {alias.name: alias.asname or alias.name.partition(".")[0] for alias in node.names}
+
+    return {alias.name: alias.asname or alias.name for alias in node.names}
+
+
+def _definition(name: str, nodes: List[ast.AST]) -> Definition:
+    fingerprint = hashlib.blake2b(digest_size=16)
+    references: Set[str] = set()
+
+    for node in nodes:
+        # line numbers are not dumped, so moving code around doesn't change it
+        fingerprint.update(ast.dump(node).encode())
+
+        references.update(nested_node.id for nested_node in ast.walk(node) if isinstance(nested_node, ast.Name))
+
+    references.discard(name)
+
+    return Definition(name=name, fingerprint=fingerprint.digest(), references=frozenset(references))